@@ -1,6 +1,6 @@
-import random as rn
-from creature import create_creature
-from formatter import Formatter
+from creature import creature_registry
+from rng import GameRNG, get_rng
+from output import emit
 
 
 class Area:
@@ -23,41 +23,73 @@ class Area:
             A list of creatures currently present in the area, generated during exploration.
         **boss_active** (bool): 
             Whether the boss has been spawned. Starts as False.
+        **creature_templates** (list): 
+            The templates of the creature types, looked up once so spawning doesn't search the registry.
+        **boss_template** (CreatureTemplate or None): 
+            The template of the boss creature, if one exists in the area.
     """
     def __init__(self, name : str, difficulty : int, creature_types : list, max_creatures = 3, boss : str = None, treasure_chance : float = 0.5, treasure_quality_list : list = [1], event_sequence : list = None, locked : bool = True):
         self.name = name
         self.difficulty = difficulty
         self.creature_types = creature_types
+        self.creature_templates = [creature_registry.get(creature_type) for creature_type in creature_types]
         self.max_creatures = max_creatures
         self.creatures = []
         self.boss = boss
+        self.boss_template = creature_registry.get(boss) if boss else None
         self.boss_active = False
         self.treasure_chance = treasure_chance
         self.treasure_quality_list = treasure_quality_list
         self.event_sequence = event_sequence or ["combat"]
         self.locked = locked
     
-    def generate_creatures(self):
+    def generate_creatures(self, rng : GameRNG = None):
         """
         Generate a random number of creatures for the area based on maximum amount of creatures and creature types.
+
+        Parameters:
+            rng (GameRNG, optional): The random number generator. Defaults to the current session's.
         """
-        num_creatures = rn.randint(1, self.max_creatures)
-        self.creatures = [create_creature(rn.choice(self.creature_types)) for _ in range(num_creatures)]
-        print(f"{Formatter.yellow_bold(num_creatures)} creatures have appeared in {Formatter.cyan_bold(self.name)}!")
+        rng = rng or get_rng()
+        num_creatures = rng.randint(1, self.max_creatures)
+        self.creatures = [rng.choice(self.creature_templates).spawn(rng) for _ in range(num_creatures)]
+        emit("creatures_appeared", "{count:yellow_bold} creatures have appeared in {area:cyan_bold}!", count = num_creatures, area = self.name)
 
-    def spawn_boss(self):
+    def spawn_boss(self, rng : GameRNG = None):
         """
         Spawn the boss if it exists in the area, hasn't already appeared and is not already in the creatures list.
+
+        Parameters:
+            rng (GameRNG, optional): The random number generator. Defaults to the current session's.
         """
-        if self.boss and not self.boss_active and not any(c.name == self.boss for c in self.creatures):
-            self.creatures.append(create_creature(self.boss))
+        if self.boss and not self.boss_active and not any(c.name == self.boss_template.name for c in self.creatures):
+            self.creatures.append(self.boss_template.spawn(rng))
             self.boss_active = True
-            print(Formatter.red_bold(f"\nThe boss, {self.boss}, has appeared in the {self.name}!"))
+            emit("boss_appeared", "\nThe boss, {boss}, has appeared in the {area}!", "red_bold", boss = self.boss, area = self.name)
 
-    def choose_quality(self):
+    def quality_weights(self):
+        """
+        Calculates the weight of each quality level in the treasure quality list.
+
+        Returns:
+            weights (list): The weight of each quality level, in the same order as the treasure quality list.
+        """
+        max_quality = max(self.treasure_quality_list)
+
+        # Check if the list covers a full range from 1 to max_quality
+        if self.treasure_quality_list == list(range(1, max_quality + 1)):
+            # Use exponential weights for full ranges (e.g., [32, 16, 8, 4, 2, 1] for [1, 2, 3, 4, 5, 6])
+            return [2 ** (max_quality - quality) for quality in self.treasure_quality_list]
+        # For partial ranges, use linear weights (e.g., [3, 2, 1] for [1, 2, 3])
+        return [len(self.treasure_quality_list) - i for i in range(len(self.treasure_quality_list))]
+
+    def choose_quality(self, rng : GameRNG = None):
         """
         Decides the quality of treasure found based on the treasure quality list.
 
+        Parameters:
+            rng (GameRNG, optional): The random number generator. Defaults to the current session's.
+
         Returns:
             chosen_quality (int): The chosen treasure quality level.
         """
@@ -70,18 +102,7 @@ class Area:
             6: "Divine"
         }
 
-        max_quality = max(self.treasure_quality_list)
-
-        # Check if the list covers a full range from 1 to max_quality
-        if self.treasure_quality_list == list(range(1, max_quality + 1)):
-            # Use exponential weights for full ranges (e.g., [32, 16, 8, 4, 2, 1] for [1, 2, 3, 4, 5, 6])
-            weights = [2 ** (max_quality - quality) for quality in self.treasure_quality_list]
-        else:
-            # For partial ranges, use linear weights (e.g., [3, 2, 1] for [1, 2, 3])
-            weights = [len(self.treasure_quality_list) - i for i in range(len(self.treasure_quality_list))]
-
         # Choose a quality based on weights
-        chosen_quality = rn.choices(self.treasure_quality_list, weights=weights, k=1)[0]
-        rarity_name = rarity_names[chosen_quality]
-        print(f"You have found a {Formatter.green_bold(rarity_name)} treasure!")
+        chosen_quality = (rng or get_rng()).choices(self.treasure_quality_list, weights=self.quality_weights(), k=1)[0]
+        emit("treasure_found", "You have found a {rarity:green_bold} treasure!", rarity = rarity_names[chosen_quality], quality = chosen_quality)
         return chosen_quality
\ No newline at end of file
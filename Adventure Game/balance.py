@@ -0,0 +1,208 @@
+import numpy as np
+from player import Player
+from items import all_items
+from creature import creature_registry
+from combat_engine import FLEE_CHANCE
+from events import QUALITY_GOLD_REWARDS
+
+def player_stat_block(level : int = 1, weapon : str = None, armour : str = None):
+    """
+    Calculates the stats of a player at a given level with the given equipment, using the same level up rules as Player.
+
+    Parameters:
+        level (int): The player's level. Defaults to 1.
+        weapon (str, optional): The item key of the equipped weapon (e.g. "basic_sword").
+        armour (str, optional): The item key of the equipped armour (e.g. "leather_armour").
+
+    Returns:
+        stats (dict): The player's max health, attack and defence.
+    """
+    player = Player("Simulated")
+    while player.level < level:
+        player.xp = player.calculate_xp_needed()
+        player.advance_level()
+
+    if weapon:
+        all_items[weapon].apply_equip(player)
+    if armour:
+        all_items[armour].apply_equip(player)
+
+    return {"max_health": player.max_health, "attack": player.base_attack, "defence": player.base_defence}
+
+def creature_arrays(creature_types : list):
+    """
+    Builds arrays of the stats of the given creature types, indexed in the same order as the list.
+
+    Parameters:
+        creature_types (list): The creature types (e.g. ["zombie", "goblin"]).
+
+    Returns:
+        arrays (dict): Arrays of min health, max health, attack, xp drop and gold drop.
+    """
+    templates = [creature_registry.get(creature_type) for creature_type in creature_types]
+    return {key: np.array([getattr(t, key) for t in templates], dtype=np.int64) for key in ("min_health", "max_health", "attack", "xp_drop", "gold_drop")}
+
+def simulate_area(area : object, level : int = 1, weapon : str = None, armour : str = None, potions : int = 0,
+                  potion : str = "small_healing_potion", n : int = 10000, heal_below : float = 0.3,
+                  flee_below : float = 0.0, seed : int = None):
+    """
+    Runs n explorations of an area at once as array operations and returns the average results.
+    Events follow the area's event sequence: combat spawns 1 to max_creatures creatures, boss adds a fight
+    against the boss and treasure rolls the area's treasure chance and quality weights.
+
+    Each turn the player drinks a healing potion if health is at or below heal_below of max health, tries to
+    flee if health is at or below flee_below of max health, and attacks otherwise. The player's stats stay at
+    the given level for the whole exploration, level ups from the XP gained are not applied.
+
+    Parameters:
+        area (Area): The area to explore (e.g. game_data.areas["haunted_forest"]).
+        level (int): The player's level. Defaults to 1.
+        weapon (str, optional): The item key of the equipped weapon.
+        armour (str, optional): The item key of the equipped armour.
+        potions (int): The number of healing potions the player carries. Defaults to 0.
+        potion (str): The item key of the healing potion. Defaults to "small_healing_potion".
+        n (int): The number of explorations to run. Defaults to 10000.
+        heal_below (float): Health fraction at or below which a potion is used. Defaults to 0.3.
+        flee_below (float): Health fraction at or below which the player tries to flee. Defaults to 0 (never).
+        seed (int, optional): Seed for the random number generator.
+
+    Returns:
+        results (dict): Win rate, death rate, flee rate and the average HP lost, gold, XP, kills, flee attempts and potions used.
+    """
+    rng = np.random.default_rng(seed)
+    stats = player_stat_block(level, weapon, armour)
+    max_health = stats["max_health"]
+    heal_value = all_items[potion].effect_value
+
+    state = {
+        "health": np.full(n, max_health, dtype=np.int64),
+        "potions": np.full(n, potions, dtype=np.int64),
+        "alive": np.ones(n, dtype=bool),
+        "fled": np.zeros(n, dtype=bool),
+        "flee_attempts": np.zeros(n, dtype=np.int64),
+        "gold": np.zeros(n, dtype=np.int64),
+        "xp": np.zeros(n, dtype=np.int64),
+        "kills": np.zeros(n, dtype=np.int64),
+    }
+    policy = {
+        "attack": stats["attack"],
+        "defence": stats["defence"],
+        "max_health": max_health,
+        "heal_value": heal_value,
+        "heal_at": heal_below * max_health,
+        "flee_at": flee_below * max_health,
+    }
+
+    for event_type in area.event_sequence:
+        if event_type == "combat":
+            creatures = creature_arrays(area.creature_types)
+            count = rng.integers(1, area.max_creatures + 1, size=n)
+            in_event = state["alive"].copy()
+            for slot in range(area.max_creatures):
+                kinds = rng.integers(0, len(area.creature_types), size=n)
+                present = in_event & state["alive"] & (slot < count)
+                fled = fight(rng, state, policy, creatures, kinds, present)
+                in_event &= ~fled # Fleeing ends the whole combat event
+        elif event_type == "boss" and area.boss:
+            creatures = creature_arrays([area.boss])
+            fight(rng, state, policy, creatures, np.zeros(n, dtype=np.int64), state["alive"].copy())
+        elif event_type == "treasure":
+            found = state["alive"] & (rng.random(n) < area.treasure_chance)
+            weights = np.array(area.quality_weights(), dtype=float)
+            quality = rng.choice(len(weights), size=n, p=weights / weights.sum())
+            gold = np.array([QUALITY_GOLD_REWARDS.get(q, 10) for q in area.treasure_quality_list], dtype=np.int64)
+            state["gold"] += np.where(found, gold[quality], 0)
+
+    hp_lost = max_health - np.maximum(state["health"], 0)
+    return {
+        "win_rate": float(state["alive"].mean()),
+        "death_rate": float(1 - state["alive"].mean()),
+        "flee_rate": float(state["fled"].mean()),
+        "flee_attempts": float(state["flee_attempts"].mean()),
+        "hp_lost": float(hp_lost.mean()),
+        "gold": float(state["gold"].mean()),
+        "xp": float(state["xp"].mean()),
+        "kills": float(state["kills"].mean()),
+        "potions_used": float(potions - state["potions"].mean()),
+    }
+
+def fight(rng, state : dict, policy : dict, creatures : dict, kinds, fighting):
+    """
+    Plays one fight in every exploration where fighting is True, updating the state arrays in place.
+    Uses the same rules as CombatEngine: defence resets at the start of the fight and absorbs damage
+    until it is used up, and the creature attacks after every player action that does not end the fight.
+
+    Parameters:
+        rng (np.random.Generator): The random number generator.
+        state (dict): The exploration state arrays from simulate_area.
+        policy (dict): The player's stats and potion/flee thresholds.
+        creatures (dict): The creature stat arrays from creature_arrays.
+        kinds (np.ndarray): The index of the creature type fought in each exploration.
+        fighting (np.ndarray): Boolean mask of the explorations that take part in the fight.
+
+    Returns:
+        fled (np.ndarray): Boolean mask of the explorations where the player fled.
+    """
+    n = len(fighting)
+    fighting = fighting.copy()
+    fled = np.zeros(n, dtype=bool)
+    health = state["health"]
+
+    creature_health = rng.integers(creatures["min_health"][kinds], creatures["max_health"][kinds] + 1)
+    creature_attack = creatures["attack"][kinds]
+    defence = np.full(n, policy["defence"], dtype=np.int64)
+
+    while fighting.any():
+        heal = fighting & (health <= policy["heal_at"]) & (state["potions"] > 0)
+        flee = fighting & ~heal & (health <= policy["flee_at"])
+        attack = fighting & ~heal & ~flee
+
+        # Player attacks
+        creature_health -= np.where(attack, policy["attack"], 0)
+        killed = attack & (creature_health <= 0)
+        state["kills"] += killed
+        state["xp"] += np.where(killed, creatures["xp_drop"][kinds], 0)
+        state["gold"] += np.where(killed, creatures["gold_drop"][kinds], 0)
+
+        # Player drinks a healing potion
+        health[:] = np.where(heal, np.minimum(policy["max_health"], health + policy["heal_value"]), health)
+        state["potions"] -= heal
+
+        # Player tries to flee
+        escaped = flee & (rng.random(n) < FLEE_CHANCE)
+        state["flee_attempts"] += flee
+        fled |= escaped
+
+        fighting &= ~killed & ~escaped
+
+        # Creature attacks, defence absorbs damage first
+        damage = np.where(fighting, creature_attack, 0)
+        absorbed = np.minimum(defence, damage)
+        defence -= absorbed
+        health -= damage - absorbed
+
+        died = fighting & (health <= 0)
+        state["alive"] &= ~died
+        fighting &= ~died
+
+    state["fled"] |= fled
+    return fled
+
+def level_curve(area : object, levels = range(1, 51), **kwargs):
+    """
+    Runs simulate_area for each level and collects the results into arrays.
+
+    Parameters:
+        area (Area): The area to explore.
+        levels (iterable): The player levels to simulate. Defaults to levels 1 to 50.
+        **kwargs: Other arguments passed on to simulate_area (e.g. weapon, armour, potions, n).
+
+    Returns:
+        curve (dict): The levels and an array of each result from simulate_area, one entry per level.
+    """
+    levels = list(levels)
+    results = [simulate_area(area, level = level, **kwargs) for level in levels]
+    curve = {"level": np.array(levels)}
+    for key in results[0]:
+        curve[key] = np.array([result[key] for result in results])
+    return curve
@@ -1,5 +1,6 @@
-import os, time, sys, threading
+import inspect
 from formatter import Formatter
+from game_io import get_io, run_sync
 
 
 class Choice:
@@ -19,6 +20,7 @@ class Choice:
     def execute(self, locations: dict = None):
         """
         Executes the action and ensures a valid location name is returned.
+        Actions that wait for input return a coroutine, which is run to completion here.
 
         Parameters:
             locations (dict): Dictionary of available locations.
@@ -30,11 +32,45 @@ class Choice:
             self.clear_method()
 
         result = self.action()
+        if inspect.iscoroutine(result):
+            result = run_sync(result)
 
+        return self.check_location(result, locations)
+
+    async def execute_async(self, locations: dict = None):
+        """
+        Executes the action from a running event loop, awaiting actions that wait for input.
+
+        Parameters:
+            locations (dict): Dictionary of available locations.
+
+        Returns:
+            str: The name of the new location if applicable.
+        """
+        if self.clear_method:
+            self.clear_method()
+
+        result = self.action()
+        if inspect.isawaitable(result):
+            result = await result
+
+        return self.check_location(result, locations)
+
+    def check_location(self, result, locations: dict = None):
+        """
+        Checks that a location name returned by the action exists.
+
+        Parameters:
+            result: The result of the action.
+            locations (dict): Dictionary of available locations.
+
+        Returns:
+            The result of the action.
+        """
         if isinstance(result, str) and locations:
             if result in locations:
                 return result
-            print(f"Invalid location specified: {result}")
+            get_io().write(f"Invalid location specified: {result}")
 
         return result
 
@@ -44,61 +80,21 @@ def clear_screen():
     """
     Clear the console screen.
     """
-    os.system('cls' if os.name == 'nt' else 'clear')
+    get_io().clear()
 
-def continue_clear_screen():
+async def continue_clear_screen():
     """
     Pause the program and clear the console screen when the player wants to continue.
     """
-    input(Formatter.blue("\nPress Enter to continue..."))
+    await get_io().read_line(Formatter.blue("\nPress Enter to continue..."))
     clear_screen()
 
-def pause_clear_screen(pause_time : int = 5):
+async def pause_clear_screen(pause_time : int = 5):
     """
     Pause the program and clear the console screen after a set amount of time or the player presses Enter.
 
     Parameters:
         pause_time (int): The amount of time to pause before clearing the screen.
     """
-    skip = threading.Event()
-
-    def wait_for_enter():
-        """
-        Waits for the player to press Enter to skip the pause.
-        """
-        try:
-            if os.name == 'nt':  # Windows systems
-
-                import msvcrt
-                while not skip.is_set():
-                    if msvcrt.kbhit():
-                        if msvcrt.getch() == b'\r':  # Enter key
-                            skip.set()
-                            break
-            else:  # Unix-based systems
-                import select
-                while not skip.is_set():
-                    if select.select([sys.stdin], [], [], 0.1)[0]:
-                        skip.set()
-                        sys.stdin.readline()
-                        break
-        except Exception as e:
-            pass
-
-    # Start a background thread to listen for Enter key
-    input_thread = threading.Thread(target=wait_for_enter, daemon=True)
-    input_thread.start()
-
-    # Countdown timer for the pause
-    print(Formatter.blue("\nPress Enter to skip..."))
-    for remaining_time in range(pause_time, 0, -1):
-        if skip.is_set():
-            break
-        print(f"\r{Formatter.yellow_stat('Continuing in', remaining_time)} seconds... ", end="", flush=True,)
-        time.sleep(1)
-
-    # Signal the thread to stop and clean up
-    skip.set()
-    input_thread.join(timeout=0)
-
-    clear_screen()
\ No newline at end of file
+    await get_io().pause(pause_time)
+    clear_screen()
@@ -1,109 +1,181 @@
-from items import all_items
-import random as rn
-from quest import CombatQuest
+from items import Misc, Weapon, Armour, Potion
+from combat_engine import CombatEngine
 from choice import continue_clear_screen, pause_clear_screen
 from formatter import Formatter
+from game_io import get_io
+import sys
 
-def combat(player : object, creature : object, area : object):
+async def combat(player : object, creature : object, area : object):
     """
     Handles a turn-based combat system between the player and a creature.
-    
+    Reads the player's choices and displays the results, the rules are played by CombatEngine.
+
     Parameters:
         player (Player): The player object participating in combat.
         creature (Creature): The creature object participating in combat.
         area (Area): The area where the combat takes place.
     """
-    player.start_battle()
+    io = get_io()
+    engine = CombatEngine(player, creature)
+    display_records(engine.start(), player, creature)
 
-    while player.health > 0 and creature.health > 0:
-        print(f"\n{Formatter.red_bold(creature.name)}'s Health: {Formatter.red_bold(creature.health)}")
-        print(f"{Formatter.green_bold(player.name)}'s Health: {Formatter.green_bold(player.health)}/{player.max_health}\n")
+    while not engine.finished:
+        io.write(f"\n{Formatter.red_bold(creature.name)}'s Health: {Formatter.red_bold(creature.health)}")
+        io.write(f"{Formatter.green_bold(player.name)}'s Health: {Formatter.green_bold(player.health)}/{player.max_health}\n")
 
-        print(Formatter.cyan_bold("Choose an action:"))
-        print(f"{Formatter.blue('1.')} Attack")
-        print(f"{Formatter.blue('2.')} Use an item")
-        print(f"{Formatter.blue('3.')} Check quest progress")
-        print(f"{Formatter.blue('4.')} Try to flee from combat")
+        io.write(Formatter.cyan_bold("Choose an action:"))
+        io.write(f"{Formatter.blue('1.')} Attack")
+        io.write(f"{Formatter.blue('2.')} Use an item")
+        io.write(f"{Formatter.blue('3.')} Check quest progress")
+        io.write(f"{Formatter.blue('4.')} Try to flee from combat")
 
-        choice = input(Formatter.blue("Enter the number of your choice: "))
+        choice = await io.read_line(Formatter.blue("Enter the number of your choice: "))
 
-        print()
+        io.write()
         if choice == "1":
-            player.attack_creature(creature)
+            display_records(engine.step(CombatEngine.ATTACK), player, creature)
 
-            if creature.health > 0:
-                creature.attack_player(player)
-            else:
-                # Handle rewards for defeating the creature
-                rewards = creature.get_rewards()
-
-                if rewards["xp"] > 0:
-                    player.gain_xp(rewards["xp"])
-
-                if rewards["gold"] > 0:
-                    player.adjust_gold(rewards["gold"])
-
-                if rewards["item"]:
-                    item = all_items.get(rewards["item"])
-                    if item:
-                        player.add_to_inventory(item)
-                    else:
-                        print(Formatter.yellow_bold(f"The item '{rewards['item']}' could not be identified."))
-                
-                if player.active_quest and isinstance(player.active_quest, CombatQuest):
-                    # Conditions for quest progress
-                    quest = player.active_quest
-                    meets_type_condition = (quest.target_type == "any" or creature.name.lower() == quest.target_type)
-                    meets_area_difficulty = (quest.min_difficulty <= area.difficulty)
-
-                    # Update quest progress if conditions are met
-                    if meets_type_condition and meets_area_difficulty:
-                        player.quest_progress += 1
-                        print(f"Quest Progress: {Formatter.green_bold(player.quest_progress)}/{quest.target_count}")
-
-                        # Check for quest completion
-                        if player.quest_progress >= quest.target_count:
-                            quest.complete_quest(player)
-                            player.active_quest = None
-                            player.quest_progress = 0 
-                            print(Formatter.green_bold("\nQuest completed and rewards granted.\n"))
+            if engine.outcome == "won":
+                update_combat_quest(player, creature, area)
 
         elif choice == "2":
             if not player.inventory:
-                print(Formatter.yellow_bold("Your inventory is empty. Please chose another option."))
-                pause_clear_screen()
-            else:
-                player.manage_inventory()
-                creature.attack_player(player)
+                io.write(Formatter.yellow_bold("Your inventory is empty. Please chose another option."))
+                await pause_clear_screen()
+                continue
+
+            item_id = await choose_combat_item(player)
+            if item_id is None:
+                continue
+
+            records = engine.step(CombatEngine.USE_ITEM, item_id)
+            display_records(records, player, creature)
+            if records[0]["type"] == "invalid":
+                await pause_clear_screen()
         elif choice == "3":
-            if player.active_quest and isinstance(player.active_quest, CombatQuest):
-                print(f"{Formatter.cyan_bold('Current Quest')}: {player.active_quest.desc}")
-                print(f"{Formatter.cyan_bold('Progress')}: {Formatter.green_bold(player.quest_progress)}/{player.active_quest.target_count}")
-                continue_clear_screen()
+            combat_quests = player.quests.combat_quests()
+            if combat_quests:
+                for quest in combat_quests:
+                    io.write(f"{Formatter.cyan_bold('Current Quest')}: {quest.desc}")
+                    io.write(f"{Formatter.cyan_bold('Progress')}: {Formatter.green_bold(player.quests.progress[quest.quest_id])}/{quest.target_count}")
+                await continue_clear_screen()
             else:
-                print(Formatter.yellow_bold(f"{player.name} does not have an active quest."))
-                pause_clear_screen()
+                io.write(Formatter.yellow_bold(f"{player.name} does not have an active combat quest."))
+                await pause_clear_screen()
                 continue
         elif choice == "4":
-            if flee():
-                print(f"{Formatter.green_bold(player.name)} successfully fled from {Formatter.red_bold(creature.name)}!")
-                continue_clear_screen()
+            display_records(engine.step(CombatEngine.FLEE), player, creature)
+            if engine.outcome == "fled":
+                await continue_clear_screen()
                 return "fled"
-            else:
-                print(f"{Formatter.red_bold(player.name)} tried to flee, but {Formatter.red_bold(creature.name)} blocked the escape!")
-                creature.attack_player(player)
-                pause_clear_screen()
+            elif not engine.finished:
+                await pause_clear_screen()
         else:
-            print(Formatter.yellow_bold("Invalid choice. Please select a valid option."))
-            pause_clear_screen()
+            io.write(Formatter.yellow_bold("Invalid choice. Please select a valid option."))
+            await pause_clear_screen()
             continue
 
-def flee() -> bool:
+    if engine.outcome == "lost":
+        sys.exit()
+
+async def choose_combat_item(player : object):
     """
-    Attempts to flee from combat with a 25% chance of success.
-    
+    Lists the items the player can use during combat and asks which one to use.
+
+    Parameters:
+        player (Player): The player choosing an item.
+
     Returns:
-        bool: True if the player successfully flees, False otherwise.
+        int or None: The ID of the chosen item, or None if the player went back.
     """
-    chance_to_flee = 0.25
-    return rn.random() < chance_to_flee
\ No newline at end of file
+    io = get_io()
+    usable = [
+        (item_id, details) for item_id, details in player.inventory.items()
+        if isinstance(details["item"], (Weapon, Armour, Potion))
+    ]
+    for index, (item_id, details) in enumerate(usable, 1):
+        quantity = details["quantity"]
+        stack_info = f" ({Formatter.blue_bold(f'x{quantity}')})" if quantity > 1 else ""
+        io.write(f"{Formatter.blue_bold(index)}. {Formatter.white_bold(details['item'].name)}{stack_info} - {details['item'].description}")
+
+    choice = (await io.read_line(f"\nEnter the {Formatter.blue_bold('number')} of the {Formatter.white_bold('item')} to use, or '{Formatter.red_bold('back')}' to return: ")).lower()
+    try:
+        return usable[int(choice) - 1][0]
+    except (ValueError, IndexError):
+        if choice != "back":
+            io.write(Formatter.yellow_bold("Invalid choice. Please select a valid item."))
+        return None
+
+def update_combat_quest(player : object, creature : object, area : object):
+    """
+    Counts a defeated creature towards the player's combat quests and completes the ones that reach their target.
+
+    Parameters:
+        player (Player): The player who defeated the creature.
+        creature (Creature): The defeated creature.
+        area (Area): The area where the combat took place.
+    """
+    player.quests.creature_defeated(creature, area)
+
+def display_records(records : list, player : object, creature : object):
+    """
+    Displays the records returned by the combat engine.
+
+    Parameters:
+        records (list): The records of a combat turn.
+        player (Player): The player participating in combat.
+        creature (Creature): The creature participating in combat.
+    """
+    io = get_io()
+    for record in records:
+        kind = record["type"]
+        if kind == "battle_start":
+            io.write(f"{Formatter.green_bold(player.name)} starts with {Formatter.blue_bold(record['defence'])} defence.")
+        elif kind == "player_attack":
+            io.write(f"{Formatter.green_bold(player.name)} attacks {Formatter.red_bold(creature.name)} for {Formatter.blue_bold(record['damage'])} damage!")
+        elif kind == "creature_defeated":
+            io.write(f"{Formatter.red_bold(creature.name)} has been defeated!")
+        elif kind == "effect_expired":
+            io.write(Formatter.yellow_bold(f"{player.name}'s strength boost has worn off."))
+        elif kind == "rewards":
+            io.write(f"\n{Formatter.cyan_bold('Rewards:')}")
+            if record["xp"] > 0:
+                io.write(f"- XP: {Formatter.green_bold(record['xp'])}")
+            if record["gold"] > 0:
+                io.write(f"- Gold: {Formatter.yellow_bold(record['gold'])}")
+            if record["item"]:
+                io.write(f"- Item: {Formatter.cyan_bold(record['item'].replace('_', ' ').title())}")
+        elif kind == "level_up":
+            io.write(f"\n{Formatter.green_bold(player.name)} leveled up to {Formatter.cyan_bold('Level ' + str(record['level']))}!")
+            io.write(
+                f"{Formatter.white_bold('Max Health')} has increased, and your {Formatter.green_bold('Health')} is now "
+                f"{Formatter.green_bold(player.health)}/{Formatter.white_bold(player.max_health)}, "
+                f"and {Formatter.blue_bold('Attack')} is now {Formatter.blue_bold(player.attack)}.\n"
+            )
+        elif kind == "gold":
+            io.write(f"{Formatter.green_bold(player.name)} now has {Formatter.yellow_bold(record['gold'])} gold.")
+        elif kind == "item_gained":
+            if not isinstance(record["item"], Misc):
+                io.write(f"{Formatter.cyan_bold(record['item'].name)} has been added to your inventory.")
+        elif kind == "item_equipped":
+            io.write(f"{Formatter.green_bold(player.name)} equipped {Formatter.cyan_bold(record['item'].name)}.")
+        elif kind == "item_used":
+            io.write(f"{Formatter.green_bold(player.name)} used {Formatter.cyan_bold(record['item'].name)}.")
+        elif kind == "flee":
+            if record["success"]:
+                io.write(f"{Formatter.green_bold(player.name)} successfully fled from {Formatter.red_bold(creature.name)}!")
+            else:
+                io.write(f"{Formatter.red_bold(player.name)} tried to flee, but {Formatter.red_bold(creature.name)} blocked the escape!")
+        elif kind == "creature_attack":
+            io.write(f"{Formatter.red_bold(creature.name)} attacks {Formatter.green_bold(player.name)} for {Formatter.yellow_bold(record['damage'])} damage.")
+            if record["defence"] > 0 or record["absorbed"] > 0:
+                io.write(f"{Formatter.green_bold(player.name)}'s remaining defense: {Formatter.blue_bold(record['defence'])}")
+        elif kind == "player_defeated":
+            io.write(Formatter.red_bold("You have died."))
+        elif kind == "invalid":
+            if record["reason"] == "effect_active":
+                io.write(Formatter.yellow_bold("You already have an active strength boost. Wait until it wears off to use another."))
+            elif record["reason"] == "cannot_use":
+                io.write(f"{Formatter.yellow_bold(record['item'].name)} cannot be used.")
+            else:
+                io.write(Formatter.yellow_bold("Invalid choice. Please select a valid option."))
@@ -0,0 +1,224 @@
+from items import all_items, Weapon, Armour, Potion
+from rng import GameRNG, get_rng
+from event_log import log_event, log_combat_records, COMBAT_START, COMBAT_END, OUTCOMES
+
+FLEE_CHANCE = 0.25 # Chance of successfully fleeing from combat
+
+class CombatEngine:
+    """
+    Runs the rules of a turn-based fight between the player and a creature without any input or output.
+    Each call to step plays one action and returns records describing what happened, so the same rules
+    can drive the interactive combat screen as well as headless simulations. The records are also added
+    to the current event log, if there is one.
+
+    Parameters:
+        player (Player): The player object participating in combat.
+        creature (Creature): The creature object participating in combat.
+        flee_chance (float): The chance of successfully fleeing. Defaults to FLEE_CHANCE.
+        rng (GameRNG, optional): The random number generator for loot and fleeing. Defaults to the current session's.
+
+    **Starting Attributes:**
+        **outcome** (str or None):
+            The result of the fight once it is over ("won", "lost" or "fled"). Starts as None.
+        **turn** (int):
+            The number of actions that have been played. Starts at 0.
+    """
+    ATTACK = "attack"
+    USE_ITEM = "use_item"
+    FLEE = "flee"
+
+    def __init__(self, player : object, creature : object, flee_chance : float = FLEE_CHANCE, rng : GameRNG = None):
+        self.player = player
+        self.creature = creature
+        self.flee_chance = flee_chance
+        self.rng = rng or get_rng()
+        self.outcome = None
+        self.turn = 0
+
+    @property
+    def finished(self):
+        """
+        Whether the fight is over.
+        """
+        return self.outcome is not None
+
+    def start(self):
+        """
+        Reset the player's defence to base_defence at the start of the battle.
+
+        Returns:
+            list: The records for the start of the battle.
+        """
+        self.player.defence = self.player.base_defence
+        log_event(COMBAT_START, self.creature.name, None, self.creature.health, self.player.health)
+        return [{"type": "battle_start", "defence": self.player.defence}]
+
+    def step(self, action : str, item_id : int = None):
+        """
+        Play a single action for the player, followed by the creature's response.
+        Invalid actions return an "invalid" record and do not use up a turn.
+
+        Parameters:
+            action (str): The action to play ("attack", "use_item" or "flee").
+            item_id (int, optional): The ID of the item to use with "use_item".
+
+        Returns:
+            list: The records of everything that happened during the turn, in order.
+        """
+        if self.finished:
+            return [{"type": "invalid", "reason": "finished"}]
+
+        if action == self.ATTACK:
+            records = self.player_attack()
+        elif action == self.USE_ITEM:
+            records = self.use_item(item_id)
+        elif action == self.FLEE:
+            records = self.try_flee()
+        else:
+            return [{"type": "invalid", "reason": "unknown_action", "action": action}]
+
+        if records and records[0]["type"] == "invalid":
+            return records
+
+        self.turn += 1
+        if not self.finished:
+            records.extend(self.creature_attack())
+
+        log_combat_records(records, self.creature)
+        if self.finished:
+            log_event(COMBAT_END, self.creature.name, None, OUTCOMES.index(self.outcome))
+        return records
+
+    def player_attack(self):
+        """
+        The player attacks the creature, applying strength boosts and counting down their duration.
+
+        Returns:
+            list: The records of the attack.
+        """
+        player, creature = self.player, self.creature
+        player.apply_attack_effects()
+        creature.health -= player.attack
+        records = [{"type": "player_attack", "damage": player.attack, "creature_health": creature.health}]
+
+        if creature.health <= 0:
+            records.append({"type": "creature_defeated", "name": creature.name})
+
+        if player.tick_effects():
+            records.append({"type": "effect_expired", "effect": "strength_boost"})
+
+        if creature.health <= 0:
+            records.extend(self.grant_rewards())
+            self.outcome = "won"
+        return records
+
+    def grant_rewards(self):
+        """
+        Roll the creature's rewards and give them to the player.
+
+        Returns:
+            list: The records of the rewards, level ups and items gained.
+        """
+        player = self.player
+        rewards = self.creature.roll_rewards(self.rng)
+        records = [{"type": "rewards", **rewards}]
+
+        if rewards["xp"] > 0:
+            player.xp += rewards["xp"]
+            while player.xp >= player.calculate_xp_needed():
+                player.advance_level()
+                records.append({"type": "level_up", "level": player.level})
+
+        if rewards["gold"] > 0:
+            player.add_gold(rewards["gold"])
+            records.append({"type": "gold", "amount": rewards["gold"], "gold": player.gold})
+
+        if rewards["item"]:
+            item = all_items[rewards["item"]] # Loot is checked against the items when the content is compiled
+            player.store_item(item)
+            records.append({"type": "item_gained", "item": item})
+        return records
+
+    def use_item(self, item_id : int):
+        """
+        Use or equip an item from the player's inventory.
+
+        Parameters:
+            item_id (int): The ID of the item.
+
+        Returns:
+            list: The records of the item use.
+        """
+        player = self.player
+        if not player.inventory:
+            return [{"type": "invalid", "reason": "empty_inventory"}]
+
+        item_data = player.get_inventory_item(item_id)
+        if not item_data:
+            return [{"type": "invalid", "reason": "item_not_found", "item_id": item_id}]
+
+        item = item_data["item"]
+        if isinstance(item, (Weapon, Armour)):
+            item.apply_equip(player)
+            return [{"type": "item_equipped", "item": item}]
+
+        if isinstance(item, Potion):
+            if not item.apply_effect(player):
+                return [{"type": "invalid", "reason": "effect_active", "item": item}]
+            player.remove_from_inventory(item_id)
+            return [{"type": "item_used", "item": item, "health": player.health}]
+
+        return [{"type": "invalid", "reason": "cannot_use", "item": item}]
+
+    def try_flee(self):
+        """
+        The player attempts to flee from combat.
+
+        Returns:
+            list: The record of the flee attempt.
+        """
+        success = self.rng.random() < self.flee_chance
+        if success:
+            self.outcome = "fled"
+        return [{"type": "flee", "success": success}]
+
+    def creature_attack(self):
+        """
+        The creature attacks the player. Damage is reduced by the player's defence.
+
+        Returns:
+            list: The records of the attack.
+        """
+        player = self.player
+        damage_taken, absorbed = player.absorb_damage(self.creature.attack)
+        records = [{
+            "type": "creature_attack",
+            "damage": self.creature.attack,
+            "damage_taken": damage_taken,
+            "absorbed": absorbed,
+            "defence": player.defence,
+            "health": player.health
+        }]
+
+        if player.health <= 0:
+            records.append({"type": "player_defeated"})
+            self.outcome = "lost"
+        return records
+
+    def run(self, policy):
+        """
+        Play the whole fight, asking the policy for each action.
+
+        Parameters:
+            policy (callable): Called with the engine, returns an action or an (action, item_id) tuple.
+
+        Returns:
+            str: The outcome of the fight ("won", "lost" or "fled").
+        """
+        self.start()
+        while not self.finished:
+            action = policy(self)
+            records = self.step(*action) if isinstance(action, tuple) else self.step(action)
+            if records[0]["type"] == "invalid":
+                raise ValueError(f"Policy chose an invalid action: {records[0]['reason']}")
+        return self.outcome
@@ -0,0 +1,394 @@
+import json, os, pickle
+from collections.abc import MutableMapping
+
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+CONTENT_DIR = os.path.join(GAME_DIR, "json")
+CACHE_PATH = os.path.join(GAME_DIR, ".cache", "content.pack")
+PACK_VERSION = 3
+
+# Fields every record must have, per section and item category
+REQUIRED_FIELDS = {
+    "weapons": ("name", "effect_value", "desc"),
+    "armours": ("name", "effect_value", "desc"),
+    "potions": ("name", "effect_type", "effect_value", "desc"),
+    "miscellaneous": ("name", "type", "effect_value", "desc"),
+    "creatures": ("name", "type", "health", "attack", "xp_drop", "gold_drop"),
+    "areas": ("name", "difficulty", "creature_types"),
+    "shops": ("name", "inventory"),
+    "combat_quests": ("desc", "area", "reward", "target_type", "target_count", "min_difficulty"),
+    "story_quests": ("desc", "area", "reward"),
+}
+
+# Values other content can refer to that aren't defined in the json folder
+SHOP_CATEGORIES = ("weapons", "armours", "potions")
+EVENT_TYPES = ("combat", "treasure", "boss", "story")
+STEP_TYPES = {"interaction": "npc", "exploration": "area"} # Step type -> the trigger field it needs
+LOCATIONS = ("home", "village", "quest_hall", "exploration")
+TREASURE_QUALITIES = range(1, 7)
+# Sections that get integer IDs, only items are looked up by ID at runtime
+ID_SECTIONS = ("items",)
+
+
+class ContentError(Exception):
+    """
+    Raised when the content in the json folder is invalid. Lists every problem found.
+
+    Parameters:
+        errors (list): The problems found, one string each.
+    """
+    def __init__(self, errors : list):
+        self.errors = errors
+        super().__init__("Invalid game content:\n" + "\n".join(f"- {error}" for error in errors))
+
+
+def item_key(name : str):
+    """
+    Convert an item, area or shop name into its dictionary key (e.g. "Basic Sword" -> "basic_sword").
+    """
+    return name.lower().replace(" ", "_")
+
+def read_json(content_dir : str, relative_path : str):
+    """
+    Read a JSON file from the content folder.
+    """
+    with open(os.path.join(content_dir, relative_path), "r") as file:
+        return json.load(file)
+
+def content_files(content_dir : str = CONTENT_DIR):
+    """
+    List every JSON file in the content folder.
+
+    Returns:
+        list: The paths of the files relative to the content folder, sorted.
+    """
+    files = []
+    for root, _, filenames in os.walk(content_dir):
+        for filename in filenames:
+            if filename.endswith(".json"):
+                files.append(os.path.relpath(os.path.join(root, filename), content_dir).replace(os.sep, "/"))
+    return sorted(files)
+
+def content_signature(content_dir : str = CONTENT_DIR):
+    """
+    Build the cache key of the content folder from the path, modification time and size of every JSON file.
+
+    Returns:
+        tuple: The signature of the content folder.
+    """
+    signature = [PACK_VERSION]
+    for relative_path in content_files(content_dir):
+        stat = os.stat(os.path.join(content_dir, relative_path))
+        signature.append((relative_path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+def check_fields(errors : list, section : str, key : str, record):
+    """
+    Add an error for every required field missing from a record.
+    """
+    if not isinstance(record, dict):
+        errors.append(f"{section} '{key}' is not an object.")
+        return False
+    missing = [field for field in REQUIRED_FIELDS[section] if field not in record]
+    for field in missing:
+        errors.append(f"{section} '{key}' is missing '{field}'.")
+    return not missing
+
+def compile_content(content_dir : str = CONTENT_DIR):
+    """
+    Read every JSON file in the content folder, validate the records and index them by key.
+    Optional fields are filled with their defaults so the records can be passed straight to the game classes.
+    Every cross-reference is checked, and every problem found is reported together.
+
+    Parameters:
+        content_dir (str): The content folder. Defaults to the game's json folder.
+
+    Returns:
+        pack (dict): The indexed content, one dictionary per section.
+
+    Raises:
+        ContentError: If any record is missing a required field or refers to something that doesn't exist.
+    """
+    errors = []
+    pack = {"items": {}, "creatures": {}, "areas": {}, "shops": {}, "combat_quests": {}, "story_quests": {}}
+
+    # Items are indexed by key, each record remembers its category
+    items_data = read_json(content_dir, "items.json")
+    for category in ("weapons", "armours", "potions", "miscellaneous"):
+        for record in items_data.get(category, []):
+            name = record.get("name", "?") if isinstance(record, dict) else "?"
+            if check_fields(errors, category, name, record):
+                pack["items"][item_key(record["name"])] = {**record, "category": category}
+
+    for key, record in read_json(content_dir, "creatures.json").items():
+        if check_fields(errors, "creatures", key, record):
+            if len(record["health"]) != 2:
+                errors.append(f"creatures '{key}' health must be [min, max].")
+                continue
+            pack["creatures"][key] = record
+
+    for name, record in read_json(content_dir, "areas.json").items():
+        if check_fields(errors, "areas", name, record):
+            pack["areas"][item_key(name)] = {
+                "name": record["name"],
+                "difficulty": record["difficulty"],
+                "creature_types": record["creature_types"],
+                "max_creatures": record.get("max_creatures", 3),
+                "treasure_chance": record.get("treasure_chance", 0.5),
+                "treasure_quality_list": record.get("treasure_quality_list", [1]),
+                "boss": record.get("boss"),
+                "event_sequence": record.get("event_sequence"),
+                "locked": record.get("locked", True)
+            }
+
+    for relative_path in content_files(content_dir):
+        if relative_path.startswith("shops/"):
+            record = read_json(content_dir, relative_path)
+            if check_fields(errors, "shops", relative_path, record):
+                # Item names are resolved to item keys once check_references has confirmed they exist
+                pack["shops"][record["name"]] = {
+                    "name": record["name"],
+                    "inventory": {
+                        category: {item_key(item_name): price for item_name, price in items.items()}
+                        for category, items in record["inventory"].items()
+                    }
+                }
+
+    for quest_id, record in read_json(content_dir, "quests/combat_quests.json").items():
+        if check_fields(errors, "combat_quests", quest_id, record):
+            pack["combat_quests"][quest_id] = record
+
+    for quest_id, record in read_json(content_dir, "quests/story_quests.json").items():
+        if check_fields(errors, "story_quests", quest_id, record):
+            pack["story_quests"][quest_id] = {
+                "desc": record["desc"],
+                "area": record["area"],
+                "reward": record["reward"],
+                "unlock_area": record.get("unlock_area"),
+                "steps": record.get("steps", []),
+                "linked_location": record.get("linked_location"),
+                "unlock_quest": record.get("unlock_quest")
+            }
+
+    if not errors:
+        check_references(pack, errors)
+    if errors:
+        raise ContentError(errors)
+    pack["ids"] = {section: {key: index for index, key in enumerate(pack[section])} for section in ID_SECTIONS}
+    return pack
+
+def check_references(pack : dict, errors : list):
+    """
+    Check that every reference between records points at something that exists, adding an error for each one that doesn't,
+    so the game never has to check for missing items, creatures, areas or quests while it runs.
+    """
+    items, creatures, areas = pack["items"], pack["creatures"], pack["areas"]
+    creature_names = {record["name"].lower() for record in creatures.values()}
+
+    def check(exists : bool, message : str):
+        if not exists:
+            errors.append(message)
+
+    for key, record in creatures.items():
+        for loot_key in record.get("loot", []):
+            check(loot_key in items, f"creatures '{key}' drops unknown item '{loot_key}'.")
+
+    for key, record in areas.items():
+        for creature_type in record["creature_types"]:
+            check(creature_type in creatures, f"areas '{key}' has unknown creature type '{creature_type}'.")
+        if record["boss"]:
+            check(record["boss"] in creatures, f"areas '{key}' has unknown boss '{record['boss']}'.")
+        for quality in record["treasure_quality_list"]:
+            check(quality in TREASURE_QUALITIES, f"areas '{key}' has unknown treasure quality {quality}.")
+        for event_type in record["event_sequence"] or []:
+            check(event_type in EVENT_TYPES, f"areas '{key}' has unknown event type '{event_type}'.")
+
+    for name, record in pack["shops"].items():
+        for category, category_items in record["inventory"].items():
+            if category not in SHOP_CATEGORIES:
+                errors.append(f"shops '{name}' has unknown category '{category}'.")
+                continue
+            for key in category_items:
+                check(
+                    key in items and items[key]["category"] == category,
+                    f"shops '{name}' sells '{key}', which isn't one of the {category} in items.json."
+                )
+
+    for section in ("combat_quests", "story_quests"):
+        for quest_id, record in pack[section].items():
+            for reward_key in record["reward"].get("items", []):
+                check(reward_key in items, f"{section} '{quest_id}' rewards unknown item '{reward_key}'.")
+
+    for quest_id, record in pack["combat_quests"].items():
+        target_type = record["target_type"]
+        check(target_type == "any" or target_type in creature_names, f"combat_quests '{quest_id}' targets unknown creature '{target_type}'.")
+
+    for quest_id, record in pack["story_quests"].items():
+        if record["unlock_area"]:
+            check(record["unlock_area"] in areas, f"story_quests '{quest_id}' unlocks unknown area '{record['unlock_area']}'.")
+        if record["unlock_quest"]:
+            check(record["unlock_quest"] in pack["story_quests"], f"story_quests '{quest_id}' unlocks unknown quest '{record['unlock_quest']}'.")
+        if record["linked_location"]:
+            check(record["linked_location"] in LOCATIONS, f"story_quests '{quest_id}' is linked to unknown location '{record['linked_location']}'.")
+
+        for number, step in enumerate(record["steps"], 1):
+            where = f"story_quests '{quest_id}' step {number}"
+            trigger_field = STEP_TYPES.get(step.get("type"))
+            if trigger_field is None:
+                errors.append(f"{where} has unknown type '{step.get('type')}'.")
+                continue
+            trigger_value = step.get("trigger", {}).get(trigger_field)
+            if not trigger_value:
+                errors.append(f"{where} is missing trigger '{trigger_field}'.")
+            elif trigger_field == "area":
+                check(trigger_value in areas, f"{where} is triggered by unknown area '{trigger_value}'.")
+            if step["type"] == "interaction":
+                check("dialogue" in step, f"{where} is missing 'dialogue'.")
+            for field in ("story_item", "reward_item"):
+                if field in step:
+                    check(step[field] in items, f"{where} gives unknown item '{step[field]}'.")
+            if "unlock_area" in step:
+                check(step["unlock_area"] in areas, f"{where} unlocks unknown area '{step['unlock_area']}'.")
+
+def write_pack(pack : dict, signature : tuple, cache_path : str = CACHE_PATH):
+    """
+    Write a compiled content pack to the cache file. The file is replaced in one step so readers never see half a pack.
+    """
+    os.makedirs(os.path.dirname(cache_path), exist_ok = True)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        pickle.dump({"signature": signature, "pack": pack}, file, protocol = pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, cache_path)
+
+def read_pack(signature : tuple, cache_path : str = CACHE_PATH):
+    """
+    Read the cached content pack if it was compiled from the current content.
+
+    Returns:
+        pack (dict or None): The cached pack, or None if it is missing or out of date.
+    """
+    try:
+        with open(cache_path, "rb") as file:
+            cached = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("signature") != signature:
+        return None
+    return cached["pack"]
+
+
+class ContentRegistry:
+    """
+    Gives access to the compiled game content. The pack is loaded the first time a section is used,
+    from the cache if it is up to date, otherwise by compiling the json folder and refreshing the cache.
+
+    Parameters:
+        content_dir (str): The content folder. Defaults to the game's json folder.
+        cache_path (str): The path of the cached pack. Defaults to .cache/content.pack in the game folder.
+    """
+    def __init__(self, content_dir : str = CONTENT_DIR, cache_path : str = CACHE_PATH):
+        self.content_dir = content_dir
+        self.cache_path = cache_path
+        self.pack = None
+
+    def load(self):
+        """
+        Load the content pack if it hasn't been loaded yet.
+
+        Returns:
+            pack (dict): The compiled content.
+        """
+        if self.pack is None:
+            signature = content_signature(self.content_dir)
+            pack = read_pack(signature, self.cache_path)
+            if pack is None:
+                pack = compile_content(self.content_dir)
+                try:
+                    write_pack(pack, signature, self.cache_path)
+                except OSError:
+                    pass # The game still works without a cache, it just starts slower
+            self.pack = pack
+        return self.pack
+
+    def section(self, name : str):
+        """
+        Returns the records of a section of the pack (e.g. "items", "areas", "shops").
+        """
+        return self.load()[name]
+
+    def ids(self, section : str):
+        """
+        Returns the integer IDs of a section's records, keyed by record key (e.g. item key -> item ID).
+        IDs number the records from 0 in the order they are defined.
+        """
+        return self.load()["ids"][section]
+
+    def compile(self):
+        """
+        Compile the content folder and write the cache, even if the cache is up to date.
+
+        Returns:
+            pack (dict): The compiled content.
+        """
+        self.pack = compile_content(self.content_dir)
+        write_pack(self.pack, content_signature(self.content_dir), self.cache_path)
+        return self.pack
+
+
+class LazyDict(MutableMapping):
+    """
+    A dictionary that is only built the first time it is used.
+
+    Parameters:
+        builder (callable): Function returning the dictionary's contents.
+    """
+    def __init__(self, builder):
+        self.builder = builder
+        self.data = None
+
+    def materialize(self):
+        """
+        Build the dictionary if it hasn't been built yet.
+
+        Returns:
+            dict: The dictionary's contents.
+        """
+        if self.data is None:
+            self.data = self.builder()
+        return self.data
+
+    def __getitem__(self, key):
+        return self.materialize()[key]
+
+    def __setitem__(self, key, value):
+        self.materialize()[key] = value
+
+    def __delitem__(self, key):
+        del self.materialize()[key]
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def __len__(self):
+        return len(self.materialize())
+
+    def __contains__(self, key):
+        return key in self.materialize()
+
+    def get(self, key, default = None):
+        return self.materialize().get(key, default)
+
+    def __repr__(self):
+        if self.data is None:
+            return f"{self.__class__.__name__}(<not loaded>)"
+        return repr(self.data)
+
+
+# Shared registry used by the game modules
+content = ContentRegistry()
+
+
+if __name__ == "__main__":
+    compiled = content.compile()
+    print(f"Compiled content pack: {content.cache_path}")
+    for section_name, records in compiled.items():
+        print(f"- {section_name}: {len(records)}")
@@ -1,5 +1,6 @@
-import random as rn
-from formatter import Formatter
+import json
+from content import content, LazyDict
+from rng import GameRNG, get_rng
 
 class Creature:
     """
@@ -15,6 +16,8 @@ class Creature:
         gold_drop (int): The amount of gold the creature should drop on death.
         loot (list): List of potential loot the creature should drop on death.
     """
+    __slots__ = ("name", "type", "max_health", "health", "attack", "xp_drop", "gold_drop", "loot")
+
     def __init__(self, name : str, type : str, max_health : int, health : int, attack : int, xp_drop : int, gold_drop : int, loot : list = None):
         self.name = name
         self.type = type
@@ -25,99 +28,123 @@ class Creature:
         self.gold_drop = gold_drop
         self.loot = loot or []
     
-    def take_damage(self, damage : int):
+    def roll_rewards(self, rng : GameRNG = None):
         """
-        Reduce health when creature takes damage.
+        Rolls the rewards for defeating the creature without any output.
 
         Parameters:
-            damage (int): The amount of damage the creature takes.
+            rng (GameRNG, optional): The random number generator. Defaults to the current session's.
+
+        Returns:
+            rewards (dict): A dictionary containing the rewards for defeating the creature.
         """
-        self.health -= damage
-        if self.health <= 0:
-            print(f"{Formatter.red_bold(self.name)} has been defeated!")
-            
-    
-    def attack_player(self, player):
+        rewards = {"xp": self.xp_drop, "gold": self.gold_drop, "item": None}
+        if self.loot:
+            rewards["item"] = (rng or get_rng()).choice(self.loot)
+        return rewards
+
+
+class CreatureTemplate:
+    """
+    The stats used to spawn a type of creature, loaded from creatures.json.
+
+    Parameters:
+        key (str): The creature type (e.g. "zombie").
+        data (dict): The creature's data from creatures.json.
+
+    **Starting Attributes:**
+        **min_health** (int), **max_health** (int):
+            The range the creature's health is rolled in (inclusive).
+        **health_range** (range):
+            Precomputed range of every possible health value, used when spawning.
+        **loot** (tuple):
+            Item keys the creature can drop. Shared by every creature spawned from the template.
+    """
+    __slots__ = ("key", "name", "type", "min_health", "max_health", "health_range", "attack", "xp_drop", "gold_drop", "loot")
+
+    def __init__(self, key : str, data : dict):
+        self.key = key
+        self.name = data["name"]
+        self.type = data["type"]
+        self.min_health, self.max_health = data["health"]
+        self.health_range = range(self.min_health, self.max_health + 1)
+        self.attack = data["attack"]
+        self.xp_drop = data["xp_drop"]
+        self.gold_drop = data["gold_drop"]
+        self.loot = tuple(data.get("loot", ()))
+
+    def spawn(self, rng : GameRNG = None):
         """
-        Inflicts damage on the player equal to the creature's attack power.
+        Create a creature from the template with a random health value.
 
         Parameters:
-            player (Player): The player object that will receive the damage.
+            rng (GameRNG, optional): The random number generator. Defaults to the current session's.
+
+        Returns:
+            creature (Creature): A new creature instance.
         """
-        print(f"{Formatter.red_bold(self.name)} attacks {Formatter.green_bold(player.name)} for {Formatter.yellow_bold(self.attack)} damage.")
-        player.take_damage(self.attack)
-    
-    def get_rewards(self):
+        health = (rng or get_rng()).choice(self.health_range)
+        return Creature(self.name, self.type, health, health, self.attack, self.xp_drop, self.gold_drop, self.loot)
+
+
+class CreatureRegistry:
+    """
+    Creature templates indexed by creature type, so spawning a creature is a single dictionary lookup.
+
+    Parameters:
+        templates (dict): Dictionary of creature types and their templates.
+    """
+    def __init__(self, templates : dict):
+        self.templates = templates
+
+    @classmethod
+    def load(cls, path : str):
         """
-        Returns the rewards for defeating the creature.
+        Load the creature templates from a JSON file.
+
+        Parameters:
+            path (str): The path to the JSON file.
 
         Returns:
-            rewards (dict): A dictionary containing the rewards for defeating the creature.
+            registry (CreatureRegistry): The loaded registry.
         """
-        rewards = {"xp": self.xp_drop, "gold": self.gold_drop, "item": None}
+        with open(path, "r") as creatures_file:
+            creatures_data = json.load(creatures_file)
+        return cls({key: CreatureTemplate(key, data) for key, data in creatures_data.items()})
 
-        print(f"\n{Formatter.cyan_bold('Rewards:')}")
-        if self.xp_drop > 0:
-            print(f"- XP: {Formatter.green_bold(self.xp_drop)}")
-        
-        if self.gold_drop > 0:
-            print(f"- Gold: {Formatter.yellow_bold(self.gold_drop)}")
+    def get(self, creature_type : str):
+        """
+        Look up the template of a creature type.
 
-        if self.loot:
-            loot_item = rn.choice(self.loot)
-            rewards["item"] = loot_item
-            formatted_loot_item = loot_item.replace("_", " ").title()
-            if loot_item:
-                print(f"- Item: {Formatter.cyan_bold(formatted_loot_item)}")
-        
-        return rewards
+        Parameters:
+            creature_type (str): The type of creature (e.g. "zombie", "skeleton").
 
+        Returns:
+            template (CreatureTemplate): The template of the creature type.
+        """
+        template = self.templates.get(creature_type)
+        if template is None:
+            raise ValueError(f"Unknown creature type: {creature_type}")
+        return template
 
-def create_creature(creature_type : str):
-    """
-    Generate a creature instance based on the specified creature.
+    def spawn(self, creature_type : str, rng : GameRNG = None):
+        """
+        Create a creature of the specified type.
 
-    Parameters:
-        creature_type (str): The type of creature to create (e.g. "zombie", "skeleton").
+        Parameters:
+            creature_type (str): The type of creature to create (e.g. "zombie", "skeleton").
+            rng (GameRNG, optional): The random number generator. Defaults to the current session's.
 
-    Returns:
-        creature (Creature): An instance of the Creature class based on the specified type.
-    """
-    if creature_type == "zombie":
-        health = rn.randint(8, 14)
-        return Creature("Zombie", "Undead", health, health, 2, 3, 2)
-    elif creature_type == "skeleton":
-        health = rn.randint(7, 12)
-        return Creature("Skeleteon", "Undead", health, health, 4, 3, 3)
-    elif creature_type == "goblin":
-        health = rn.randint(5, 7)
-        return Creature("Goblin", "Humanoid", health, health, 3, 2, 4)
-    elif creature_type == "spirit":
-        health = rn.randint(10, 15)
-        return Creature("Spirit", "Ethereal", health, health, 3, 5, 3)
-    elif creature_type == "fairy":
-        health = rn.randint(6, 10)
-        return Creature("Fairy", "Ethereal", health, health, 2, 4, 2)
-    elif creature_type == "fairy queen":
-        health = rn.randint(15,19)
-        return Creature("Fairy Queen", "Ethereal", health, health, 5, 15, 5)
-    elif creature_type == "giant frog":
-        health = rn.randint(13, 17)
-        return Creature("Giant Frog", "Beast", health, health, 2, 8, 4)
-    elif creature_type == "swamp monster":
-        health = rn.randint(18, 22)
-        return Creature("Swamp Monster", "Beast", health, health, 2, 10, 5)
-    elif creature_type == "giant spider":
-        health = rn.randint(13, 17)
-        return Creature("Giant Spider", "Beast", health, health, 4, 8, 4)
-    elif creature_type == "orc":
-        health = rn.randint(18, 22)
-        return Creature("Orc", "Humanoid", health, health, 5, 10, 5)
-    elif creature_type == "troll":
-        health = rn.randint(28, 32)
-        return Creature("Troll", "Humanoid", health, health, 7, 12, 8)
-    elif creature_type == "dark wizard":
-        health = rn.randint(18, 22)
-        return Creature("Dark Wizard", "Humanoid", health, health, 8, 20, 10, ["great_sword"])
-    else:
-        raise ValueError(f"Unknown creature type: {creature_type}")
\ No newline at end of file
+        Returns:
+            creature (Creature): A new creature instance.
+        """
+        return self.get(creature_type).spawn(rng)
+
+    def __contains__(self, creature_type):
+        return creature_type in self.templates
+
+
+# Creature templates are created from the content pack the first time a creature is looked up
+creature_registry = CreatureRegistry(LazyDict(
+    lambda: {key: CreatureTemplate(key, data) for key, data in content.section("creatures").items()}
+))
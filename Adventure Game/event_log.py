@@ -0,0 +1,263 @@
+import contextvars, csv, json, os
+from array import array
+
+# Kinds of events, stored as one byte
+COMBAT_START = 1     # actor: creature, value: creature health, extra: player health
+PLAYER_ATTACK = 2    # target: creature, value: damage, extra: creature health left
+CREATURE_ATTACK = 3  # actor: creature, value: damage taken, extra: damage absorbed
+ITEM_USED = 4        # target: item, value: player health after use
+ITEM_EQUIPPED = 5    # target: item
+FLEE_ATTEMPT = 6     # actor: creature, value: 1 if the player got away
+COMBAT_END = 7       # actor: creature, value: index of the outcome in OUTCOMES
+REWARD_XP = 8        # actor: creature, value: XP
+REWARD_GOLD = 9      # actor: creature, value: gold, extra: gold after the reward
+REWARD_ITEM = 10     # actor: creature, target: item key
+LEVEL_UP = 11        # value: new level
+ENCOUNTER = 12       # actor: area, value: number of creatures
+TREASURE = 13        # actor: area, value: quality, extra: gold reward
+QUEST_STEP = 14      # actor: quest ID, value: the step reached
+
+KIND_NAMES = {
+    COMBAT_START: "combat_start", PLAYER_ATTACK: "player_attack", CREATURE_ATTACK: "creature_attack",
+    ITEM_USED: "item_used", ITEM_EQUIPPED: "item_equipped", FLEE_ATTEMPT: "flee_attempt", COMBAT_END: "combat_end",
+    REWARD_XP: "reward_xp", REWARD_GOLD: "reward_gold", REWARD_ITEM: "reward_item", LEVEL_UP: "level_up",
+    ENCOUNTER: "encounter", TREASURE: "treasure", QUEST_STEP: "quest_step",
+}
+OUTCOMES = ("won", "lost", "fled")
+NO_NAME = 0xFFFF # Name index meaning "nothing"
+
+# Column name, array typecode and NumPy type of every field of a record
+COLUMNS = (
+    ("sequence", "I", "<u4"),
+    ("kind", "B", "u1"),
+    ("actor", "H", "<u2"),
+    ("target", "H", "<u2"),
+    ("value", "i", "<i4"),
+    ("extra", "i", "<i4"),
+)
+
+
+class EventLog:
+    """
+    Compact log of what happens in combats and explorations. Every event is a fixed-width record
+    (sequence, kind, actor, target, value, extra) stored in preallocated columns, and names (creatures,
+    items, areas, quests) are stored once in a name table and referred to by index.
+    The log can be saved as a NumPy .npy file for analysis or as CSV.
+
+    Parameters:
+        capacity (int): The number of records to make room for. The columns double in size when they are full. Defaults to 1024.
+
+    **Starting Attributes:**
+        **count** (int):
+            The number of records in the log. Starts at 0.
+        **names** (list):
+            The name table, in index order.
+    """
+    def __init__(self, capacity : int = 1024):
+        self.capacity = max(capacity, 1)
+        self.columns = {name: array(typecode, bytes(self.capacity * array(typecode).itemsize)) for name, typecode, _ in COLUMNS}
+        self.count = 0
+        self.names = []
+        self.name_ids = {}
+
+    def __len__(self):
+        return self.count
+
+    def name_id(self, name : str):
+        """
+        Returns the index of a name in the name table, adding it if needed. None is stored as NO_NAME.
+        """
+        if name is None:
+            return NO_NAME
+        index = self.name_ids.get(name)
+        if index is None:
+            index = self.name_ids[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def grow(self):
+        """
+        Double the size of the columns.
+        """
+        for column in self.columns.values():
+            column.frombytes(bytes(self.capacity * column.itemsize))
+        self.capacity *= 2
+
+    def record(self, kind : int, actor : str = None, target : str = None, value : int = 0, extra : int = 0):
+        """
+        Add an event to the log.
+
+        Parameters:
+            kind (int): The kind of event (e.g. PLAYER_ATTACK).
+            actor (str, optional): The name of who or what caused the event.
+            target (str, optional): The name of who or what the event happened to.
+            value (int): The event's main number (e.g. damage). Defaults to 0.
+            extra (int): A second number (e.g. health left). Defaults to 0.
+        """
+        if self.count == self.capacity:
+            self.grow()
+        index = self.count
+        columns = self.columns
+        columns["sequence"][index] = index
+        columns["kind"][index] = kind
+        columns["actor"][index] = self.name_id(actor)
+        columns["target"][index] = self.name_id(target)
+        columns["value"][index] = int(value)
+        columns["extra"][index] = int(extra)
+        self.count += 1
+
+    def rows(self):
+        """
+        Returns the records with their kinds and names written out, e.g. for CSV or for reading in tests.
+
+        Returns:
+            list: A (sequence, kind, actor, target, value, extra) tuple for every record.
+        """
+        def name(index):
+            return "" if index == NO_NAME else self.names[index]
+
+        columns = self.columns
+        return [
+            (columns["sequence"][i], KIND_NAMES.get(columns["kind"][i], str(columns["kind"][i])),
+             name(columns["actor"][i]), name(columns["target"][i]), columns["value"][i], columns["extra"][i])
+            for i in range(self.count)
+        ]
+
+    def to_numpy(self):
+        """
+        Returns the records as a NumPy structured array with one field per column.
+        """
+        import numpy as np # Imported here so the game doesn't load NumPy unless the log is exported
+        records = np.zeros(self.count, dtype = [(name, dtype) for name, _, dtype in COLUMNS])
+        for name, _, dtype in COLUMNS:
+            records[name] = np.frombuffer(self.columns[name], dtype = dtype.lstrip("<"), count = self.count)
+        return records
+
+    def save_npy(self, path : str):
+        """
+        Save the records as a .npy file. The name table is saved next to it as <name>.names.json.
+
+        Parameters:
+            path (str): The .npy file to write.
+        """
+        import numpy as np
+        np.save(path, self.to_numpy())
+        with open(names_path(path), "w") as names_file:
+            json.dump(self.names, names_file)
+
+    def save(self, path : str):
+        """
+        Save the log as CSV if the path ends in .csv, otherwise as a .npy file.
+
+        Parameters:
+            path (str): The file to write.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok = True)
+        if path.lower().endswith(".csv"):
+            self.save_csv(path)
+        else:
+            self.save_npy(path)
+
+    @classmethod
+    def load_npy(cls, path : str):
+        """
+        Load a log saved with save_npy, e.g. to replay or analyse it.
+
+        Parameters:
+            path (str): The .npy file to read.
+
+        Returns:
+            log (EventLog): The loaded log.
+        """
+        import numpy as np
+        records = np.load(path)
+        log = cls(len(records))
+        for name, typecode, _ in COLUMNS:
+            log.columns[name][:len(records)] = array(typecode, records[name].tolist())
+        log.count = len(records)
+        with open(names_path(path), "r") as names_file:
+            for name in json.load(names_file):
+                log.name_id(name)
+        return log
+
+    def save_csv(self, path : str):
+        """
+        Save the records as CSV with a header row, with kinds and names written out.
+
+        Parameters:
+            path (str): The CSV file to write.
+        """
+        with open(path, "w", newline = "") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow([name for name, _, _ in COLUMNS])
+            writer.writerows(self.rows())
+
+
+def names_path(path : str):
+    """
+    Returns the path of the name table saved with a .npy log.
+    """
+    return f"{os.path.splitext(path)[0]}.names.json"
+
+current_log = contextvars.ContextVar("current_log", default = None)
+
+def get_event_log():
+    """
+    Returns the event log of the session running in the current context, or None if events aren't being logged.
+    """
+    return current_log.get()
+
+def set_event_log(log : EventLog):
+    """
+    Log the events of the current context, e.g. the asyncio task running a session.
+
+    Returns:
+        token: Token to pass to reset_event_log.
+    """
+    return current_log.set(log)
+
+def reset_event_log(token):
+    """
+    Restore the event log that was in use before set_event_log.
+    """
+    current_log.reset(token)
+
+def log_event(kind : int, actor : str = None, target : str = None, value : int = 0, extra : int = 0):
+    """
+    Add an event to the current event log. Does nothing if no log is set.
+    """
+    log = current_log.get()
+    if log is not None:
+        log.record(kind, actor, target, value, extra)
+
+def log_combat_records(records : list, creature : object):
+    """
+    Add the records returned by CombatEngine to the current event log.
+
+    Parameters:
+        records (list): The engine's records.
+        creature (Creature): The creature being fought.
+    """
+    log = current_log.get()
+    if log is None:
+        return
+    for record in records:
+        record_type = record["type"]
+        if record_type == "player_attack":
+            log.record(PLAYER_ATTACK, None, creature.name, record["damage"], record["creature_health"])
+        elif record_type == "creature_attack":
+            log.record(CREATURE_ATTACK, creature.name, None, record["damage_taken"], record["absorbed"])
+        elif record_type == "item_used":
+            log.record(ITEM_USED, None, record["item"].name, record["health"])
+        elif record_type == "item_equipped":
+            log.record(ITEM_EQUIPPED, None, record["item"].name)
+        elif record_type == "flee":
+            log.record(FLEE_ATTEMPT, creature.name, None, record["success"])
+        elif record_type == "rewards":
+            log.record(REWARD_XP, creature.name, None, record["xp"])
+            if record["item"]:
+                log.record(REWARD_ITEM, creature.name, record["item"])
+        elif record_type == "gold":
+            log.record(REWARD_GOLD, creature.name, None, record["amount"], record["gold"])
+        elif record_type == "level_up":
+            log.record(LEVEL_UP, None, None, record["level"])
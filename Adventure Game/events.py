@@ -1,7 +1,18 @@
 from combat import combat
-from creature import create_creature
 from choice import continue_clear_screen
 from formatter import Formatter
+from game_io import get_io
+from event_log import log_event, ENCOUNTER, TREASURE
+
+# Gold found in a treasure of each quality level
+QUALITY_GOLD_REWARDS = {
+    1: 10,  # Common
+    2: 20,  # Blessed
+    3: 35,  # Enchanted
+    4: 50,  # Arcane
+    5: 75,  # Mythic
+    6: 100  # Divine
+}
 
 class Event:
     """
@@ -15,7 +26,7 @@ class Event:
         self.player = player
         self.area = area
 
-    def trigger(self):
+    async def trigger(self):
         """
         Triggers the event. To be implemented by subclasses.
         """
@@ -34,26 +45,28 @@ class CreatureCombatEvent(Event):
     def __init__(self, player : object, area : object):
         super().__init__(player, area)
         
-    def trigger(self):
+    async def trigger(self):
         """
         Triggers a combat event with creatures in the area.
         """
+        io = get_io()
         self.area.generate_creatures()
+        log_event(ENCOUNTER, self.area.name, None, len(self.area.creatures))
 
         while self.area.creatures:
             creature = self.area.creatures.pop(0)
-            print(f"You encounter a {Formatter.red_bold(creature.name)}!")
-            result = combat(self.player, creature, self.area)
+            io.write(f"You encounter a {Formatter.red_bold(creature.name)}!")
+            result = await combat(self.player, creature, self.area)
 
             if result == "fled":
-                print(Formatter.green_bold(f"{self.player.name} has fled from combat!"))
+                io.write(Formatter.green_bold(f"{self.player.name} has fled from combat!"))
                 return
 
             if self.player.health <= 0:
-                print(Formatter.red_bold("Game over!"))
+                io.write(Formatter.red_bold("Game over!"))
                 return
             
-            continue_clear_screen()
+            await continue_clear_screen()
 
 
 class BossEvent(Event):
@@ -67,26 +80,27 @@ class BossEvent(Event):
     def __init__(self, player : object, area : object):
         super().__init__(player, area)
 
-    def trigger(self):
+    async def trigger(self):
         """
         Triggers a boss encounter, where the boss appears if it hasn't been defeated.
         """
+        io = get_io()
         if self.area.boss and not self.area.boss_active:
-            boss = create_creature(self.area.boss)
+            boss = self.area.boss_template.spawn()
             self.area.boss_active = True
-            print(f"{Formatter.grey('The boss')} {Formatter.red_bold(boss.name)} {Formatter.grey('has appeared!')}")
-            result = combat(self.player, boss, self.area)
+            io.write(f"{Formatter.grey('The boss')} {Formatter.red_bold(boss.name)} {Formatter.grey('has appeared!')}")
+            result = await combat(self.player, boss, self.area)
             
             if result == "fled":
-                print(Formatter.green_bold(f"{self.player.name} has fled from the boss battle!"))
+                io.write(Formatter.green_bold(f"{self.player.name} has fled from the boss battle!"))
             elif self.player.health <= 0:
-                print(Formatter.red_bold("Game over!")) 
+                io.write(Formatter.red_bold("Game over!")) 
             else:
                 self.area.boss_active = False
             
-            continue_clear_screen()
+            await continue_clear_screen()
         else:
-            print(Formatter.blue("The boss has already been defeated or does not exist in this area."))
+            io.write(Formatter.blue("The boss has already been defeated or does not exist in this area."))
 
 class TreasureEvent(Event):
     """
@@ -100,21 +114,14 @@ class TreasureEvent(Event):
         super().__init__(player, area)
         self.chance = area.treasure_chance # Chance of finding treasure
 
-    def trigger(self):
+    async def trigger(self):
         """
         Triggers a treasure event.
         """
-        quality_gold_rewards = {
-            1: 10,  # Common
-            2: 20,  # Blessed
-            3: 35,  # Enchanted
-            4: 50,  # Arcane
-            5: 75,  # Mythic
-            6: 100  # Divine
-        }
-
+        io = get_io()
         quality = self.area.choose_quality()
-        gold_reward = quality_gold_rewards.get(quality, 10)
+        gold_reward = QUALITY_GOLD_REWARDS.get(quality, 10)
+        log_event(TREASURE, self.area.name, None, quality, gold_reward)
 
-        print(f"You received {Formatter.yellow_bold(gold_reward)} gold as a reward!")
+        io.write(f"You received {Formatter.yellow_bold(gold_reward)} gold as a reward!")
         self.player.adjust_gold(gold_reward)
\ No newline at end of file
@@ -1,11 +1,88 @@
-from colorama import Fore, Style, init
+import os, sys
+from colorama import Fore, Style
+
+# Escape codes of each style, joined once here instead of on every call
+STYLE_CODES = {
+    "LOCATION_NAME": Style.BRIGHT + Fore.YELLOW,
+    "CYAN_BOLD": Style.BRIGHT + Fore.CYAN,
+    "YELLOW_BOLD": Style.BRIGHT + Fore.YELLOW,
+    "BLUE": Fore.BLUE,
+    "BLUE_BOLD": Style.BRIGHT + Fore.BLUE,
+    "GREEN_BOLD": Fore.GREEN + Style.BRIGHT,
+    "RED_BOLD": Fore.RED + Style.BRIGHT,
+    "RED_DIM": Fore.RED + Style.DIM,
+    "MAGENTA_BOLD": Style.BRIGHT + Fore.MAGENTA,
+    "YELLOW_STAT": Style.BRIGHT + Fore.YELLOW,
+    "YELLOW_STAT_VALUE": Fore.WHITE,
+    "MAGENTA": Fore.MAGENTA,
+    "LIGHT_BLUE": Fore.LIGHTBLUE_EX,
+    "LIGHT_MAGENTA": Style.BRIGHT + Fore.LIGHTMAGENTA_EX,
+    "LIGHT_YELLOW": Fore.LIGHTYELLOW_EX,
+    "WHITE_CYAN_STAT": Style.BRIGHT + Fore.LIGHTWHITE_EX,
+    "WHITE_CYAN_STAT_VALUE": Fore.LIGHTCYAN_EX,
+    "GREY": Fore.LIGHTBLACK_EX,
+    "WHITE_BOLD": Fore.WHITE + Style.BRIGHT,
+    "RESET": Style.RESET_ALL,
+}
+
+def color_supported(stream = None):
+    """
+    Checks whether a stream shows ANSI colors: it has to be a terminal, and colors mustn't be turned off
+    with the NO_COLOR environment variable or a "dumb" terminal. On Windows the console's ANSI support is switched on first.
+
+    Parameters:
+        stream (file, optional): The stream to check. Defaults to sys.stdout.
+
+    Returns:
+        bool: True if colors should be used, False otherwise.
+    """
+    stream = stream or sys.stdout
+    if os.environ.get("NO_COLOR") or os.environ.get("TERM") == "dumb":
+        return False
+    if not hasattr(stream, "isatty") or not stream.isatty():
+        return False
+    if os.name == "nt":
+        # Turns on ANSI support in the console, and only wraps stdout on old consoles that don't have it
+        from colorama import just_fix_windows_console
+        just_fix_windows_console()
+    return True
 
-init(autoreset=True)
 
 class Formatter:
     """
     Handles formatting of text output for the game.
+    The style codes are precomputed, and are all empty in no-color mode.
+
+    **Starting Attributes:**
+        **color** (bool):
+            Whether the styles add colors. Starts as True if stdout supports colors.
+        **codes** (dict):
+            The escape code of each style name in STYLE_CODES, or empty strings in no-color mode.
     """
+    color = True
+    codes = dict(STYLE_CODES)
+
+    @staticmethod
+    def set_color(enabled : bool):
+        """
+        Turn colors on or off for every style.
+
+        Parameters:
+            enabled (bool): True to add colors, False for no-color mode.
+        """
+        Formatter.color = enabled
+        Formatter.codes = dict(STYLE_CODES) if enabled else dict.fromkeys(STYLE_CODES, "")
+
+    @staticmethod
+    def style(style : str, text):
+        """
+        Wrap text in a style's escape code and a reset.
+
+        Parameters:
+            style (str): The style's name in STYLE_CODES.
+            text (str): The text to style.
+        """
+        return f"{Formatter.codes[style]}{text}{Formatter.codes['RESET']}"
 
     @staticmethod
     def location_name(name):
@@ -13,7 +90,7 @@ class Formatter:
         Format location name.
         Appearance: Bright cyan text.
         """
-        return f"{Style.BRIGHT}{Fore.YELLOW}-- {name} --{Style.RESET_ALL}"
+        return Formatter.style("LOCATION_NAME", f"-- {name} --")
     
     @staticmethod
     def cyan_bold(text):
@@ -21,7 +98,7 @@ class Formatter:
         Format general titles or sections.
         Appearance: Bright cyan text.
         """
-        return f"{Style.BRIGHT}{Fore.CYAN}{text}{Style.RESET_ALL}"
+        return Formatter.style("CYAN_BOLD", text)
     
     @staticmethod
     def yellow_bold(text):
@@ -29,7 +106,7 @@ class Formatter:
         Format yellow bold text.
         Appearance: Bright yellow text.
         """
-        return f"{Style.BRIGHT}{Fore.YELLOW}{text}{Style.RESET_ALL}"
+        return Formatter.style("YELLOW_BOLD", text)
 
     @staticmethod
     def blue(text):
@@ -37,7 +114,7 @@ class Formatter:
         Format blue text.
         Appearance: Blue text.
         """
-        return f"{Fore.BLUE}{text}{Style.RESET_ALL}"
+        return Formatter.style("BLUE", text)
     
     @staticmethod
     def blue_bold(text):
@@ -45,7 +122,7 @@ class Formatter:
         Format blue bold text.
         Appearance: Bright blue text.
         """
-        return f"{Style.BRIGHT}{Fore.BLUE}{text}{Style.RESET_ALL}"
+        return Formatter.style("BLUE_BOLD", text)
     
     @staticmethod
     def green_bold(text):
@@ -53,7 +130,7 @@ class Formatter:
         Format bright green bold text.
         Appearance: Bright green text.
         """
-        return f"{Fore.GREEN}{Style.BRIGHT}{text}{Style.RESET_ALL}"
+        return Formatter.style("GREEN_BOLD", text)
     
     @staticmethod
     def red_bold(text):
@@ -61,7 +138,7 @@ class Formatter:
         Format bright red bold text.
         Appearance: Bright red text.
         """
-        return f"{Fore.RED}{Style.BRIGHT}{text}{Style.RESET_ALL}"
+        return Formatter.style("RED_BOLD", text)
     
     @staticmethod
     def red_dim(text):
@@ -69,7 +146,7 @@ class Formatter:
         Format red dim text.
         Appearance: Red text.
         """
-        return f"{Fore.RED}{Style.DIM}{text}{Style.RESET_ALL}"
+        return Formatter.style("RED_DIM", text)
     
     @staticmethod
     def magenta_bold(text):
@@ -77,7 +154,7 @@ class Formatter:
         Format bright magenta bold text.
         Appearance: Bright magenta text.
         """
-        return f"{Style.BRIGHT}{Fore.MAGENTA}{text}{Style.RESET_ALL}"
+        return Formatter.style("MAGENTA_BOLD", text)
     
     @staticmethod
     def yellow_stat(name, value):
@@ -85,7 +162,8 @@ class Formatter:
         Format yellow stat name with white value.
         Appearance: Bright yellow stat name followed by white value.
         """
-        return f"{Style.BRIGHT}{Fore.YELLOW}{name}: {Fore.WHITE}{value}{Style.RESET_ALL}"
+        codes = Formatter.codes
+        return f"{codes['YELLOW_STAT']}{name}: {codes['YELLOW_STAT_VALUE']}{value}{codes['RESET']}"
     
     @staticmethod
     def magenta(text):
@@ -93,7 +171,7 @@ class Formatter:
         Format magenta text.
         Appearance: Magenta text.
         """
-        return f"{Fore.MAGENTA}{text}{Style.RESET_ALL}"
+        return Formatter.style("MAGENTA", text)
 
     @staticmethod
     def light_blue(text):
@@ -101,7 +179,7 @@ class Formatter:
         Format light blue text.
         Appearance: Light blue text.
         """
-        return f"{Fore.LIGHTBLUE_EX}{text}{Style.RESET_ALL}"
+        return Formatter.style("LIGHT_BLUE", text)
     
     @staticmethod
     def light_magenta(text):
@@ -109,7 +187,7 @@ class Formatter:
         Format light magenta text.
         Appearance: Light magenta text.
         """
-        return f"{Style.BRIGHT}{Fore.LIGHTMAGENTA_EX}{text}{Style.RESET_ALL}"
+        return Formatter.style("LIGHT_MAGENTA", text)
     
     @staticmethod
     def light_yellow(text):
@@ -117,7 +195,7 @@ class Formatter:
         Format light yellow text.
         Appearance: Light yellow text.
         """
-        return f"{Fore.LIGHTYELLOW_EX}{text}{Style.RESET_ALL}"
+        return Formatter.style("LIGHT_YELLOW", text)
     
     @staticmethod
     def white_cyan_stat(name, value):
@@ -125,7 +203,8 @@ class Formatter:
         Format white stat name with light cyan value.
         Appearance: Bright white stat name followed by light cyan value.
         """
-        return f"{Style.BRIGHT}{Fore.LIGHTWHITE_EX}{name}: {Fore.LIGHTCYAN_EX}{value}{Style.RESET_ALL}"
+        codes = Formatter.codes
+        return f"{codes['WHITE_CYAN_STAT']}{name}: {codes['WHITE_CYAN_STAT_VALUE']}{value}{codes['RESET']}"
     
     @staticmethod
     def grey(text):
@@ -133,7 +212,7 @@ class Formatter:
         Format grey text.
         Appearance: Grey text.
         """
-        return f"{Fore.LIGHTBLACK_EX}{text}{Style.RESET_ALL}"
+        return Formatter.style("GREY", text)
     
     @staticmethod
     def white_bold(text):
@@ -141,4 +220,7 @@ class Formatter:
         Format white text.
         Appearance: Bright white text.
         """
-        return f"{Fore.WHITE}{Style.BRIGHT}{text}{Style.RESET_ALL}"
\ No newline at end of file
+        return Formatter.style("WHITE_BOLD", text)
+
+
+Formatter.set_color(color_supported())
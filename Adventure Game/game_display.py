@@ -5,14 +5,13 @@ from ui.button import Button
 from ui.status_ui import StatusUI
 from ui.inventory_ui import InventoryUI
 from ui.shop_ui import ShopUI
+from ui.fonts import preload_fonts, clear_fonts
+from game_io import get_io
 
 
-pg.init()
-
-infoObject = pg.display.Info()
-SCREEN_WIDTH = min(infoObject.current_w, 800)
-SCREEN_HEIGHT = min(infoObject.current_h, 600)
-FPS = 60
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+IDLE_TIMEOUT = 500 # Longest time in milliseconds to wait for an event
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -31,12 +30,40 @@ UI_MAPPING = {
     "Visit the Adventurer's Shop": "shop_ui",
 }
 
+def init_display():
+    """
+    Initializes pygame and fits the window size to the display.
+    Called when the game window is created, so importing this module doesn't start pygame.
+    """
+    global SCREEN_WIDTH, SCREEN_HEIGHT
+    pg.init()
+
+    infoObject = pg.display.Info()
+    SCREEN_WIDTH = min(infoObject.current_w, 800)
+    SCREEN_HEIGHT = min(infoObject.current_h, 600)
+    preload_fonts()
+
 class GameDisplay:
     """
     Manages the main game window, UI elements, and transitions between screens.
+
+    Only the parts of the window that changed are redrawn: hover changes invalidate their button's rect, changes inside
+    an open popup invalidate the popup, and opening or closing popups, location switches and resizes invalidate the whole window.
+    Nothing is drawn while nothing has changed.
+
+    Parameters:
+        dirty_rendering (bool): Whether to redraw only the invalidated parts of the window. If False, the whole window
+            is redrawn every frame. Defaults to True.
+
+    **Starting Attributes:**
+        **dirty_rects** (list):
+            The rects to redraw on the next frame.
+        **full_redraw** (bool):
+            Whether the whole window needs redrawing on the next frame. Starts as True.
     """
-    def __init__(self):
+    def __init__(self, dirty_rendering = True):
         """Initializes the game window and starts the UI."""
+        init_display()
         self.screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pg.RESIZABLE)
         pg.display.set_caption("Adventure Game")
         self.clock = pg.time.Clock()
@@ -46,15 +73,20 @@ class GameDisplay:
         self.disable_clicks = False
         self.locations = None
         self.choice_box_height = min(int(SCREEN_HEIGHT * 0.15), SCREEN_HEIGHT // 4)
+        self.choice_box = None # The translucent box behind the buttons and its position, made in update_ui
         self.buttons = []
 
+        self.dirty_rendering = dirty_rendering
+        self.dirty_rects = []
+        self.full_redraw = True
+
         self.ui_manager = UIManager(self.screen)
         self.status_ui = StatusUI(self.screen, self.ui_manager)
         self.inventory_ui = InventoryUI(self.screen, self.ui_manager, None)
         self.shop_ui = ShopUI(self.screen, self.ui_manager, None, None)
 
-    def initialize_game(self, player, locations, shops):
-        """Starts the main game after initialization."""
+    def initialize_game(self, player, locations, shops, run_loop = True):
+        """Starts the main game after initialization. The game loop is skipped if run_loop is False."""
         self.player = player
         self.locations = locations
         self.shops = shops
@@ -62,7 +94,8 @@ class GameDisplay:
         self.current_location = self.locations["home"]
         self.update_background("home")
         self.update_ui()
-        self.game_loop()
+        if run_loop:
+            self.game_loop()
 
     def load_background(self, location_key):
         """Loads and scales the background image for the current location."""
@@ -82,6 +115,19 @@ class GameDisplay:
         else:
             print(f"No background found for {location_name}, using default.")
             self.current_background = self.load_background("home")  # Default to home background
+        self.invalidate()
+
+    def invalidate(self, rect = None):
+        """
+        Marks part of the window to be redrawn on the next frame.
+
+        Parameters:
+            rect (pygame.Rect, optional): The part to redraw. Defaults to the whole window.
+        """
+        if rect is None:
+            self.full_redraw = True
+        else:
+            self.dirty_rects.append(pg.Rect(rect))
  
     def update_ui(self):
         """Updates the buttons dynamically based on the current location."""
@@ -118,6 +164,15 @@ class GameDisplay:
 
             self.buttons.append(Button(choice.description, int(button_width * 0.1 - 2), x, y, button_width, button_height, 8,action))
 
+        # The box behind the buttons only changes with the buttons, so it is made here rather than every frame
+        self.choice_box = None
+        if self.buttons:
+            box_top = min(button.rect.top for button in self.buttons) - int(screen_height * 0.02)
+            choice_box = pg.Surface((screen_width, screen_height - box_top), pg.SRCALPHA)
+            choice_box.fill(TRANSPARENT_GREY)
+            self.choice_box = (choice_box, (0, box_top))
+        self.invalidate()
+
     def handle_choice(self, choice):
         """Handles player choices and location changes dynamically."""
         self.disable_clicks = True
@@ -145,38 +200,88 @@ class GameDisplay:
             self.update_ui()
             self.draw()
 
-        pg.time.set_timer(pg.USEREVENT, 200)
+        pg.time.set_timer(pg.USEREVENT, 200, 1)
 
-    def draw(self):
-        """Handles rendering all game elements on the screen."""
+    def draw_scene(self):
+        """Draws every game element onto the screen surface, within its clip rect."""
         self.screen.fill(BLACK)
 
         # Draw background
         if self.current_background:
             self.screen.blit(self.current_background, (0, 0))
 
-        screen_width, screen_height = self.screen.get_size()
-
-        if self.buttons:
-            start_y = min(button.rect.top for button in self.buttons)
-
-            choice_box_height = (screen_height - start_y) + int(screen_height * 0.02)
-
-            choice_box = pg.Surface((screen_width, choice_box_height), pg.SRCALPHA)
-            choice_box.fill(TRANSPARENT_GREY)
-            self.screen.blit(choice_box, (0, start_y - int(screen_height * 0.02)))
+        if self.choice_box:
+            self.screen.blit(*self.choice_box)
 
+        clip = self.screen.get_clip()
         for button in self.buttons:
-            button.draw(self.screen)
+            if clip.colliderect(button.rect):
+                button.draw(self.screen)
 
         self.ui_manager.draw()
-        pg.display.flip()
 
+    def draw(self):
+        """Handles rendering all game elements on the screen. Only the invalidated parts are drawn and updated."""
+        if not self.dirty_rendering or self.full_redraw:
+            self.draw_scene()
+            pg.display.flip()
+        elif self.dirty_rects:
+            rects = self.dirty_rects
+            for rect in rects:
+                self.screen.set_clip(rect)
+                self.draw_scene()
+            self.screen.set_clip(None)
+            pg.display.update(rects)
+
+        self.full_redraw = False
+        self.dirty_rects = []
+
+
+    def popup_view(self, ui):
+        """
+        Returns what an open popup shows: its rect and each of its buttons with its current color.
+
+        Parameters:
+            ui (object): The open popup.
+        """
+        rect = pg.Rect(ui.popup_x, ui.popup_y, ui.popup_width, ui.popup_height)
+        return rect, [(button, button.current_color) for button in ui.visible_buttons()]
+
+    def invalidate_popup(self, ui, shown):
+        """
+        Invalidates what changed in a popup since popup_view returned shown. Hover changes only invalidate their button;
+        new buttons (a tab switch, a bought item or a nested popup) invalidate the popup, and a moved popup the whole window.
+
+        Parameters:
+            ui (object): The open popup.
+            shown (tuple): What popup_view returned before the popup handled an event.
+        """
+        rect, buttons = self.popup_view(ui)
+        if rect != shown[0]:
+            self.invalidate()
+        elif [button for button, _ in buttons] != [button for button, _ in shown[1]]:
+            self.invalidate(rect)
+        else:
+            for (button, color), (_, old_color) in zip(buttons, shown[1]):
+                if color != old_color:
+                    self.invalidate(button.rect)
+
+    def next_events(self):
+        """
+        Returns the events to handle this frame. Nothing on screen animates, so this sleeps until an event arrives
+        (including the USEREVENT timer that re-enables clicks), or for at most IDLE_TIMEOUT so text written by the game is still shown.
+        """
+        event = pg.event.wait(IDLE_TIMEOUT)
+        self.clock.tick()
+        events = [] if event.type == pg.NOEVENT else [event]
+        return events + pg.event.get()
 
     def game_loop(self):
         """Main pygame loop to update and render everything."""
+        self.draw()
         while self.running:
-            for event in pg.event.get():
+            for event in self.next_events():
+                active_ui = self.ui_manager.active_ui
                 if event.type == pg.QUIT:
                     self.running = False
 
@@ -187,10 +292,13 @@ class GameDisplay:
                     self.update_ui()
 
                 elif self.ui_manager.active_ui:
+                    shown = self.popup_view(active_ui)
                     self.ui_manager.handle_event(event)
                     if not self.ui_manager.active_ui:
                         self.disable_clicks = False
                         self.update_ui()
+                    else:
+                        self.invalidate_popup(active_ui, shown)
                     continue
 
                 elif event.type == pg.USEREVENT:
@@ -198,10 +306,17 @@ class GameDisplay:
                     continue
 
                 for button in self.buttons:
+                    color = button.current_color
                     button.handle_event(event, self.disable_clicks)
+                    if button.current_color != color:
+                        self.invalidate(button.rect)
+
+                if self.ui_manager.active_ui is not active_ui: # A button opened a popup
+                    self.invalidate()
 
+            get_io().flush() # Show any text the game logic wrote this frame
             self.draw()
-            self.clock.tick(FPS)
 
+        clear_fonts()
         pg.quit()
         sys.exit()
\ No newline at end of file
@@ -0,0 +1,426 @@
+import asyncio, atexit, collections, contextvars, sys, threading
+from formatter import Formatter
+from terminal import TerminalRenderer
+
+class GameIO:
+    """
+    Base class for how a game session reads the player's input and shows text.
+    Interaction points await read_line and pause instead of blocking on input(), so many sessions can share one event loop.
+
+    **Starting Attributes:**
+        **types_text** (bool):
+            Whether story text is typed out slowly. Only the console can skip typing with the Space key,
+            so other IOs get the text written instantly. Defaults to False.
+        **durable** (callable or None):
+            Awaited before text is shown at a prompt or pause, e.g. the journal's sync, so the player never sees
+            a change acknowledged before it has been made durable. Defaults to None.
+    """
+    types_text = False
+    durable = None
+
+    async def settle(self):
+        """
+        Wait until the changes behind the text about to be shown are durable.
+        """
+        if self.durable:
+            await self.durable()
+
+    async def read_line(self, prompt : str = ""):
+        """
+        Show the prompt and wait for a line of input.
+
+        Parameters:
+            prompt (str): The text to show before the input.
+
+        Returns:
+            str: The line entered, without the newline.
+
+        Raises:
+            EOFError: If the input has been closed.
+        """
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    def write(self, text : str = "", end : str = "\n"):
+        """
+        Show text to the player.
+
+        Parameters:
+            text (str): The text to show.
+            end (str): Appended after the text. Defaults to a newline.
+        """
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    async def pause(self, pause_time : int):
+        """
+        Wait until the set amount of time has passed or the player presses Enter.
+
+        Parameters:
+            pause_time (int): The number of seconds to wait.
+        """
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    def clear(self):
+        """
+        Clear the player's screen.
+        """
+
+    def flush(self):
+        """
+        Write out any buffered text.
+        """
+
+
+class BatchWriter:
+    """
+    Collects text and writes it to a stream in one go. The text is encoded once per batch and written
+    straight to the stream's binary buffer when it has one, skipping the text layer's per-write work.
+
+    Parameters:
+        stream (file, optional): The stream to write to. Defaults to sys.stdout at the time of each flush.
+        limit (int): The number of pending writes after which the batch is flushed anyway. Defaults to 64.
+    """
+    def __init__(self, stream = None, limit : int = 64):
+        self.stream = stream
+        self.limit = limit
+        self.pending = []
+
+    def write(self, text : str):
+        """
+        Add text to the batch.
+        """
+        self.pending.append(text)
+        if len(self.pending) >= self.limit:
+            self.flush()
+
+    def flush(self):
+        """
+        Write out the batch.
+        """
+        stream = self.stream or sys.stdout
+        if self.pending:
+            text = "".join(self.pending)
+            self.pending.clear()
+            buffer = getattr(stream, "buffer", None)
+            if buffer is not None:
+                stream.flush() # Keep anything already written through the text layer in order
+                buffer.write(text.encode(stream.encoding or "utf-8", errors = "replace"))
+                buffer.flush()
+                return
+            stream.write(text)
+        stream.flush()
+
+
+class InputReader:
+    """
+    One long-lived thread that reads lines from a stream and hands each line to the wait point that asked first.
+    Wait points subscribe with read_line, optionally with a timeout. Cancelling the task that awaits read_line
+    (or timing out) removes its subscription, so no thread is left behind. Lines typed while nobody is waiting
+    are kept for the next wait point.
+
+    Parameters:
+        stream (file, optional): The stream to read from. Defaults to sys.stdin.
+
+    **Starting Attributes:**
+        **closed** (bool):
+            Whether the stream has ended. Starts as False.
+    """
+    def __init__(self, stream = None):
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.waiters = collections.deque()
+        self.lines = collections.deque()
+        self.closed = False
+        self.thread = None
+
+    def start(self):
+        """
+        Start the reading thread if it isn't running yet.
+        """
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target = self.run, name = "InputReader", daemon = True)
+                self.thread.start()
+
+    def run(self):
+        """
+        Read lines until the stream ends. Runs on the reading thread.
+        """
+        stream = self.stream or sys.stdin
+        while True:
+            try:
+                line = stream.readline()
+            except (OSError, ValueError):
+                line = ""
+
+            with self.lock:
+                if not line:
+                    self.closed = True
+                    while self.waiters:
+                        loop, future = self.waiters.popleft()
+                        self.call_in_loop(loop, self.fail, future)
+                    return
+
+                line = line.rstrip("\r\n")
+                while self.waiters:
+                    loop, future = self.waiters.popleft()
+                    if self.call_in_loop(loop, self.deliver, future, line):
+                        break
+                else:
+                    self.lines.append(line)
+
+    def call_in_loop(self, loop, callback, *args):
+        """
+        Schedule a callback on a waiter's event loop.
+
+        Returns:
+            bool: False if the loop has already been closed.
+        """
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+            return True
+        except RuntimeError:
+            return False
+
+    def deliver(self, future, line : str):
+        """
+        Give a line to a waiter. If the waiter gave up in the meantime the line is kept for the next one.
+        """
+        if future.done():
+            with self.lock:
+                self.lines.appendleft(line)
+        else:
+            future.set_result(line)
+
+    def fail(self, future):
+        """
+        Tell a waiter that the stream has ended.
+        """
+        if not future.done():
+            future.set_exception(EOFError())
+
+    async def read_line(self, timeout : float = None):
+        """
+        Wait for the next line.
+
+        Parameters:
+            timeout (float, optional): The number of seconds to wait. Defaults to waiting until a line arrives.
+
+        Returns:
+            str or None: The line, without the newline, or None if the timeout passed first.
+
+        Raises:
+            EOFError: If the stream has ended.
+        """
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            if self.lines:
+                return self.lines.popleft()
+            if self.closed:
+                raise EOFError
+            waiter = (loop, loop.create_future())
+            self.waiters.append(waiter)
+        self.start()
+
+        try:
+            return await asyncio.wait_for(waiter[1], timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self.lock:
+                if waiter in self.waiters:
+                    self.waiters.remove(waiter)
+
+
+class ConsoleIO(GameIO):
+    """
+    Reads from and writes to the terminal the game was started in.
+    Written text is batched and sent to the terminal in one write at the next prompt, pause or clear.
+    The screen is cleared and redrawn by a TerminalRenderer, which only rewrites the lines that changed.
+    Input comes from the shared console InputReader.
+
+    Parameters:
+        buffer_limit (int): The number of pending writes after which they are written out anyway. Defaults to 64.
+    """
+    types_text = True
+
+    def __init__(self, buffer_limit : int = 64):
+        self.writer = BatchWriter(limit = buffer_limit)
+        self.renderer = TerminalRenderer(self.writer.write)
+
+    async def read_line(self, prompt : str = ""):
+        await self.settle()
+        self.renderer.write(prompt)
+        self.flush()
+        line = await console_input.read_line()
+        self.renderer.echo(f"{line}\n") # The terminal shows what the player typed
+        return line
+
+    def write(self, text : str = "", end : str = "\n"):
+        self.renderer.write(f"{text}{end}")
+
+    def flush(self):
+        self.renderer.flush()
+        self.writer.flush()
+
+    async def pause(self, pause_time : int):
+        await self.settle()
+        self.write(Formatter.blue("\nPress Enter to skip..."))
+        self.flush()
+
+        # Countdown timer for the pause, written over the same line each second
+        self.renderer.invalidate()
+        for remaining_time in range(pause_time, 0, -1):
+            self.writer.write(f"\r{Formatter.yellow_stat('Continuing in', remaining_time)} seconds... ")
+            self.writer.flush()
+            if await console_input.read_line(timeout = 1) is not None:
+                break
+
+    def clear(self):
+        self.renderer.clear()
+
+
+class QueueIO(GameIO):
+    """
+    In-memory input and output for sessions driven by code, e.g. bots or tests.
+
+    Parameters:
+        pause_scale (float): Multiplier for pause times. 0 skips pauses without using up any input. Defaults to 1.
+
+    **Starting Attributes:**
+        **output** (list):
+            Every piece of text written to the session, in order.
+    """
+    def __init__(self, pause_scale : float = 1):
+        self.pause_scale = pause_scale
+        self.lines = asyncio.Queue()
+        self.output = []
+
+    def feed(self, line : str):
+        """
+        Queue a line of input for the session.
+        """
+        self.lines.put_nowait(line)
+
+    def close(self):
+        """
+        Close the input. The session's next read raises EOFError once the queued lines are used up.
+        """
+        self.lines.put_nowait(None)
+
+    async def read_line(self, prompt : str = ""):
+        await self.settle()
+        if prompt:
+            self.output.append(prompt)
+        line = await self.lines.get()
+        if line is None:
+            self.lines.put_nowait(None) # Keep the input closed for later reads
+            raise EOFError
+        return line
+
+    def write(self, text : str = "", end : str = "\n"):
+        self.output.append(f"{text}{end}")
+
+    async def pause(self, pause_time : int):
+        await self.settle()
+        if pause_time * self.pause_scale <= 0:
+            return
+        try:
+            line = await asyncio.wait_for(self.lines.get(), pause_time * self.pause_scale)
+        except asyncio.TimeoutError:
+            return
+        if line is None:
+            self.lines.put_nowait(None)
+
+
+class StreamIO(GameIO):
+    """
+    Input and output over an asyncio stream, e.g. a player connected to the session host over TCP.
+    The remote screen is cleared and redrawn by a TerminalRenderer, assuming a standard 80x24 terminal.
+
+    Parameters:
+        reader (asyncio.StreamReader): The stream to read input lines from.
+        writer (asyncio.StreamWriter): The stream to write text to.
+    """
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.renderer = TerminalRenderer(self.send, lambda: (80, 24))
+
+    def send(self, text : str):
+        """
+        Send text to the remote terminal, converting line endings to CRLF.
+        """
+        self.writer.write(text.replace("\n", "\r\n").encode())
+
+    async def read_line(self, prompt : str = ""):
+        await self.settle()
+        self.renderer.write(prompt)
+        self.renderer.flush()
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise EOFError
+        line = line.decode(errors = "replace").rstrip("\r\n")
+        self.renderer.echo(f"{line}\n") # The remote terminal shows what the player typed
+        return line
+
+    def write(self, text : str = "", end : str = "\n"):
+        self.renderer.write(f"{text}{end}")
+
+    def flush(self):
+        self.renderer.flush()
+
+    async def pause(self, pause_time : int):
+        await self.settle()
+        self.write(Formatter.blue("\nPress Enter to skip..."))
+        self.renderer.flush()
+        await self.writer.drain()
+        try:
+            line = await asyncio.wait_for(self.reader.readline(), pause_time)
+            if not line:
+                raise EOFError
+            self.renderer.echo("\n")
+        except asyncio.TimeoutError:
+            pass
+
+    def clear(self):
+        self.renderer.clear()
+
+
+console_input = InputReader()
+console_io = ConsoleIO()
+atexit.register(console_io.flush) # Don't lose buffered text when the game exits
+current_io = contextvars.ContextVar("current_io", default = console_io)
+
+def get_io():
+    """
+    Returns the IO of the session running in the current context. Defaults to the console.
+    """
+    return current_io.get()
+
+def set_io(io : GameIO):
+    """
+    Use the given IO for the current context, e.g. the asyncio task running a session.
+
+    Returns:
+        contextvars.Token: Token to pass to reset_io to restore the previous IO.
+    """
+    return current_io.set(io)
+
+def reset_io(token):
+    """
+    Restore the IO that was in use before set_io.
+    """
+    current_io.reset(token)
+
+def run_sync(coroutine):
+    """
+    Run a coroutine to completion from synchronous code, e.g. the pygame loop.
+
+    Parameters:
+        coroutine (coroutine): The coroutine to run.
+
+    Returns:
+        The coroutine's result.
+    """
+    return asyncio.run(coroutine)
@@ -0,0 +1,126 @@
+from items import Weapon, Armour, Potion
+
+CATEGORIES = ("Weapons", "Armours", "Potions", "Misc")
+
+def item_category(item : object):
+    """
+    Returns the inventory category of an item (e.g. "Weapons").
+    """
+    if isinstance(item, Weapon):
+        return "Weapons"
+    if isinstance(item, Armour):
+        return "Armours"
+    if isinstance(item, Potion):
+        return "Potions"
+    return "Misc"
+
+
+class Inventory:
+    """
+    The player's items, stacked by item ID. Works like a dictionary of item ID -> {"item": Item, "quantity": int},
+    and also keeps an ordered index of the stacks in each category with the category's item count. The indexes are
+    updated as items are added and removed, so listing a category never looks at the rest of the inventory.
+
+    **Starting Attributes:**
+        **categories** (dict):
+            The stacks of each category, keyed by item ID, in the order they were added.
+        **counts** (dict):
+            The number of items in each category.
+        **versions** (dict):
+            A number per category that changes whenever the category changes, so displays know when to redraw it.
+    """
+    def __init__(self):
+        self.stacks = {}
+        self.categories = {category: {} for category in CATEGORIES}
+        self.counts = dict.fromkeys(CATEGORIES, 0)
+        self.versions = dict.fromkeys(CATEGORIES, 0)
+
+    def __getitem__(self, item_id : int):
+        return self.stacks[item_id]
+
+    def __contains__(self, item_id : int):
+        return item_id in self.stacks
+
+    def __iter__(self):
+        return iter(self.stacks)
+
+    def __len__(self):
+        return len(self.stacks)
+
+    def get(self, item_id : int, default = None):
+        return self.stacks.get(item_id, default)
+
+    def keys(self):
+        return self.stacks.keys()
+
+    def values(self):
+        return self.stacks.values()
+
+    def items(self):
+        return self.stacks.items()
+
+    def add(self, item : object, quantity : int = 1):
+        """
+        Add items to their stack, starting a new stack if needed.
+
+        Parameters:
+            item (Item): The item to add.
+            quantity (int): The number of items to add. Defaults to 1.
+
+        Returns:
+            dict: The item's stack.
+        """
+        stack = self.stacks.get(item.item_id)
+        if stack is None:
+            stack = self.stacks[item.item_id] = {"item": item, "quantity": 0, "category": item_category(item)}
+            self.categories[stack["category"]][item.item_id] = stack
+        stack["quantity"] += quantity
+        self.counts[stack["category"]] += quantity
+        self.versions[stack["category"]] += 1
+        return stack
+
+    def remove(self, item_id : int, quantity : int = 1):
+        """
+        Remove items from their stack, dropping the stack once it is empty.
+
+        Parameters:
+            item_id (int): The item's ID.
+            quantity (int): The number of items to remove. Defaults to 1.
+
+        Returns:
+            bool: True if the item was in the inventory.
+        """
+        stack = self.stacks.get(item_id)
+        if stack is None:
+            return False
+        category = stack["category"]
+        removed = min(quantity, stack["quantity"])
+        stack["quantity"] -= removed
+        self.counts[category] -= removed
+        if stack["quantity"] <= 0:
+            del self.stacks[item_id]
+            del self.categories[category][item_id]
+        self.versions[category] += 1
+        return True
+
+    def clear(self):
+        """
+        Remove every item.
+        """
+        self.stacks.clear()
+        for category in CATEGORIES:
+            self.categories[category].clear()
+            self.counts[category] = 0
+            self.versions[category] += 1
+
+    def category_items(self, category : str):
+        """
+        Returns the (item, quantity) pairs of a category, in the order they were added.
+        """
+        return [(stack["item"], stack["quantity"]) for stack in self.categories.get(category, {}).values()]
+
+    def category_ids(self, category : str):
+        """
+        Returns the item IDs of a category, in the order they were added.
+        """
+        return list(self.categories.get(category, ()))
@@ -1,5 +1,6 @@
-import json
-from formatter import Formatter
+from output import emit
+import sys
+from content import content, LazyDict, item_key
 
 class Item:
     """
@@ -9,11 +10,19 @@ class Item:
         name (str): The name of the item.
         effect_value (int): The effect value of the item (e.g., attack or defense bonus).
         description (str): A short description of the item and its effects.
+
+    **Starting Attributes:**
+        **key** (str):
+            The item's key in the content (e.g. "basic_sword"), interned so every module shares one string.
+        **item_id** (int or None):
+            The item's integer ID from the content pack, used to key inventories and shops. Set when the content is loaded.
     """
     def __init__(self, name : str, effect_value : int, description : str):
         self.name = name
         self.effect_value = effect_value
         self.description = description
+        self.key = sys.intern(item_key(name))
+        self.item_id = None
 
 class Weapon(Item):
     """
@@ -23,12 +32,18 @@ class Weapon(Item):
         """
         Unequip the player's current weapon (if any) and equip the new weapon, updating the player's attack stat.
         """
+        self.apply_equip(player)
+        emit("item_equipped", "{name:green_bold} equipped {item:cyan_bold}, gaining +{value:yellow_bold} attack.", name = player.name, item = self.name, value = self.effect_value)
+
+    def apply_equip(self, player : object):
+        """
+        Swap the player's weapon for this one and update the attack stat, without any output.
+        """
         if player.weapon:
             player.base_attack -= player.weapon.effect_value
         player.weapon = self
         player.base_attack += self.effect_value
         player.attack = player.base_attack
-        print(f"{Formatter.green_bold(player.name)} equipped {Formatter.cyan_bold(self.name)}, gaining +{Formatter.yellow_bold(self.effect_value)} attack.")
 
     def unequip(self, player : object):
         """
@@ -37,7 +52,7 @@ class Weapon(Item):
         if player.weapon:
             player.base_attack -= player.weapon.effect_value
             player.weapon = None
-            print(f"{Formatter.green_bold(player.name)} unequipped {Formatter.cyan_bold(self.name)}, losing -{Formatter.yellow_bold(self.effect_value)} attack.")
+            emit("item_unequipped", "{name:green_bold} unequipped {item:cyan_bold}, losing -{value:yellow_bold} attack.", name = player.name, item = self.name, value = self.effect_value)
 
 class Armour(Item):
     """
@@ -47,12 +62,18 @@ class Armour(Item):
         """
         Unequip the player's current armour (if any) and equip the new armour, updating the player's defence stat.
         """
+        self.apply_equip(player)
+        emit("item_equipped", "{name:green_bold} equipped {item:cyan_bold}, gaining +{value:yellow_bold} defence.", name = player.name, item = self.name, value = self.effect_value)
+    
+    def apply_equip(self, player : object):
+        """
+        Swap the player's armour for this one and update the defence stat, without any output.
+        """
         if player.armour:
             player.base_defence -= player.armour.effect_value
         player.armour = self
         player.base_defence += self.effect_value
-        print(f"{Formatter.green_bold(player.name)} equipped {Formatter.cyan_bold(self.name)}, gaining +{Formatter.yellow_bold(self.effect_value)} defence.")
-    
+
     def unequip(self, player : object):
         """
         Unequip the player's current armour, resetting the defence stat.
@@ -60,7 +81,7 @@ class Armour(Item):
         if player.armour:
             player.base_defence -= player.armour.effect_value
             player.armour = None
-            print(f"{Formatter.green_bold(player.name)} unequipped {Formatter.cyan_bold(self.name)}, losing -{Formatter.yellow_bold(self.effect_value)} defence.")
+            emit("item_unequipped", "{name:green_bold} unequipped {item:cyan_bold}, losing -{value:yellow_bold} defence.", name = player.name, item = self.name, value = self.effect_value)
 
 class Potion(Item):
     """
@@ -82,16 +103,32 @@ class Potion(Item):
         Parameters:
             player (Player): The player object the effect should be applied to.
         """
+        if not self.apply_effect(player):
+            emit("effect_already_active", "Strength potion already active.", "yellow_bold", item = self.name)
+        elif self.effect_type == "heal":
+            emit("item_used", "{name:green_bold} used {item:cyan_bold} and healed {value:green_bold} health.", name = player.name, item = self.name, value = self.effect_value)
+        elif self.effect_type == "strength_boost":
+            emit("effect_gained", "{name:green_bold} gained a temporary {effect:cyan_bold} effect.", name = player.name, effect = self.name)
+
+    def apply_effect(self, player : object):
+        """
+        Apply the potion's effect to the player without any output.
+
+        Parameters:
+            player (Player): The player object the effect should be applied to.
+
+        Returns:
+            bool: False if a strength boost is already active, True otherwise.
+        """
         if self.effect_type == "heal":
             # Heal the player by the effect value, up to their maximum health
             player.health = min(player.max_health, player.health + self.effect_value)
-            print(f"{Formatter.green_bold(player.name)} used {Formatter.cyan_bold(self.name)} and healed {Formatter.green_bold(self.effect_value)} health.")
         elif self.effect_type == "strength_boost":
             # Apply a strength boost effect if not already active
             if "strength_boost" in player.active_effects:
-                print(Formatter.yellow_bold("Strength potion already active."))
-            else:
-                player.add_effect(self.name, self.effect_type, self.effect_value, self.duration)
+                return False
+            player.active_effects[self.effect_type] = {"value": self.effect_value, "duration": self.duration}
+        return True
 
 class Misc(Item):
     """
@@ -105,34 +142,53 @@ class Misc(Item):
         self.item_type = item_type
 
 
-# Load items data from the JSON file
-with open("Adventure Game/json/items.json", "r") as items_file:
-    items_data = json.load(items_file)
+def create_item(record : dict, item_id : int = None):
+    """
+    Create an item object from its record in the content pack.
+
+    Parameters:
+        record (dict): The item's data, including its category.
+        item_id (int, optional): The item's ID in the content pack.
+
+    Returns:
+        item (Item): The item object of the right class for its category.
+    """
+    category = record["category"]
+    if category == "weapons":
+        item = Weapon(record["name"], record["effect_value"], record["desc"])
+    elif category == "armours":
+        item = Armour(record["name"], record["effect_value"], record["desc"])
+    elif category == "potions":
+        item = Potion(record["name"], record["effect_type"], record["effect_value"], record["desc"], record.get("duration"))
+    else:
+        item = Misc(record["name"], record["type"], record["effect_value"], record["desc"])
+    item.item_id = item_id
+    return item
+
+def create_items():
+    """
+    Create every item in the content pack, sorted into categories.
+
+    Returns:
+        categories (dict): Dictionary of item categories and their item dictionaries.
+    """
+    categories = {"weapons": {}, "armours": {}, "potions": {}, "miscellaneous": {}}
+    item_ids = content.ids("items")
+    for key, record in content.section("items").items():
+        categories[record["category"]][key] = create_item(record, item_ids[key])
+    return categories
+
+# Items are created the first time any of the dictionaries is used
+item_categories = LazyDict(create_items)
 
 # Dictionaries to store different types of items
-weapons = {}
-armours = {}
-potions = {}
-miscellaneous = {}
-
-# Create item objects from the loaded data and store them in the right dictionaries
-for weapon in items_data["weapons"]:
-    weapons[weapon["name"].lower().replace(" ", "_")] = Weapon(weapon["name"], weapon["effect_value"], weapon["desc"])
-
-for armour in items_data["armours"]:
-    armours[armour["name"].lower().replace(" ", "_")] = Armour(armour["name"], armour["effect_value"], armour["desc"])
-
-for potion in items_data["potions"]:
-    potions[potion["name"].lower().replace(" ", "_")] = Potion(
-        potion["name"],
-        potion["effect_type"],
-        potion["effect_value"],
-        potion["desc"],
-        potion.get("duration")
-    )
-
-for misc in items_data["miscellaneous"]:
-    miscellaneous[misc["name"].lower().replace(" ", "_")] = Misc(misc["name"], misc["type"], misc["effect_value"], misc["desc"])
+weapons = LazyDict(lambda: item_categories["weapons"])
+armours = LazyDict(lambda: item_categories["armours"])
+potions = LazyDict(lambda: item_categories["potions"])
+miscellaneous = LazyDict(lambda: item_categories["miscellaneous"])
 
 # Combine all items into a single dictionary
-all_items = {**weapons, **armours, **potions, **miscellaneous}
\ No newline at end of file
+all_items = LazyDict(lambda: {**weapons, **armours, **potions, **miscellaneous})
+
+# Every item by its ID
+items_by_id = LazyDict(lambda: {item.item_id: item for item in all_items.values()})
@@ -0,0 +1,461 @@
+import asyncio, os, struct, zlib
+from items import all_items
+from quest import StoryQuest
+from save import SaveError, snapshot, restore, world_state, all_quests
+
+RECORD_HEADER = struct.Struct("<II") # Length of the record body, CRC32 of the body
+RECORD_START = struct.Struct("<QB") # Sequence number, operation
+STRING_LENGTH = struct.Struct("<H")
+AMOUNT = struct.Struct("<i")
+QUANTITY = struct.Struct("<I")
+STEP = struct.Struct("<H")
+SNAPSHOT_HEADER = struct.Struct("<Q") # Sequence number of the last journal record the snapshot includes
+
+# Operations recorded in the journal
+GOLD_CHANGED = 1
+ITEM_ADDED = 2
+ITEM_REMOVED = 3
+QUEST_STEP = 4
+QUEST_COMPLETED = 5
+AREA_UNLOCKED = 6
+# Markers ending the records of one player action: a committed action is replayed, an interrupted one is dropped
+ACTION_COMMITTED = 7
+ACTION_ABORTED = 8
+
+
+def pack_string(string : str):
+    """
+    Returns a string as its length followed by its UTF-8 bytes.
+    """
+    encoded = string.encode("utf-8")
+    return STRING_LENGTH.pack(len(encoded)) + encoded
+
+def unpack_string(body : bytes, offset : int):
+    """
+    Read a string packed by pack_string.
+
+    Returns:
+        tuple: The string and the offset after it.
+    """
+    length, = STRING_LENGTH.unpack_from(body, offset)
+    offset += STRING_LENGTH.size
+    return body[offset:offset + length].decode("utf-8"), offset + length
+
+
+class Journal:
+    """
+    Append-only log of the state changes of every session, shared so that one write and fsync (a group commit)
+    makes the changes of many sessions durable at once. Appending only adds the record to the next batch;
+    sessions await sync before showing the player anything that depends on it, so nothing is acknowledged
+    before it is on disk. The write and fsync run in a worker thread, so a commit doesn't stall the event loop.
+
+    Parameters:
+        path (str): The journal file.
+        commit_interval (float): The longest time in seconds a record waits before its batch is committed. Defaults to 0.01.
+
+    **Starting Attributes:**
+        **commits** (int):
+            The number of batches written. Starts at 0.
+        **appended** (int):
+            The number of records appended. Starts at 0.
+        **durable** (int):
+            The number of records written and fsynced. Starts at 0.
+    """
+    def __init__(self, path : str, commit_interval : float = 0.01):
+        self.path = path
+        self.commit_interval = commit_interval
+        self.pending = []
+        self.waiters = [] # (number of records to wait for, future)
+        self.commits = 0
+        self.appended = 0
+        self.durable = 0
+        self.file = None
+        self.wake = None
+        self.running = False
+        self.lock = asyncio.Lock() # Keeps batches in order when commits overlap
+
+    def open(self):
+        """
+        Open the journal file for appending if it isn't open yet.
+        """
+        if self.file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok = True)
+            self.file = open(self.path, "ab")
+
+    def append(self, session_id : str, sequence : int, operation : int, payload : bytes):
+        """
+        Add a record to the next batch.
+
+        Parameters:
+            session_id (str): The session the change belongs to.
+            sequence (int): The session's sequence number of the change.
+            operation (int): The kind of change (e.g. GOLD_CHANGED).
+            payload (bytes): The operation's data.
+        """
+        body = RECORD_START.pack(sequence, operation) + pack_string(session_id) + payload
+        self.pending.append(RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body)
+        self.appended += 1
+        if self.wake:
+            self.wake.set()
+
+    def take_batch(self):
+        """
+        Returns the pending records as one batch and the number of records that will be durable once it is written.
+        """
+        batch = b"".join(self.pending)
+        self.pending.clear()
+        return batch, self.appended
+
+    def write(self, batch : bytes):
+        """
+        Write a batch in one write and fsync it.
+        """
+        self.open()
+        self.file.write(batch)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def committed(self, batch : bytes, durable : int):
+        """
+        Count a written batch and release everyone waiting in sync for records it made durable.
+        """
+        if batch:
+            self.commits += 1
+        self.durable = durable
+        waiting = []
+        for target, waiter in self.waiters:
+            if target > durable:
+                waiting.append((target, waiter))
+            elif not waiter.done():
+                waiter.set_result(None)
+        self.waiters = waiting
+
+    async def commit(self):
+        """
+        Write and fsync the pending records in a worker thread, then release everyone waiting in sync.
+        """
+        async with self.lock:
+            batch, durable = self.take_batch()
+            if batch:
+                await asyncio.get_running_loop().run_in_executor(None, self.write, batch)
+            self.committed(batch, durable)
+
+    def commit_now(self):
+        """
+        Write and fsync the pending records on the calling thread, e.g. when shutting down.
+        """
+        batch, durable = self.take_batch()
+        if batch:
+            self.write(batch)
+        self.committed(batch, durable)
+
+    async def sync(self):
+        """
+        Wait until every record appended so far is durable.
+        """
+        target = self.appended
+        if self.durable >= target:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append((target, waiter))
+        if self.wake:
+            self.wake.set()
+        else:
+            await self.commit()
+        await waiter
+
+    async def run(self):
+        """
+        Commit batches in the background until stop is called. Records appended within commit_interval of each other share a commit.
+        """
+        self.wake = asyncio.Event()
+        self.running = True
+        try:
+            while self.running:
+                await self.wake.wait()
+                await asyncio.sleep(self.commit_interval)
+                self.wake.clear()
+                await self.commit()
+        finally:
+            self.wake = None
+
+    def stop(self):
+        """
+        Let run finish after committing what is pending. Used instead of cancelling it, so a batch is never
+        left half written by a worker thread.
+        """
+        self.running = False
+        if self.wake:
+            self.wake.set()
+
+    def close(self):
+        """
+        Commit any pending records and close the file.
+        """
+        self.commit_now()
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def read_journal(path : str):
+    """
+    Read every complete record of a journal. Reading stops at the first torn or damaged record,
+    which is what a crash in the middle of a commit leaves behind.
+
+    Returns:
+        list: (session ID, sequence, operation, payload) tuples in the order they were written.
+    """
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return []
+
+    records = []
+    offset = 0
+    while offset + RECORD_HEADER.size <= len(data):
+        length, checksum = RECORD_HEADER.unpack_from(data, offset)
+        body = data[offset + RECORD_HEADER.size:offset + RECORD_HEADER.size + length]
+        if len(body) < length or zlib.crc32(body) != checksum:
+            break
+        sequence, operation = RECORD_START.unpack_from(body)
+        session_id, payload_start = unpack_string(body, RECORD_START.size)
+        records.append((session_id, sequence, operation, body[payload_start:]))
+        offset += RECORD_HEADER.size + length
+    return records
+
+def apply_record(operation : int, payload : bytes, player : object, locations : dict):
+    """
+    Apply one journal record to a player and world, without recording it again.
+    """
+    areas, quest_hall, _ = world_state(locations)
+    if operation == GOLD_CHANGED:
+        player.gold += AMOUNT.unpack_from(payload)[0]
+    elif operation in (ITEM_ADDED, ITEM_REMOVED):
+        item_key, offset = unpack_string(payload, 0)
+        quantity, = QUANTITY.unpack_from(payload, offset)
+        if operation == ITEM_ADDED:
+            player.inventory.add(all_items[item_key], quantity)
+        else:
+            player.inventory.remove(all_items[item_key].item_id, quantity)
+    elif operation == QUEST_STEP:
+        quest_id, offset = unpack_string(payload, 0)
+        player.quests.set_step(all_quests(quest_hall)[quest_id], STEP.unpack_from(payload, offset)[0])
+    elif operation == QUEST_COMPLETED:
+        quest_id, _ = unpack_string(payload, 0)
+        quest = all_quests(quest_hall)[quest_id]
+        if isinstance(quest, StoryQuest):
+            quest_hall.complete_quest(quest_id)
+        player.quests.remove(quest)
+    elif operation == AREA_UNLOCKED:
+        area_key, _ = unpack_string(payload, 0)
+        areas[area_key].locked = False
+
+
+def unjournaled_state(player : object, locations : dict):
+    """
+    Returns the parts of a session's state that the journal doesn't record (stats, equipment, effects, quest progress,
+    bosses, the quests in the hall and the NPCs talked to). Only snapshots keep them, so a snapshot is needed whenever this changes.
+    """
+    areas, quest_hall, village = world_state(locations)
+    return (
+        player.level, player.xp, player.max_health, player.health, player.base_attack, player.attack,
+        player.base_defence, player.defence,
+        player.weapon.key if player.weapon else None, player.armour.key if player.armour else None,
+        tuple((effect_type, effect["value"], effect["duration"]) for effect_type, effect in player.active_effects.items()),
+        tuple((quest.quest_id, player.quests.progress.get(quest.quest_id, 0)) for quest in player.quests),
+        len(player.completed_quests),
+        tuple(area.boss_active for area in areas.values()),
+        tuple(quest_hall.combat_quests), tuple(quest_hall.story_quests),
+        tuple((key, npc.interacted) for key, npc in village.npc_dict.items()) if village else (),
+    )
+
+
+class SessionJournal:
+    """
+    Records the state changes of one session in the shared journal. Each player action is a unit: the checkpoint
+    after it commits its records, and recovery drops the records of an action that was cut short. The journal only records
+    gold, items, quest steps and completions and area unlocks, so the checkpoint writes a full snapshot whenever anything
+    else has changed, or once snapshot_every changes have been made. Set as player.journal.
+
+    Parameters:
+        journal (Journal): The shared journal.
+        session_id (str): The session's ID.
+        player (Player): The session's player.
+        locations (dict): The session's locations.
+        snapshot_dir (str): The folder snapshots are written to.
+        snapshot_every (int): The number of changes between snapshots. Defaults to 100.
+        sequence (int): The sequence number of the last change already recorded. Defaults to 0.
+    """
+    def __init__(self, journal : Journal, session_id : str, player : object, locations : dict, snapshot_dir : str,
+                 snapshot_every : int = 100, sequence : int = 0):
+        self.journal = journal
+        self.session_id = session_id
+        self.player = player
+        self.locations = locations
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_every = snapshot_every
+        self.sequence = sequence
+        self.committed = sequence
+        self.changes = 0
+        self.state = unjournaled_state(player, locations)
+
+    def record(self, operation : int, payload : bytes):
+        """
+        Append a change to the journal.
+        """
+        self.sequence += 1
+        self.journal.append(self.session_id, self.sequence, operation, payload)
+        self.changes += 1
+
+    def mark(self, operation : int):
+        """
+        Append an ACTION_COMMITTED or ACTION_ABORTED marker for the records since the last one.
+        """
+        self.sequence += 1
+        self.journal.append(self.session_id, self.sequence, operation, b"")
+        self.committed = self.sequence
+
+    async def checkpoint(self):
+        """
+        Commit the changes of the last player action. Takes a snapshot instead if the action changed state the
+        journal doesn't record, or if enough changes have been made since the last one. Should be called between
+        player actions, when the state isn't halfway through a change.
+        """
+        if self.changes >= self.snapshot_every or unjournaled_state(self.player, self.locations) != self.state:
+            await self.snapshot()
+        elif self.sequence > self.committed:
+            self.mark(ACTION_COMMITTED)
+
+    def gold_changed(self, amount : int):
+        """
+        Record a change to the player's gold.
+        """
+        self.record(GOLD_CHANGED, AMOUNT.pack(amount))
+
+    def item_added(self, item_key : str, quantity : int = 1):
+        """
+        Record items added to the inventory.
+        """
+        self.record(ITEM_ADDED, pack_string(item_key) + QUANTITY.pack(quantity))
+
+    def item_removed(self, item_key : str, quantity : int = 1):
+        """
+        Record items removed from the inventory.
+        """
+        self.record(ITEM_REMOVED, pack_string(item_key) + QUANTITY.pack(quantity))
+
+    def quest_step(self, quest_id : str, step : int):
+        """
+        Record a story quest moving on to a step.
+        """
+        self.record(QUEST_STEP, pack_string(quest_id) + STEP.pack(step))
+
+    def quest_completed(self, quest_id : str):
+        """
+        Record a quest being completed.
+        """
+        self.record(QUEST_COMPLETED, pack_string(quest_id))
+
+    def area_unlocked(self, area_key : str):
+        """
+        Record an area being unlocked.
+        """
+        self.record(AREA_UNLOCKED, pack_string(area_key))
+
+    async def snapshot(self):
+        """
+        Write a full snapshot of the session, tagged with the sequence number of the last change it includes.
+        The state is captured straight away and written by a worker thread.
+        """
+        data = snapshot(self.player, self.locations)
+        self.state = unjournaled_state(self.player, self.locations)
+        self.changes = 0
+        self.committed = self.sequence
+        path = snapshot_path(self.snapshot_dir, self.session_id)
+        await asyncio.get_running_loop().run_in_executor(None, write_snapshot, path, self.sequence, data)
+
+
+def snapshot_path(snapshot_dir : str, session_id : str):
+    """
+    Returns the path of a session's snapshot file.
+    """
+    return os.path.join(snapshot_dir, f"{session_id}.sav")
+
+def write_snapshot(path : str, sequence : int, data : bytes):
+    """
+    Write a snapshot file in one step, so a crash never leaves half a snapshot. The data is fsynced before
+    it replaces the old snapshot, and the folder is fsynced afterwards so the replacement itself is durable.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok = True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(SNAPSHOT_HEADER.pack(sequence) + data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    sync_directory(directory)
+
+def sync_directory(directory : str):
+    """
+    fsync a folder so renames in it are durable. Does nothing where folders can't be opened (Windows).
+    """
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+def recover(session_id : str, player : object, locations : dict, journal_path : str, snapshot_dir : str, records : list = None):
+    """
+    Rebuild a session's state from its latest snapshot and the committed journal records written after it.
+    The records of an action that was cut short are dropped, along with the rest of that action.
+
+    Parameters:
+        session_id (str): The session's ID.
+        player (Player): A newly created player to restore into.
+        locations (dict): Newly created locations to restore into.
+        journal_path (str): The journal file.
+        snapshot_dir (str): The folder with the snapshots.
+        records (list, optional): Records already read with read_journal, to avoid reading the journal once per session.
+
+    Returns:
+        tuple: The last sequence number the session used, to continue its journal from, and whether its last action was cut short.
+
+    Raises:
+        SaveError: If the snapshot is damaged. The journal can't rebuild the session without it, since it doesn't record
+            everything (e.g. stats and equipment).
+    """
+    snapshot_sequence = 0
+    try:
+        with open(snapshot_path(snapshot_dir, session_id), "rb") as file:
+            data = file.read()
+        snapshot_sequence, = SNAPSHOT_HEADER.unpack_from(data)
+        restore(data[SNAPSHOT_HEADER.size:], player, locations)
+    except FileNotFoundError:
+        pass
+    except struct.error as error:
+        raise SaveError("Snapshot is damaged.") from error
+
+    sequence = snapshot_sequence
+    action = [] # Records of the action in progress, applied once it is committed
+    for record_session, record_sequence, operation, payload in (records if records is not None else read_journal(journal_path)):
+        if record_session != session_id or record_sequence <= snapshot_sequence:
+            continue
+        sequence = max(sequence, record_sequence)
+        if operation == ACTION_COMMITTED:
+            for action_operation, action_payload in action:
+                apply_record(action_operation, action_payload, player, locations)
+            action.clear()
+        elif operation == ACTION_ABORTED:
+            action.clear()
+        else:
+            action.append((operation, payload))
+    return sequence, bool(action)
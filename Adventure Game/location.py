@@ -1,8 +1,10 @@
 from choice import Choice, clear_screen, continue_clear_screen, pause_clear_screen
 from explore import ExplorationEvent
 from quest import CombatQuest, StoryQuest
+from quest_registry import QuestRegistry
 from npc import NPC
 from formatter import Formatter
+from game_io import get_io
 
 class Location:
     """
@@ -31,21 +33,22 @@ class Location:
             "columns": 3
         }
 
-    def get_action(self):
+    async def get_action(self):
         """
         Display choices and get action from player's input.
         """
+        io = get_io()
         while True:
-            print(self.description)
+            io.write(self.description)
             for index, choice in enumerate(self.choices, 1):
-                print(f"{Formatter.blue_bold(index)}. {choice.description}")
+                io.write(f"{Formatter.blue_bold(index)}. {choice.description}")
             try:
                 # Get the player's choice and return the selected action
-                selected = int(input(Formatter.blue("Enter the number of your choice: "))) - 1
+                selected = int(await io.read_line(Formatter.blue("Enter the number of your choice: "))) - 1
                 return self.choices[selected]      
-            except:
-                print(Formatter.yellow_bold("Invalid choice. Please try again."))
-                pause_clear_screen(2)
+            except (ValueError, IndexError):
+                io.write(Formatter.yellow_bold("Invalid choice. Please try again."))
+                await pause_clear_screen(2)
 
 class Home(Location):
     """
@@ -57,9 +60,13 @@ class Home(Location):
         self.choices = [
             Choice("Visit the village", lambda: "village", clear_method=clear_screen),
             Choice("Explore an area", lambda: "exploration", clear_method=clear_screen),
-            Choice("Check Status", lambda: self.ui_manager.open_ui(self.status_ui, self.player)),
-            Choice("Manage inventory", lambda: self.ui_manager.open_ui(self.inventory_ui, self.player)),
         ]
+        # The status and inventory popups need the graphical UI
+        if self.ui_manager:
+            self.choices += [
+                Choice("Check Status", lambda: self.ui_manager.open_ui(self.status_ui, self.player)),
+                Choice("Manage inventory", lambda: self.ui_manager.open_ui(self.inventory_ui, self.player)),
+            ]
 
         self.ui_config.update({
             "button_width": 450,
@@ -81,10 +88,12 @@ class Village(Location):
         self.ui_manager = ui_manager
         self.npc_dict = {}
         self.choices = [
-            Choice("Visit the Adventurer's Shop", lambda: self.ui_manager.open_ui(self.shop_ui, self.player)),
             Choice("Go to the Quest Hall", lambda: "quest_hall", clear_method=clear_screen),
             Choice("Return home", lambda: "home", clear_method=clear_screen)
         ]
+        # The shop popup needs the graphical UI
+        if self.ui_manager:
+            self.choices.insert(0, Choice("Visit the Adventurer's Shop", lambda: self.ui_manager.open_ui(self.shop_ui, self.player)))
 
         self.ui_config.update({
             "button_width": 475,
@@ -94,12 +103,11 @@ class Village(Location):
 
     def update_npcs(self):
         """
-        Update NPCs based on the player's active quest.
+        Update NPCs based on the player's active story quests.
         """
         self.npc_dict = {} # Reset the NPC dictionary
 
-        if self.player.active_quest and isinstance(self.player.active_quest, StoryQuest):
-            quest = self.player.active_quest
+        for quest in self.player.quests.story_quests():
             for step in quest.steps:
                 if step["type"] == "interaction":
                     npc_name = step["trigger"].get("npc")
@@ -111,7 +119,8 @@ class Village(Location):
                                 for step in quest.steps
                                 if step["type"] == "interaction" and step["trigger"].get("npc") == npc_name
                             ],
-                            quest_trigger = npc_name
+                            quest_trigger = npc_name,
+                            quest = quest
                         )
         self.update_choices()
     
@@ -133,14 +142,22 @@ class QuestHall(Location):
     
     Parameters:
         player (Player): The player interacting with the Quest Hall.
-        combat_quests (dict): Available combat quests.
-        story_quests (dict): Available story quests.
+        combat_quests (dict): Every combat quest, keyed by quest ID.
+        story_quests (dict): Every story quest, keyed by quest ID.
         location (dict): Dictionary of locations in the game.
+
+    **Starting Attributes**:
+        **registry** (QuestRegistry):
+            Every quest, including the ones that are locked or completed, and the story quest unlock graph.
+        **combat_quests** (dict), **story_quests** (dict):
+            The quests the player can accept, keyed by quest ID. Story quests are added when they are unlocked
+            and removed when they are completed.
     """
     def __init__(self, player : object, combat_quests : dict, story_quests : dict, location : dict):
         super().__init__(player, "Quest Hall", Formatter.white_bold("Welcome to the Quest Hall!"))
-        self.combat_quests = combat_quests
-        self.story_quests = story_quests
+        self.registry = QuestRegistry(combat_quests, story_quests)
+        self.combat_quests = dict(self.registry.combat_quests)
+        self.story_quests = {}
         self.location = location # Dictionary of all game locations
 
         self.ui_config.update({
@@ -152,61 +169,84 @@ class QuestHall(Location):
         })
 
         # Link locations to story quests for NPC updates
-        for quest in self.story_quests.values():
-            if isinstance(quest, StoryQuest):
-                quest.locations = self.location
-        
-        # Unlock the first story quest
-        if self.story_quests:
-            first_story_quest = next(iter(self.story_quests.values()))
-            first_story_quest.locked = False
+        for quest in self.registry.story_quests.values():
+            quest.locations = self.location
+
+        # Unlock the story quests no other quest unlocks
+        for quest_id in self.registry.roots:
+            self.unlock_quest(quest_id)
+
+    def unlock_quest(self, quest_id : str):
+        """
+        Make a story quest available in the Quest Hall.
+
+        Returns:
+            quest (StoryQuest): The unlocked quest.
+        """
+        quest = self.registry[quest_id]
+        quest.locked = False
+        self.story_quests[quest_id] = quest
+        return quest
+
+    def complete_quest(self, quest_id : str):
+        """
+        Remove a completed story quest from the Quest Hall and unlock the quest that follows it, if any.
+
+        Returns:
+            quest (StoryQuest or None): The newly unlocked quest.
+        """
+        self.story_quests.pop(quest_id, None)
+        next_quest_id = self.registry.unlocks.get(quest_id)
+        if next_quest_id and self.registry[next_quest_id].locked:
+            return self.unlock_quest(next_quest_id)
+        return None
 
     def display_quests(self):
         """
-        Display categorized quests and the player's current quest.
+        Display categorized quests and the player's current quests.
 
         Returns:
             quest_mapping (dict): Mapping of quest numbers to quest IDs.
         """
-        print(self.description)
-        # Display player's current quest
-        if self.player.active_quest and isinstance(self.player.active_quest, CombatQuest):
-            current_quest = self.player.active_quest
-            print(f"\n{Formatter.cyan_bold('Current Quest:')} {current_quest.desc}")
-            print(f"{Formatter.cyan_bold('Progress:')} {Formatter.green_bold(self.player.quest_progress)}/{current_quest.target_count}")
-        elif self.player.active_quest and isinstance(self.player.active_quest, StoryQuest):
-            current_quest = self.player.active_quest
-            print(f"\n{Formatter.cyan_bold('Current Quest:')} {current_quest.desc}")
-            current_quest.display_current_step()
-        else: 
-            print(Formatter.white_bold("\nYou have no active quest at the moment."))
+        io = get_io()
+        io.write(self.description)
+        # Display player's current quests
+        for current_quest in self.player.quests:
+            io.write(f"\n{Formatter.cyan_bold('Current Quest:')} {current_quest.desc}")
+            if isinstance(current_quest, CombatQuest):
+                io.write(f"{Formatter.cyan_bold('Progress:')} {Formatter.green_bold(self.player.quests.progress[current_quest.quest_id])}/{current_quest.target_count}")
+            else:
+                current_quest.display_current_step()
+        if not self.player.quests:
+            io.write(Formatter.white_bold("\nYou have no active quest at the moment."))
 
         # Display categorized available quests
-        print(f"\n{Formatter.cyan_bold('Available Quests:')}")
+        io.write(f"\n{Formatter.cyan_bold('Available Quests:')}")
         quest_index = 1
         quest_mapping = {}
 
         for category_name, quest_dict in [("Combat", self.combat_quests), ("Story", self.story_quests)]:
-            print(f"\n{Formatter.yellow_bold(category_name + ' Quests')}:")
+            io.write(f"\n{Formatter.yellow_bold(category_name + ' Quests')}:")
             if quest_dict:
                 for quest_id, quest in quest_dict.items():
-                    if isinstance(quest, StoryQuest) and quest.locked:
-                        continue  # Skip locked story quests
-                    print(f"{Formatter.blue(quest_index)}. {quest.desc} - {Formatter.green_bold('Rewards')}: {quest.display_rewards()}")
+                    if quest_id in self.player.quests:
+                        continue  # Skip quests the player has already accepted
+                    io.write(f"{Formatter.blue(quest_index)}. {quest.desc} - {Formatter.green_bold('Rewards')}: {quest.display_rewards()}")
                     quest_mapping[quest_index] = quest_id
                     quest_index += 1
             else:
-                print(Formatter.yellow_bold("No quests available in this category."))
+                io.write(Formatter.yellow_bold("No quests available in this category."))
 
         return quest_mapping
 
-    def get_action(self):
+    async def get_action(self):
         """
         Displays quests and allows player to accept a quest.
         """
+        io = get_io()
         while True:
             quest_mapping = self.display_quests()
-            choice = input(f"\nEnter the number of the {Formatter.cyan_bold('quest')} you want to accept, or '{Formatter.red_bold('back')}' to return: ").lower()
+            choice = (await io.read_line(f"\nEnter the number of the {Formatter.cyan_bold('quest')} you want to accept, or '{Formatter.red_bold('back')}' to return: ")).lower()
             
             if choice == "back":
                 clear_screen()
@@ -220,9 +260,8 @@ class QuestHall(Location):
                 quest_id = quest_mapping[quest_choice]
                 selected_quest = self.combat_quests.get(quest_id) or self.story_quests.get(quest_id)
                 
-                self.player.active_quest = selected_quest
-                self.player.quest_progress = 0
-                print(f"\n{Formatter.white_cyan_stat('You have accepted the quest', selected_quest.desc)}")
+                self.player.quests.accept(selected_quest)
+                io.write(f"\n{Formatter.white_cyan_stat('You have accepted the quest', selected_quest.desc)}")
 
                 # Update NPCs if the selected quest is a StoryQuest
                 if isinstance(selected_quest, StoryQuest) and selected_quest.linked_location:
@@ -231,11 +270,11 @@ class QuestHall(Location):
                         linked_location.update_npcs() 
 
 
-                continue_clear_screen()
+                await continue_clear_screen()
 
             except (ValueError, IndexError):
-                print(Formatter.yellow_bold("Invalid choice. Please select a valid quest number or type 'back'."))
-                pause_clear_screen(2)
+                io.write(Formatter.yellow_bold("Invalid choice. Please select a valid quest number or type 'back'."))
+                await pause_clear_screen(2)
                 continue
 
             return Choice("Return to Village", lambda: "village")
@@ -275,24 +314,26 @@ class Exploration(Location):
         """
         Display the available areas for exploration.
         """
-        print(f"\n{Formatter.cyan_bold('Available Areas:')}")
+        io = get_io()
+        io.write(f"\n{Formatter.cyan_bold('Available Areas:')}")
         for idx, area in enumerate(self.areas.values(), start=1):
             if not area.locked:
-                print(f"{Formatter.blue(idx)}. {Formatter.cyan_bold(area.name)} (Difficulty: {area.difficulty})")
+                io.write(f"{Formatter.blue(idx)}. {Formatter.cyan_bold(area.name)} (Difficulty: {area.difficulty})")
             else:
-                print(f"{Formatter.blue(idx)}. {Formatter.red_bold(area.name)} (Locked)") 
+                io.write(f"{Formatter.blue(idx)}. {Formatter.red_bold(area.name)} (Locked)") 
         
-    def get_action(self):
+    async def get_action(self):
         """
         Override get_action to handle area selection for exploration.
         """
+        io = get_io()
         while True:
             self.display_areas()
 
-            print(f"{Formatter.blue_bold(len(self.areas) + 1)}. {self.return_choice.description}")
+            io.write(f"{Formatter.blue_bold(len(self.areas) + 1)}. {self.return_choice.description}")
 
             try:
-                choice = int(input(Formatter.blue("Enter the number of your choice: "))) - 1
+                choice = int(await io.read_line(Formatter.blue("Enter the number of your choice: "))) - 1
 
                 # Handle return home
                 if choice == len(self.areas):
@@ -301,8 +342,8 @@ class Exploration(Location):
 
                 selected_area = list(self.areas.values())[choice]
                 if selected_area.locked:
-                    print(Formatter.red_bold("This area is locked. Complete quests to unlock it!"))
-                    pause_clear_screen(2)
+                    io.write(Formatter.red_bold("This area is locked. Complete quests to unlock it!"))
+                    await pause_clear_screen(2)
                     continue
 
                 # Return the exploration choice for the selected area
@@ -312,5 +353,5 @@ class Exploration(Location):
                     clear_method=clear_screen,
                 )
             except (ValueError, IndexError):
-                print(Formatter.yellow_bold("Invalid choice. Please try again."))
-                pause_clear_screen(2)
\ No newline at end of file
+                io.write(Formatter.yellow_bold("Invalid choice. Please try again."))
+                await pause_clear_screen(2)
\ No newline at end of file
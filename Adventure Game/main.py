@@ -1,51 +1,95 @@
-from player import Player
-from game_data import areas, shops, combat_quests, story_quests
-from location import Home, Village, QuestHall, Exploration
-from game_display import GameDisplay
-from ui.ui_manager import UIManager
-from items import all_items
+import sys
+from startup_profiler import StartupProfiler
+
+# Run with --profile-startup to print how long each import and initialization step takes
+profiler = StartupProfiler()
+if "--profile-startup" in sys.argv:
+    profiler.start()
+
+if "--no-color" in sys.argv:
+    from formatter import Formatter
+    Formatter.set_color(False)
+
+if "--instant-text" in sys.argv:
+    from typewriter import set_time_scale
+    set_time_scale(0)
+
+# Run with --seed <number> to make creatures, treasure and loot the same every run
+if "--seed" in sys.argv:
+    from rng import GameRNG, set_rng
+    set_rng(GameRNG(int(sys.argv[sys.argv.index("--seed") + 1])))
+
+# Run with --event-log <file> to save the combat and exploration events when the game exits, as .npy or .csv
+if "--event-log" in sys.argv:
+    import atexit
+    from event_log import EventLog, set_event_log
+    event_log = EventLog()
+    set_event_log(event_log)
+    atexit.register(event_log.save, sys.argv[sys.argv.index("--event-log") + 1])
+
+with profiler.section("Import game modules"):
+    from player import Player
+    from game_data import areas, shops, combat_quests, story_quests
+    from location import Home, Village, QuestHall, Exploration
+    from items import all_items
+
+with profiler.section("Import display modules"):
+    from game_display import GameDisplay
+    from ui.ui_manager import UIManager
 
 class Game:
     """
     Main game class that initializes the player, locations, and launches the game UI.
+
+    Parameters:
+        run_loop (bool): Whether to start the game loop once everything is set up. Defaults to True.
     """
-    def __init__(self):
+    def __init__(self, run_loop : bool = True):
         """
         Initializes the game immediately with a default player name.
         """
         # Initialize the game display and UI manager
-        self.game_display = GameDisplay()
-        self.ui_manager = UIManager(self.game_display.screen)
+        with profiler.section("Create game display"):
+            self.game_display = GameDisplay()
+            self.ui_manager = UIManager(self.game_display.screen)
 
         # Create the player
-        self.player = Player("Adventurer")
-        self.player.adjust_gold(100)
-        self.player.add_to_inventory(all_items["basic_sword"])
-        self.player.add_to_inventory(all_items["basic_sword"])
-        self.player.add_to_inventory(all_items["great_sword"])
-        self.player.add_to_inventory(all_items["leather_armour"])
-        self.player.add_to_inventory(all_items["leather_armour"])
-        self.player.add_to_inventory(all_items["plate_armour"])
-        self.player.add_to_inventory(all_items["small_healing_potion"])
-        self.player.add_to_inventory(all_items["small_strength_potion"])
-        self.player.add_to_inventory(all_items["small_strength_potion"])
-        self.player.add_to_inventory(all_items["large_healing_potion"])
-        self.player.add_to_inventory(all_items["large_strength_potion"])
-        self.player.add_to_inventory(all_items["wizard's_medallion"])
+        with profiler.section("Create player"):
+            self.player = Player("Adventurer")
+            self.player.adjust_gold(100)
+            self.player.add_to_inventory(all_items["basic_sword"])
+            self.player.add_to_inventory(all_items["basic_sword"])
+            self.player.add_to_inventory(all_items["great_sword"])
+            self.player.add_to_inventory(all_items["leather_armour"])
+            self.player.add_to_inventory(all_items["leather_armour"])
+            self.player.add_to_inventory(all_items["plate_armour"])
+            self.player.add_to_inventory(all_items["small_healing_potion"])
+            self.player.add_to_inventory(all_items["small_strength_potion"])
+            self.player.add_to_inventory(all_items["small_strength_potion"])
+            self.player.add_to_inventory(all_items["large_healing_potion"])
+            self.player.add_to_inventory(all_items["large_strength_potion"])
+            self.player.add_to_inventory(all_items["wizard's_medallion"])
         # Set up locations
-        self.locations = {
-            "home": Home(self.player, self.ui_manager),
-            "village": Village(self.player, shops["Adventurer's Shop"], self.ui_manager),
-            "exploration": Exploration(self.player, areas),
-        }
-        self.locations["quest_hall"] = QuestHall(self.player, combat_quests, story_quests, self.locations)
+        with profiler.section("Set up locations"):
+            self.locations = {
+                "home": Home(self.player, self.ui_manager),
+                "village": Village(self.player, shops["Adventurer's Shop"], self.ui_manager),
+                "exploration": Exploration(self.player, areas),
+            }
+            self.locations["quest_hall"] = QuestHall(self.player, combat_quests, story_quests, self.locations)
 
-        self.locations["village"].shop_ui = self.game_display.shop_ui
-        self.locations["village"].shop_ui.set_shop(shops["Adventurer's Shop"])
+            self.locations["village"].shop_ui = self.game_display.shop_ui
+            self.locations["village"].shop_ui.set_shop(shops["Adventurer's Shop"])
 
 
         # Initialize the game
-        self.game_display.initialize_game(self.player, self.locations, shops)
+        with profiler.section("Initialize game display"):
+            self.game_display.initialize_game(self.player, self.locations, shops, run_loop)
 
 if __name__ == "__main__":
-    Game()  # Start the game
\ No newline at end of file
+    if profiler.enabled:
+        Game(run_loop = False)
+        profiler.stop()
+        print(profiler.report())
+    else:
+        Game()  # Start the game
@@ -1,7 +1,7 @@
-from quest import StoryQuest
-from otherFunctions import print_slow
+from typewriter import typewriter
 from choice import continue_clear_screen
 from formatter import Formatter
+from game_io import get_io
 
 class NPC:
     """
@@ -11,16 +11,18 @@ class NPC:
         name (str): The name of the NPC.
         dialogue_steps (list): The dialogue or conversation text of the NPC.
         quest_trigger (str): Optional trigger for triggering a quest step.
+        quest (StoryQuest): Optional story quest the NPC's dialogue belongs to.
     """
-    def __init__(self, name : str, dialogue_steps : list, quest_trigger : str = None):
+    def __init__(self, name : str, dialogue_steps : list, quest_trigger : str = None, quest : object = None):
         self.name = name
         self.dialogue_steps = dialogue_steps
         self.quest_trigger = quest_trigger
+        self.quest = quest
         self.interacted = False # Flag to track if the NPC has been interacted with
 
     def get_current_dialogue(self, player : object):
         """
-        Decides the current dialogue the NPC should display based on the player's active quest progress.
+        Decides the current dialogue the NPC should display based on the progress of the NPC's quest.
 
         Parameters:
             player (Player): The player interacting with the NPC.
@@ -28,36 +30,35 @@ class NPC:
         Returns:
             (str): The dialogue text to display.
         """
-        if isinstance(player.active_quest, StoryQuest):
-            quest = player.active_quest
+        if self.quest and self.quest.quest_id in player.quests:
+            quest = self.quest
             if quest.current_step < len(self.dialogue_steps):
                 return self.dialogue_steps[quest.current_step]
             elif quest.current_step >= len(quest.steps):
                 return f"{self.name}: Thank you for your help, brave adventurer!"
         return f"{self.name}: I have nothing more to say right now."
     
-    def interact(self, player : object):
+    async def interact(self, player : object):
         """
         Interact with the NPC. Optionally trigger a quest step.
 
         Parameters:
             player (Player): The player interacting with the NPC.
         """
-        if self.quest_trigger and isinstance(player.active_quest, StoryQuest):
-            quest = player.active_quest
-            current_step = quest.steps[quest.current_step]
-
-            if current_step["type"] == "interaction" and current_step["trigger"].get("npc") == self.quest_trigger:
-                dialogue = current_step.get("dialogue", f"{self.name} has nothing more to say right now.")
-                print(Formatter.blue("\nPress Space to skip..."))
-                print(f"\n{Formatter.cyan_bold(self.name)}:", end=" ")
-                print_slow(dialogue)
-                
-                quest_progressed = quest.trigger_step("interaction", {"npc": self.quest_trigger}, player)
-                if quest_progressed:
-                    self.interacted = True
-                continue_clear_screen()
-                return
-
-        print(Formatter.yellow_bold(f"{self.name} has nothing more to say right now."))
-        continue_clear_screen()
\ No newline at end of file
+        io = get_io()
+        waiting_quests = player.quests.waiting_on("interaction", npc = self.quest_trigger) if self.quest_trigger else []
+        if waiting_quests:
+            current_step = waiting_quests[0].steps[waiting_quests[0].current_step]
+            dialogue = current_step.get("dialogue", f"{self.name} has nothing more to say right now.")
+            if typewriter.animated:
+                io.write(Formatter.blue("\nPress Space to skip..."))
+            io.write(f"\n{Formatter.cyan_bold(self.name)}:", end=" ")
+            await typewriter.write_async(dialogue)
+
+            if await player.quests.trigger("interaction", npc = self.quest_trigger):
+                self.interacted = True
+            await continue_clear_screen()
+            return
+
+        io.write(Formatter.yellow_bold(f"{self.name} has nothing more to say right now."))
+        await continue_clear_screen()
\ No newline at end of file
@@ -0,0 +1,162 @@
+import contextvars, string
+from formatter import Formatter
+from game_io import get_io
+from typewriter import typewriter
+
+class MessageFormatter(string.Formatter):
+    """
+    Fills in message templates. A field's format spec can name a Formatter style (e.g. "{gold:yellow_bold}"),
+    and a quoted field is shown as written (e.g. "{'Attack':blue_bold}"), so constant labels can be styled too.
+    """
+    def get_value(self, key, args, kwargs):
+        if isinstance(key, str) and len(key) > 1 and key[0] == key[-1] == "'":
+            return key[1:-1]
+        return super().get_value(key, args, kwargs)
+
+    def format_field(self, value, format_spec):
+        style = getattr(Formatter, format_spec, None) if format_spec else None
+        if style:
+            return style(value)
+        return super().format_field(value, format_spec)
+
+message_formatter = MessageFormatter()
+
+def render(template : str, style : str = None, data : dict = None):
+    """
+    Build the text of a message.
+
+    Parameters:
+        template (str): The message template.
+        style (str, optional): The Formatter style applied to the whole message (e.g. "yellow_bold").
+        data (dict, optional): The values of the template's fields.
+
+    Returns:
+        str: The formatted message.
+    """
+    text = message_formatter.vformat(template, (), data or {})
+    return getattr(Formatter, style)(text) if style else text
+
+
+class OutputSink:
+    """
+    Base class for where game messages go. Game logic emits messages as an event name, a template and
+    the values to fill in, so a sink that doesn't show text never has to format anything.
+    """
+    def emit(self, event : str, template : str, style : str, data : dict):
+        """
+        Handle a game message.
+
+        Parameters:
+            event (str): The kind of message (e.g. "gold_changed").
+            template (str): The message template.
+            style (str): The Formatter style applied to the whole message, or None.
+            data (dict): The values of the template's fields.
+        """
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    async def narrate(self, event : str, label : str, text : str):
+        """
+        Handle story text that is typed out slowly on the terminal. Awaited, so typing doesn't block other sessions.
+
+        Parameters:
+            event (str): The kind of message (e.g. "story_text").
+            label (str): The heading shown before the text (e.g. "Story:").
+            text (str): The story text.
+        """
+        raise NotImplementedError("Subclasses should implement this method.")
+
+
+class TerminalSink(OutputSink):
+    """
+    Formats messages and writes them to the session's GameIO. The console IO buffers the text and
+    writes it out in one go at the next prompt or pause.
+    """
+    def emit(self, event : str, template : str, style : str, data : dict):
+        get_io().write(render(template, style, data))
+
+    async def narrate(self, event : str, label : str, text : str):
+        io = get_io()
+        if typewriter.animated:
+            io.write(Formatter.blue("\nPress Space to skip..."))
+        io.write(f"\n{Formatter.cyan_bold(label)}", end = " ")
+        await typewriter.write_async(text)
+        io.write()
+
+
+class EventSink(OutputSink):
+    """
+    Records messages as structured events instead of text, e.g. for tests, bots or replays.
+
+    **Starting Attributes:**
+        **events** (list):
+            Every message emitted, in order, as a dictionary with its "type" and template values.
+    """
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event : str, template : str, style : str, data : dict):
+        self.events.append({"type": event, **data})
+
+    async def narrate(self, event : str, label : str, text : str):
+        self.events.append({"type": event, "text": text})
+
+    def clear(self):
+        """
+        Remove all recorded events.
+        """
+        self.events.clear()
+
+
+class NullSink(OutputSink):
+    """
+    Drops every message, for simulations and other headless runs where nobody reads the output.
+    """
+    def emit(self, event : str, template : str, style : str, data : dict):
+        pass
+
+    async def narrate(self, event : str, label : str, text : str):
+        pass
+
+
+terminal_sink = TerminalSink()
+null_sink = NullSink()
+current_sink = contextvars.ContextVar("current_sink", default = terminal_sink)
+
+def emit(event : str, template : str, style : str = None, **data):
+    """
+    Send a game message to the sink of the current context.
+
+    Parameters:
+        event (str): The kind of message (e.g. "gold_changed").
+        template (str): The message template (e.g. "{name:green_bold} now has {gold:yellow_bold} gold.").
+        style (str, optional): The Formatter style applied to the whole message.
+        **data: The values of the template's fields.
+    """
+    current_sink.get().emit(event, template, style, data)
+
+async def narrate(event : str, label : str, text : str):
+    """
+    Send story text to the sink of the current context.
+    """
+    await current_sink.get().narrate(event, label, text)
+
+def get_sink():
+    """
+    Returns the sink of the current context. Defaults to the terminal.
+    """
+    return current_sink.get()
+
+def set_sink(sink : OutputSink):
+    """
+    Use the given sink for the current context.
+
+    Returns:
+        contextvars.Token: Token to pass to reset_sink to restore the previous sink.
+    """
+    return current_sink.set(sink)
+
+def reset_sink(token):
+    """
+    Restore the sink that was in use before set_sink.
+    """
+    current_sink.reset(token)
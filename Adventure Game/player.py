@@ -1,8 +1,7 @@
 from items import Weapon, Armour, Potion, Misc
-from choice import continue_clear_screen, pause_clear_screen, clear_screen
-from formatter import Formatter
-import pygame as pg
-import sys
+from output import emit
+from quest_tracker import QuestTracker
+from inventory import Inventory, CATEGORIES
 
 class Player:
     """
@@ -39,8 +38,8 @@ class Player:
         **defence** (int): 
             The player's current defence. Resets to base_defence at the start of each battle.
         
-        **inventory** (list): 
-            A list of items the player owns. Starts as an empty list.
+        **inventory** (Inventory): 
+            The items the player owns, stacked by item key and indexed by category. Starts empty.
         
         **active_effects** (dict): 
             Active status effects (e.g., strength_boost) that modify player stats.
@@ -51,12 +50,12 @@ class Player:
         **armour** (Armour or None): 
             The player's equipped armour, which affects defence; starts as None.
         
-        **active_quest** (Quest or None):
-            The current quest the player has accepted or None if no quest is accepted.
-        
-        **quest_progress** (int): The progress of the player's active quest. Starts at 0.
+        **quests** (QuestTracker):
+            The quests the player has accepted and their progress. Starts with no quests.
 
         **completed_quests** (list): A list of completed quests.
+
+        **journal** (SessionJournal or None): Records the player's state changes for recovery. Starts as None.
     """
     def __init__(self, name : str):
         self.name = name
@@ -69,13 +68,13 @@ class Player:
         self.attack = 5 
         self.base_defence = 0
         self.defence = 0
-        self.inventory = {}
+        self.inventory = Inventory()
         self.active_effects = {}
         self.weapon = None
         self.armour = None
-        self.active_quest = None
-        self.quest_progress = 0
+        self.quests = QuestTracker(self)
         self.completed_quests = []
+        self.journal = None
     
     # def display_status(self):
     #     """
@@ -94,51 +93,37 @@ class Player:
 
     # Methods used for combat
 
-    def take_damage(self, damage : int):
+    def absorb_damage(self, damage : int):
         """
-        Reduce health when player takes damage.
-        
+        Reduce health by the damage left after defence, without any output.
+        Defence absorbs damage first and is used up by the amount it absorbs.
+
         Parameters:
-            damage (int): The amount of damage player takes. Damage taken is reduced by defence.
+            damage (int): The amount of damage player takes.
+
+        Returns:
+            tuple: The damage taken and the damage absorbed by defence.
         """
         effective_defense = min(self.defence, damage)
         damage_taken = damage - effective_defense
 
         self.defence -= effective_defense
         self.health -= damage_taken
+        return damage_taken, effective_defense
 
-        if self.health <= 0:
-            print(Formatter.red_bold("You have died."))
-            exit()
-        else:
-            # print(f"{Formatter.green_bold(self.name)} has {Formatter.green_bold(self.health)} health remaining.")
-    
-            if self.defence > 0 or (self.defence == 0 and effective_defense > 0):
-                print(f"{Formatter.green_bold(self.name)}'s remaining defense: {Formatter.blue_bold(self.defence)}")
-
-    def start_battle(self):
-        """
-        Reset defence to base_defence at the start of a battle.
-        """
-        self.defence = self.base_defence
-        print(f"{Formatter.green_bold(self.name)} starts with {Formatter.blue_bold(self.defence)} defence.")
-    
-    def attack_creature(self, creature: object):
+    def tick_effects(self):
         """
-        Player attacks the creature
+        Count down the duration of the strength boost after an attack.
 
-        Parameters:
-            creature (Creature): The target creature being attacked.
+        Returns:
+            bool: True if the strength boost wore off, False otherwise.
         """
-        self.apply_attack_effects()
-        print(f"{Formatter.green_bold(self.name)} attacks {Formatter.red_bold(creature.name)} for {Formatter.blue_bold(self.attack)} damage!")
-        creature.take_damage(self.attack)
-
         if "strength_boost" in self.active_effects:
             self.active_effects["strength_boost"]["duration"] -= 1
             if self.active_effects["strength_boost"]["duration"] <= 0:
                 del self.active_effects["strength_boost"]
-                print(Formatter.yellow_bold(f"{self.name}'s strength boost has worn off."))
+                return True
+        return False
     
     def apply_attack_effects(self):
         """
@@ -162,23 +147,21 @@ class Player:
             duration (int): The number of turns the effect lasts.
         """
         self.active_effects[effect_type] = {"value": effect_value, "duration": duration}
-        print(f"{Formatter.green_bold(self.name)} gained a temporary {Formatter.cyan_bold(name)} effect.")
+        emit("effect_gained", "{name:green_bold} gained a temporary {effect:cyan_bold} effect.", name = self.name, effect = name)
 
     # Methods used for inventory management
 
-    def get_inventory_item(self, item_key : str):
+    def get_inventory_item(self, item_id : int):
         """
-        Retrieve an item from the inventory based on its key.
+        Retrieve an item from the inventory based on its ID.
 
         Parameters:
-            item_key (str): The key name of the item.
+            item_id (int): The ID of the item.
 
         Returns:
             dict or None: A dictionary containing the item and its quantity, or None if not found.
         """
-        if item_key in self.inventory:
-            return self.inventory[item_key]
-        return None
+        return self.inventory.get(item_id)
 
     def add_to_inventory(self, item : object):
         """
@@ -187,90 +170,78 @@ class Player:
         Parameters:
             item (Item): The item to add.
         """
-        item_key = item.name.lower().replace(" ","_")
-        if item_key in self.inventory:
-            self.inventory[item_key]['quantity'] += 1
-        else:
-            self.inventory[item_key] = {"item": item, "quantity": 1}
+        self.store_item(item)
         if not isinstance(item, Misc):
-            print(f"{Formatter.cyan_bold(item.name)} has been added to your inventory.") 
+            emit("item_added", "{item:cyan_bold} has been added to your inventory.", item = item.name)
     
-    def remove_from_inventory(self, item_key : str, quantity : int = 1):
+    def store_item(self, item : object):
         """
-        Remove an item from the inventory by its key.
+        Stack an item into the inventory without any output.
 
         Parameters:
-            item_key (str): The key name of the item to remove.
+            item (Item): The item to add.
+
+        Returns:
+            int: The ID of the item.
+        """
+        self.inventory.add(item)
+        if self.journal:
+            self.journal.item_added(item.key)
+        return item.item_id
+
+    def remove_from_inventory(self, item_id : int, quantity : int = 1):
+        """
+        Remove an item from the inventory by its ID.
+
+        Parameters:
+            item_id (int): The ID of the item to remove.
             quantity (int): The number of items to remove. Defaults to 1.
         """
-        if item_key in self.inventory:
-            item_data = self.inventory[item_key]
-            if item_data["quantity"] > quantity:
-                item_data["quantity"] -= quantity
-            else:
-                del self.inventory[item_key]
-        else:
-            print(Formatter.yellow_bold(f"Item '{item_key}' is not in your inventory."))
+        item_data = self.inventory.get(item_id)
+        if item_data is None:
+            emit("item_missing", "Item '{item_id}' is not in your inventory.", "yellow_bold", item_id = item_id)
+            return
+        self.inventory.remove(item_id, quantity)
+        if self.journal:
+            self.journal.item_removed(item_data["item"].key, quantity)
     
     def categorise_inventory(self):
         """
         Organize the player's inventory by item categories.
-        """
-        categories = {
-            "Weapons": [],
-            "Armours": [],
-            "Potions": [],
-            "Misc": []
-        }
 
-        for details in self.inventory.values():
-            item = details["item"]
-            if isinstance(item, Weapon):
-                categories["Weapons"].append((item, details["quantity"]))
-            elif isinstance(item, Armour):
-                categories["Armours"].append((item, details["quantity"]))
-            elif isinstance(item, Potion):
-                categories["Potions"].append((item, details["quantity"]))
-            else:
-                categories["Misc"].append((item, details["quantity"]))
-        
-        return categories
+        Returns:
+            categories (dict): The (item, quantity) pairs of each category.
+        """
+        return {category: self.inventory.category_items(category) for category in CATEGORIES}
     
     def get_inventory_mapping(self):
         """
-        Returns inventory data by category and a flat item number -> key map.
+        Returns inventory data by category and a flat item number -> ID map.
 
         Returns:
             tuple: A tuple containing:
                 - categories (dict): A dictionary of item categories and their items.
-                - item_mapping (dict): A mapping of item numbers to item keys.
+                - item_mapping (dict): A mapping of item numbers to item IDs.
         """
-        categories =  self.categorize_inventory()
-        item_mapping = {}
-        item_number = 1
-
-        for category, items in categories.items():
-            for item, quantity in items:
-                item_key = item.name.lower().replace(" ", "_")
-                item_mapping[item_number] = item_key
-                item_number += 1
-        
+        categories = self.categorise_inventory()
+        item_ids = [item_id for category in CATEGORIES for item_id in self.inventory.category_ids(category)]
+        item_mapping = dict(enumerate(item_ids, 1))
         return categories, item_mapping
     
-    def use_item(self, item_key : str) -> str:
+    def use_item(self, item_id : int) -> str:
         """
         Use or equip an item from the inventory.
 
         Parameters:
-            item_key (str): The key name of the item to use.
+            item_id (int): The ID of the item to use.
 
         Returns:
             str: Action feedback for UI display.
         """
-        if item_key not in self.inventory:
-            return f"Item '{item_key}' is not in your inventory."
+        if item_id not in self.inventory:
+            return f"Item '{item_id}' is not in your inventory."
         
-        item_data = self.inventory[item_key]
+        item_data = self.inventory[item_id]
         item = item_data["item"]
 
         if isinstance(item, Weapon):
@@ -285,32 +256,30 @@ class Player:
             if item.effect_type == "strength_boost" and "strength_boost" in self.active_effects:
                 return "You already have an active strength boost. Wait until it wears off to use another."
             item.use(self)
-            item_data["quantity"] -= 1
-            if item_data["quantity"] <= 0:
-                del self.inventory[item_key]
+            self.remove_from_inventory(item_id)
             return f"Used {item.name}."
         
         else:
             return f"{item.name} cannot be used."
     
-    def unequip_item(self, item_key : str):
+    def unequip_item(self, item_id : int):
         """
         Unequip an item from the player.
 
         Parameters:
-            item_key (str): The key name of the item to unequip.
+            item_id (int): The ID of the item to unequip.
         """
-        if item_key in self.inventory:
-            item_data = self.inventory[item_key]
+        if item_id in self.inventory:
+            item_data = self.inventory[item_id]
             item = item_data["item"]
             if isinstance(item, Weapon):
                 item.unequip(self)
             elif isinstance(item, Armour):
                 item.unequip(self)
             else:
-                print(f"{Formatter.yellow_bold(item.name)} cannot be unequipped.")
+                emit("item_not_unequippable", "{item:yellow_bold} cannot be unequipped.", item = item.name)
         else:
-            print(Formatter.yellow_bold(f"Item '{item_key}' is not in your inventory."))
+            emit("item_missing", "Item '{item_id}' is not in your inventory.", "yellow_bold", item_id = item_id)
         
     # def view_inventory(self):
     #     """
@@ -402,11 +371,22 @@ class Player:
         """
         Adjust the player's gold by a specified amount.
 
+        Parameters:
+            amount (int): The amount to add to player's gold. Negative number to subtract.
+        """
+        self.add_gold(amount)
+        emit("gold_changed", "{name:green_bold} now has {gold:yellow_bold} gold.", name = self.name, gold = self.gold, amount = amount)
+
+    def add_gold(self, amount : int):
+        """
+        Adjust the player's gold without any output.
+
         Parameters:
             amount (int): The amount to add to player's gold. Negative number to subtract.
         """
         self.gold += amount
-        print(f"{Formatter.green_bold(self.name)} now has {Formatter.yellow_bold(self.gold)} gold.")
+        if self.journal:
+            self.journal.gold_changed(amount)
 
     # XP and leveling system
 
@@ -435,6 +415,20 @@ class Player:
         """
         Increase the player's level and increase stats, adjusting health and attack.
         """
+        self.advance_level()
+        emit("level_up", "\n{name:green_bold} leveled up to {'Level':cyan_bold} {level:cyan_bold}!", name = self.name, level = self.level)
+        emit(
+            "level_stats",
+            "{'Max Health':white_bold} has increased, and your {'Health':green_bold} is now "
+            "{health:green_bold}/{max_health:white_bold}, "
+            "and {'Attack':blue_bold} is now {attack:blue_bold}.\n",
+            health = self.health, max_health = self.max_health, attack = self.attack
+        )
+
+    def advance_level(self):
+        """
+        Apply the stat changes of a single level up without any output.
+        """
         xp_needed = self.calculate_xp_needed()
         self.level += 1
         self.xp -= xp_needed
@@ -444,10 +438,4 @@ class Player:
         if self.level % 3 == 0: # Increase base attack every 3 levels
             self.base_attack += 1
         
-        self.attack = self.base_attack
-        print(f"\n{Formatter.green_bold(self.name)} leveled up to {Formatter.cyan_bold('Level ' + str(self.level))}!")
-        print(
-            f"{Formatter.white_bold('Max Health')} has increased, and your {Formatter.green_bold('Health')} is now "
-            f"{Formatter.green_bold(self.health)}/{Formatter.white_bold(self.max_health)}, "
-            f"and {Formatter.blue_bold('Attack')} is now {Formatter.blue_bold(self.attack)}.\n"
-        )
\ No newline at end of file
+        self.attack = self.base_attack
\ No newline at end of file
@@ -1,6 +1,7 @@
 from items import all_items
-from otherFunctions import print_slow
 from formatter import Formatter
+from output import emit, narrate
+from event_log import log_event, QUEST_STEP
 
 class Quest:
     """
@@ -10,8 +11,10 @@ class Quest:
         desc (str): Description of the quest objective.
         area (str): The name of the area where the quest takes place.
         reward (dict): Rewards for completing the quest.
+        quest_id (str, optional): The quest's key in the quest data (e.g. "first_story_quest").
     """
-    def __init__(self, desc : str, area : str, reward : dict):
+    def __init__(self, desc : str, area : str, reward : dict, quest_id : str = None):
+        self.quest_id = quest_id
         self.desc = desc
         self.area = area
         self.reward_xp = reward.get("xp", 0)
@@ -25,34 +28,40 @@ class Quest:
         Parameters:
             player (Player): The player completing the quest and getting the rewards.
         """
-        print(f"\n{Formatter.green_bold('Quest Complete:')} {self.desc}")
-        print(f"{Formatter.cyan_bold('Rewards:')} {self.display_rewards()}")
+        emit("quest_completed", "\n{'Quest Complete':green_bold}: {desc}", desc = self.desc)
+        emit(
+            "quest_rewards", "{'Rewards':cyan_bold}: {xp:green_bold} XP, {gold:yellow_bold} gold, Items: {items:green_bold}",
+            xp = self.reward_xp, gold = self.reward_gold, items = self.reward_item_names()
+        )
         
         player.gain_xp(self.reward_xp)
         player.adjust_gold(self.reward_gold)
 
         for item_key in self.reward_items:
-            item = all_items.get(item_key)
-            if item:
-                player.add_to_inventory(item)
+            player.add_to_inventory(all_items[item_key])
+
+        player.quests.remove(self)
+        if player.journal:
+            player.journal.quest_completed(self.quest_id)
 
     def display_rewards(self):
         """
         Formats the rewards and displays them.
         """
-        if self.reward_items:
-            item_rewards = ", ".join(
-                item.replace("_", " ").title() for item in self.reward_items
-            )
-        else:
-            item_rewards = "None"
-
         reward_message = (
-            f"{Formatter.green_bold(self.reward_xp)} XP, {Formatter.yellow_bold(self.reward_gold)} gold, Items: {Formatter.green_bold(item_rewards)}"
+            f"{Formatter.green_bold(self.reward_xp)} XP, {Formatter.yellow_bold(self.reward_gold)} gold, Items: {Formatter.green_bold(self.reward_item_names())}"
         )
 
         return reward_message
 
+    def reward_item_names(self):
+        """
+        Returns the names of the reward items as one string, or "None" if there are no reward items.
+        """
+        if self.reward_items:
+            return ", ".join(item.replace("_", " ").title() for item in self.reward_items)
+        return "None"
+
     def is_complete(self, player):
         """
         Checks if the quest conditions are met.
@@ -70,8 +79,8 @@ class CombatQuest(Quest):
         target_count (int): Number of creatures to defeat.
         min_difficulty (int): Minimum difficulty of the area.
     """
-    def __init__(self, desc : str, area : str, reward : dict, target_type : str, target_count : int, min_difficulty : int = 0):
-        super().__init__(desc, area, reward)
+    def __init__(self, desc : str, area : str, reward : dict, target_type : str, target_count : int, min_difficulty : int = 0, quest_id : str = None):
+        super().__init__(desc, area, reward, quest_id)
         self.target_type = target_type
         self.target_count = target_count
         self.min_difficulty = min_difficulty
@@ -90,8 +99,8 @@ class StoryQuest(Quest):
         areas (dict): Dictionary of areas in the game. Used to unlock areas.
         locations (dict): Dictionary of locations in the game. Used to update NPCs and linked locations.
     """
-    def __init__(self, desc : str, area : object, reward : dict, unlock_area : str = None, steps : list = None, linked_location : str = None, areas : dict = None, locations : dict = None, unlock_quest : str = None):
-        super().__init__(desc, area, reward)
+    def __init__(self, desc : str, area : object, reward : dict, unlock_area : str = None, steps : list = None, linked_location : str = None, areas : dict = None, locations : dict = None, unlock_quest : str = None, quest_id : str = None):
+        super().__init__(desc, area, reward, quest_id)
         self.requires_story_event = True
         self.unlock_area = unlock_area
         self.steps = steps or []
@@ -108,34 +117,9 @@ class StoryQuest(Quest):
         """
         if self.current_step < len(self.steps):
             step = self.steps[self.current_step]
-            print(Formatter.cyan_bold(step['description']))
-
-    def trigger_step(self, trigger_type : str, trigger_data : dict, player : object):
-        """
-        Check if the current step's trigger matches the given trigger type and data.
-
-        Parameters:
-            trigger_type (str): Type of trigger (e.g., "interaction", "exploration").
-            trigger_data (dict): Data related to the trigger (e.g., {"npc": "villager"}).
-            player (Player): The player interacting with the quest.
-
-        Returns:
-            bool: True if the step is triggered and progresses, False otherwise.
-        """
-        if self.current_step < len(self.steps):
-            current_step = self.steps[self.current_step]
-            current_trigger = current_step.get("trigger", {})
-
-            # Check if the step's type and trigger match the provided type and data
-            if current_step["type"] == trigger_type:
-                if all(current_trigger.get(k) == v for k, v in trigger_data.items()):
-                    self.progress_step(player)
-                    return True
+            emit("quest_step", "{description}", "cyan_bold", description = step['description'])
 
-        print(Formatter.red_bold("Trigger did not match. Step not progressed."))
-        return False
-
-    def progress_step(self, player):
+    async def progress_step(self, player):
         """
         Progress to the next step of the quest. Completes the quest if all steps are done.
 
@@ -148,44 +132,34 @@ class StoryQuest(Quest):
             # Unlock an area if specified in the current step
             if 'unlock_area' in current_step:
                 unlock_area_key = current_step['unlock_area'] 
-                area_to_unlock = self.areas.get(unlock_area_key)
-                if area_to_unlock:
-                    if area_to_unlock.locked:
-                        area_to_unlock.locked = False
-                        print(f"\nArea unlocked: {Formatter.cyan_bold(area_to_unlock.name)}")
-                else:
-                    print(f"Error: Area '{unlock_area_key}' not found in areas dictionary!")
+                area_to_unlock = self.areas[unlock_area_key]
+                if area_to_unlock.locked:
+                    area_to_unlock.locked = False
+                    if player.journal:
+                        player.journal.area_unlocked(unlock_area_key)
+                    emit("area_unlocked", "\nArea unlocked: {area:cyan_bold}", area = area_to_unlock.name)
             
             # Display story text for exploration steps
             if current_step["type"] == "exploration" and "story_text" in current_step:
-                print(Formatter.blue("\nPress Space to skip..."))
-                print(f"\n{Formatter.cyan_bold('Story:')}", end=" ")
-                print_slow(current_step["story_text"])
-                print()
+                await narrate("story_text", "Story:", current_step["story_text"])
 
-            # Give the player story item if specified
+            # Give the player story item if specified, the content check guarantees the items exist
             if "story_item" in current_step:
-                story_item_key = current_step["story_item"]
-                story_item = all_items.get(story_item_key)
-                if story_item:
-                    player.add_to_inventory(story_item)
-                    print(f"{Formatter.magenta_bold(story_item.name)} has been added to your inventory.")
-                else:
-                    print(f"{Formatter.red_bold('Error: Story item not found.')}")
+                story_item = all_items[current_step["story_item"]]
+                player.add_to_inventory(story_item)
+                emit("item_added", "{item:magenta_bold} has been added to your inventory.", item = story_item.name)
             
             if "reward_item" in current_step:
-                reward_item_key = current_step["reward_item"]
-                reward_item = all_items.get(reward_item_key)
-                if reward_item:
-                    player.add_to_inventory(reward_item)
-                else:
-                    print(f"{Formatter.red_bold('Error: Reward item not found.')}")
+                player.add_to_inventory(all_items[current_step["reward_item"]])
 
             self.current_step += 1
+            if player.journal:
+                player.journal.quest_step(self.quest_id, self.current_step)
+            log_event(QUEST_STEP, self.quest_id, None, self.current_step)
 
         # Check if all steps are complete
         if self.current_step >= len(self.steps):
-            print(Formatter.green_bold("You have completed all the steps in this quest!"))
+            emit("quest_steps_done", "You have completed all the steps in this quest!", "green_bold", desc = self.desc)
             self.complete_quest(player)
         else:
             self.display_current_step()
@@ -202,7 +176,7 @@ class StoryQuest(Quest):
         # Handle linked location and NPC updates
         if self.linked_location:
             if not self.locations:
-                print(Formatter.red_bold("Error: Locations not set in quest. Unable to update NPCs or linked location."))
+                emit("error", "Error: Locations not set in quest. Unable to update NPCs or linked location.", "red_bold")
                 return
 
             linked_location = self.locations.get(self.linked_location)
@@ -216,18 +190,9 @@ class StoryQuest(Quest):
 
                 linked_location.update_choices()
 
-        # Remove the quest from the Quest Hall
+        # Remove the quest from the Quest Hall and unlock the next quest if specified
         quest_hall = self.locations.get("quest_hall")
         if quest_hall:
-            for category in [quest_hall.combat_quests, quest_hall.story_quests]:
-                for quest_id, quest in list(category.items()):
-                    if quest == self:
-                        del category[quest_id]
-                        break
-            
-            # Unlock the next quest if specified
-            if self.unlock_quest and self.unlock_quest in quest_hall.story_quests:
-                next_quest = quest_hall.story_quests[self.unlock_quest]
-                next_quest.locations = self.locations
-                next_quest.locked = False  # Unlock the next quest
-                print(f"\n{Formatter.green_bold('New quest unlocked:')} {next_quest.desc}")
\ No newline at end of file
+            next_quest = quest_hall.complete_quest(self.quest_id)
+            if next_quest:
+                emit("quest_unlocked", "\n{'New quest unlocked':green_bold}: {desc}", desc = next_quest.desc)
\ No newline at end of file
@@ -0,0 +1,77 @@
+from quest import StoryQuest
+from content import ContentError
+
+class QuestRegistry:
+    """
+    Every quest of a world, keyed by quest ID, with the story quest unlock graph worked out once when the quests are loaded.
+    The graph is checked when the registry is built, so a story quest that unlocks an unknown quest, or a chain of
+    unlocks that loops back on itself, is reported before the game starts instead of when the quest is completed.
+
+    Parameters:
+        combat_quests (dict): The combat quests, keyed by quest ID.
+        story_quests (dict): The story quests, keyed by quest ID.
+
+    Raises:
+        ContentError: If the unlock graph refers to unknown quests or has a cycle.
+
+    **Starting Attributes:**
+        **quests** (dict):
+            Every quest, keyed by quest ID.
+        **unlocks** (dict):
+            The story quest each story quest unlocks when completed, keyed by quest ID.
+        **roots** (tuple):
+            The IDs of the story quests no other quest unlocks, which are available from the start.
+    """
+    def __init__(self, combat_quests : dict, story_quests : dict):
+        self.combat_quests = dict(combat_quests)
+        self.story_quests = dict(story_quests)
+        self.quests = {**self.combat_quests, **self.story_quests}
+        self.unlocks = {quest_id: quest.unlock_quest for quest_id, quest in self.story_quests.items() if quest.unlock_quest}
+        self.check_unlocks()
+
+        unlocked = set(self.unlocks.values())
+        self.roots = tuple(quest_id for quest_id in self.story_quests if quest_id not in unlocked)
+
+    def check_unlocks(self):
+        """
+        Check that every unlocked quest is a story quest and that following the unlocks never leads back to a quest.
+
+        Raises:
+            ContentError: If there are problems, listing all of them.
+        """
+        errors = []
+        for quest_id, unlock_quest in self.unlocks.items():
+            if unlock_quest not in self.story_quests:
+                errors.append(f"story_quests/{quest_id}: unlock_quest '{unlock_quest}' is not a story quest")
+
+        # Each quest unlocks at most one other, so a cycle is found by following the chain from every quest
+        finished = set()
+        for start in self.unlocks:
+            path = {} # Quest ID -> position in the chain, in chain order
+            quest_id = start
+            while quest_id in self.unlocks and quest_id not in finished:
+                if quest_id in path:
+                    cycle = list(path)[path[quest_id]:] + [quest_id]
+                    errors.append(f"story_quests: unlock_quest cycle {' -> '.join(cycle)}")
+                    break
+                path[quest_id] = len(path)
+                quest_id = self.unlocks[quest_id]
+            finished.update(path)
+
+        if errors:
+            raise ContentError(errors)
+
+    def __getitem__(self, quest_id : str):
+        return self.quests[quest_id]
+
+    def __contains__(self, quest_id : str):
+        return quest_id in self.quests
+
+    def get(self, quest_id : str, default = None):
+        return self.quests.get(quest_id, default)
+
+    def is_story(self, quest_id : str):
+        """
+        Returns True if the quest ID belongs to a story quest.
+        """
+        return isinstance(self.quests.get(quest_id), StoryQuest)
@@ -0,0 +1,189 @@
+from quest import CombatQuest, StoryQuest
+from output import emit
+
+KILL = "kill" # Trigger type of combat quests, keyed by creature type or "any"
+
+def trigger_key(trigger_type : str, trigger : dict):
+    """
+    Returns the index key of a trigger, e.g. ("interaction", (("npc", "worried_villager"),)).
+
+    Parameters:
+        trigger_type (str): The type of trigger (e.g. "interaction", "exploration").
+        trigger (dict): The trigger's data (e.g. {"npc": "worried_villager"}).
+    """
+    return (trigger_type, tuple(sorted(trigger.items())))
+
+
+class QuestTracker:
+    """
+    The player's active quests. Every active quest is indexed by the trigger its current step is waiting for,
+    so a defeated creature, an explored area or an NPC interaction only reaches the quests it can progress.
+
+    Parameters:
+        player (Player): The player whose quests are tracked.
+
+    **Starting Attributes:**
+        **active** (dict):
+            The active quests, keyed by quest ID, in the order they were accepted.
+        **progress** (dict):
+            The number of creatures defeated for each active combat quest, keyed by quest ID.
+        **waiting** (dict):
+            The active quests waiting on each trigger, keyed by trigger_key.
+    """
+    def __init__(self, player : object):
+        self.player = player
+        self.active = {}
+        self.progress = {}
+        self.waiting = {}
+
+    def __contains__(self, quest_id : str):
+        return quest_id in self.active
+
+    def __iter__(self):
+        return iter(list(self.active.values()))
+
+    def __len__(self):
+        return len(self.active)
+
+    def combat_quests(self):
+        """
+        Returns the active combat quests.
+        """
+        return [quest for quest in self.active.values() if isinstance(quest, CombatQuest)]
+
+    def story_quests(self):
+        """
+        Returns the active story quests.
+        """
+        return [quest for quest in self.active.values() if isinstance(quest, StoryQuest)]
+
+    def waiting_key(self, quest : object):
+        """
+        Returns the trigger key the quest is waiting for, or None if it isn't waiting for anything.
+        """
+        if isinstance(quest, CombatQuest):
+            return (KILL, quest.target_type)
+        if isinstance(quest, StoryQuest) and quest.current_step < len(quest.steps):
+            step = quest.steps[quest.current_step]
+            return trigger_key(step["type"], step.get("trigger", {}))
+        return None
+
+    def index(self, quest : object):
+        """
+        Add the quest to the index under the trigger it is waiting for.
+        """
+        key = self.waiting_key(quest)
+        if key is not None:
+            self.waiting.setdefault(key, {})[quest.quest_id] = quest
+
+    def unindex(self, quest : object):
+        """
+        Remove the quest from the index.
+        """
+        key = self.waiting_key(quest)
+        quests = self.waiting.get(key)
+        if quests is not None:
+            quests.pop(quest.quest_id, None)
+            if not quests:
+                del self.waiting[key]
+
+    def accept(self, quest : object, progress : int = 0):
+        """
+        Make a quest active.
+
+        Parameters:
+            quest (Quest): The quest to accept.
+            progress (int): The number of creatures already defeated for a combat quest. Defaults to 0.
+        """
+        if quest.quest_id in self.active:
+            return
+        self.active[quest.quest_id] = quest
+        if isinstance(quest, CombatQuest):
+            self.progress[quest.quest_id] = progress
+        self.index(quest)
+
+    def remove(self, quest : object):
+        """
+        Stop tracking a quest, e.g. once it is completed.
+        """
+        if self.active.pop(quest.quest_id, None) is None:
+            return
+        self.unindex(quest)
+        self.progress.pop(quest.quest_id, None)
+
+    def clear(self):
+        """
+        Stop tracking every quest.
+        """
+        self.active.clear()
+        self.progress.clear()
+        self.waiting.clear()
+
+    def set_step(self, quest : object, step : int):
+        """
+        Move a story quest to a step, keeping the index up to date.
+        """
+        tracked = quest.quest_id in self.active
+        if tracked:
+            self.unindex(quest)
+        quest.current_step = step
+        if tracked:
+            self.index(quest)
+
+    def waiting_on(self, trigger_type : str, **trigger):
+        """
+        Returns the active quests whose current step waits for a trigger.
+
+        Parameters:
+            trigger_type (str): The type of trigger (e.g. "interaction").
+            **trigger: The trigger's data (e.g. npc = "worried_villager").
+        """
+        return list(self.waiting.get(trigger_key(trigger_type, trigger), {}).values())
+
+    async def trigger(self, trigger_type : str, **trigger):
+        """
+        Progress every story quest whose current step waits for a trigger.
+
+        Parameters:
+            trigger_type (str): The type of trigger (e.g. "interaction", "exploration").
+            **trigger: The trigger's data (e.g. area = "haunted_forest").
+
+        Returns:
+            list: The quests that progressed.
+        """
+        progressed = self.waiting_on(trigger_type, **trigger)
+        for quest in progressed:
+            self.unindex(quest)
+            await quest.progress_step(self.player)
+            if quest.quest_id in self.active: # Completed quests remove themselves
+                self.index(quest)
+        return progressed
+
+    def creature_defeated(self, creature : object, area : object):
+        """
+        Count a defeated creature towards the active combat quests it matches, completing the ones that reach their target.
+
+        Parameters:
+            creature (Creature): The defeated creature.
+            area (Area): The area where the combat took place.
+
+        Returns:
+            list: The quests that progressed.
+        """
+        matching = self.waiting_on_kill(creature.name.lower()) + self.waiting_on_kill("any")
+        progressed = [quest for quest in matching if quest.min_difficulty <= area.difficulty]
+        for quest in progressed:
+            self.progress[quest.quest_id] += 1
+            progress = self.progress[quest.quest_id]
+            emit("quest_progress", "Quest Progress: {progress:green_bold}/{target}", desc = quest.desc, progress = progress, target = quest.target_count)
+
+            if progress >= quest.target_count:
+                quest.complete_quest(self.player)
+                emit("quest_done", "\nQuest completed and rewards granted.\n", "green_bold", desc = quest.desc)
+        return progressed
+
+    def waiting_on_kill(self, target_type : str):
+        """
+        Returns the active combat quests that count creatures of a type.
+        """
+        return list(self.waiting.get((KILL, target_type), {}).values())
@@ -0,0 +1,57 @@
+import contextvars, hashlib, random
+
+class GameRNG(random.Random):
+    """
+    Random number generator for the game's randomness (creatures, treasure, loot, fleeing). Every generator
+    has a seed, so a run can be repeated exactly, and can be forked into independent named substreams,
+    e.g. one per simulated player.
+
+    Parameters:
+        seed (int, optional): The seed. Defaults to a random seed, which is kept in base_seed.
+
+    **Starting Attributes:**
+        **base_seed** (int):
+            The seed the generator started from.
+    """
+    def __init__(self, seed : int = None):
+        self.base_seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+        super().__init__(self.base_seed)
+
+    def fork(self, name : str):
+        """
+        Create an independent generator for a substream. The substream only depends on this generator's seed and the name,
+        not on how many numbers have been drawn, so forking the same name from the same seed always gives the same stream.
+
+        Parameters:
+            name (str): The name of the substream (e.g. "session-3").
+
+        Returns:
+            rng (GameRNG): The substream's generator.
+        """
+        digest = hashlib.blake2b(f"{self.base_seed}/{name}".encode("utf-8"), digest_size = 8).digest()
+        return GameRNG(int.from_bytes(digest, "little"))
+
+
+default_rng = GameRNG()
+current_rng = contextvars.ContextVar("current_rng", default = default_rng)
+
+def get_rng():
+    """
+    Returns the random number generator of the session running in the current context. Defaults to a shared generator.
+    """
+    return current_rng.get()
+
+def set_rng(rng : GameRNG):
+    """
+    Use the given random number generator for the current context, e.g. the asyncio task running a session.
+
+    Returns:
+        token: Token to pass to reset_rng.
+    """
+    return current_rng.set(rng)
+
+def reset_rng(token):
+    """
+    Restore the random number generator that was in use before set_rng.
+    """
+    current_rng.reset(token)
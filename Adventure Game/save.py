@@ -0,0 +1,307 @@
+import os, struct, zlib
+from items import all_items
+from quest import StoryQuest
+
+SAVE_MAGIC = b"AGSV"
+SAVE_VERSION = 2
+NONE_INDEX = 0xFFFF # String index meaning "nothing" (no weapon, no active quest, ...)
+
+HEADER = struct.Struct("<4sHI") # Magic, version, length of the uncompressed payload
+COUNT = struct.Struct("<H")
+PLAYER = struct.Struct("<HiHiiiiiiiHH") # Name, gold, level, xp, max health, health, base attack, attack, base defence, defence, weapon, armour
+PLAYER_V1 = struct.Struct("<HiHiiiiiiiHHHi") # Version 1 also stored the one active quest and its progress
+ACTIVE_QUEST_ENTRY = struct.Struct("<Hi") # Quest ID, progress
+INVENTORY_ENTRY = struct.Struct("<HI") # Item key, quantity
+EFFECT_ENTRY = struct.Struct("<Hii") # Effect type, value, duration
+AREA_ENTRY = struct.Struct("<HB") # Area key, flags
+QUEST_ENTRY = struct.Struct("<HBH") # Quest ID, flags, current step
+
+AREA_LOCKED = 1
+AREA_BOSS_ACTIVE = 2
+QUEST_IN_HALL = 1
+QUEST_LOCKED = 2
+
+
+class SaveError(Exception):
+    """
+    Raised when a save can't be read, e.g. it is damaged, from a newer version or refers to unknown content.
+    """
+
+
+class StringTable:
+    """
+    Stores each distinct string (item keys, quest IDs, ...) once. Records refer to strings by their index.
+    """
+    def __init__(self):
+        self.strings = []
+        self.indexes = {}
+
+    def index(self, string : str):
+        """
+        Returns the index of a string, adding it to the table if needed. None is stored as NONE_INDEX.
+        """
+        if string is None:
+            return NONE_INDEX
+        index = self.indexes.get(string)
+        if index is None:
+            index = self.indexes[string] = len(self.strings)
+            self.strings.append(string)
+        return index
+
+    def pack(self):
+        """
+        Returns the table as bytes: the number of strings, then each string's length and UTF-8 bytes.
+        """
+        parts = [COUNT.pack(len(self.strings))]
+        for string in self.strings:
+            encoded = string.encode("utf-8")
+            parts.append(COUNT.pack(len(encoded)))
+            parts.append(encoded)
+        return b"".join(parts)
+
+
+class SaveReader:
+    """
+    Reads the records of a save payload in order.
+
+    Parameters:
+        payload (bytes): The uncompressed payload.
+    """
+    def __init__(self, payload : bytes):
+        self.payload = payload
+        self.offset = 0
+        self.strings = []
+
+    def read(self, record : struct.Struct):
+        """
+        Read one record.
+
+        Returns:
+            tuple: The record's fields.
+        """
+        try:
+            values = record.unpack_from(self.payload, self.offset)
+        except struct.error as error:
+            raise SaveError("Save file is truncated.") from error
+        self.offset += record.size
+        return values
+
+    def read_list(self, record : struct.Struct):
+        """
+        Read a count followed by that many records.
+
+        Returns:
+            list: The records' fields.
+        """
+        count, = self.read(COUNT)
+        return [self.read(record) for _ in range(count)]
+
+    def read_strings(self):
+        """
+        Read the string table.
+        """
+        count, = self.read(COUNT)
+        for _ in range(count):
+            length, = self.read(COUNT)
+            self.strings.append(self.payload[self.offset:self.offset + length].decode("utf-8"))
+            self.offset += length
+
+    def string(self, index : int):
+        """
+        Returns the string at an index of the string table, or None for NONE_INDEX.
+        """
+        if index == NONE_INDEX:
+            return None
+        try:
+            return self.strings[index]
+        except IndexError:
+            raise SaveError(f"Save refers to string {index}, which isn't in its string table.") from None
+
+
+def world_state(locations : dict):
+    """
+    Returns the parts of the world that saves cover.
+
+    Returns:
+        tuple: The areas, the quest hall and the village (the village may be None).
+    """
+    return locations["exploration"].areas, locations["quest_hall"], locations.get("village")
+
+def all_quests(quest_hall : object):
+    """
+    Returns every quest the quest hall knows about, including completed ones, keyed by quest ID.
+    """
+    return quest_hall.registry.quests
+
+def snapshot(player : object, locations : dict, compression_level : int = 6):
+    """
+    Serialize the game state into a compact binary save. Items, quests and areas are stored by key.
+
+    Parameters:
+        player (Player): The player to save.
+        locations (dict): The game locations, which hold the areas and quests.
+        compression_level (int): The zlib compression level. Defaults to 6.
+
+    Returns:
+        bytes: The save data.
+    """
+    areas, quest_hall, village = world_state(locations)
+    strings = StringTable()
+    parts = []
+
+    weapon = player.weapon.key if player.weapon else None
+    armour = player.armour.key if player.armour else None
+    parts.append(PLAYER.pack(
+        strings.index(player.name), player.gold, player.level, player.xp, player.max_health, player.health,
+        player.base_attack, player.attack, player.base_defence, player.defence,
+        strings.index(weapon), strings.index(armour)
+    ))
+
+    parts.append(COUNT.pack(len(player.inventory)))
+    for item_data in player.inventory.values(): # Items are saved by key, since IDs change when items are added to the content
+        parts.append(INVENTORY_ENTRY.pack(strings.index(item_data["item"].key), item_data["quantity"]))
+
+    parts.append(COUNT.pack(len(player.active_effects)))
+    for effect_type, effect in player.active_effects.items():
+        parts.append(EFFECT_ENTRY.pack(strings.index(effect_type), effect["value"], effect["duration"]))
+
+    parts.append(COUNT.pack(len(player.completed_quests)))
+    for quest in player.completed_quests:
+        parts.append(COUNT.pack(strings.index(getattr(quest, "quest_id", quest))))
+
+    parts.append(COUNT.pack(len(player.quests)))
+    for quest in player.quests:
+        parts.append(ACTIVE_QUEST_ENTRY.pack(strings.index(quest.quest_id), player.quests.progress.get(quest.quest_id, 0)))
+
+    parts.append(COUNT.pack(len(areas)))
+    for key, area in areas.items():
+        flags = (AREA_LOCKED if area.locked else 0) | (AREA_BOSS_ACTIVE if area.boss_active else 0)
+        parts.append(AREA_ENTRY.pack(strings.index(key), flags))
+
+    quests = all_quests(quest_hall)
+    parts.append(COUNT.pack(len(quests)))
+    for quest_id, quest in quests.items():
+        in_hall = quest_id in quest_hall.combat_quests or quest_id in quest_hall.story_quests
+        locked = isinstance(quest, StoryQuest) and quest.locked
+        flags = (QUEST_IN_HALL if in_hall else 0) | (QUEST_LOCKED if locked else 0)
+        parts.append(QUEST_ENTRY.pack(strings.index(quest_id), flags, getattr(quest, "current_step", 0)))
+
+    interacted = [key for key, npc in village.npc_dict.items() if npc.interacted] if village else []
+    parts.append(COUNT.pack(len(interacted)))
+    for key in interacted:
+        parts.append(COUNT.pack(strings.index(key)))
+
+    payload = strings.pack() + b"".join(parts)
+    return HEADER.pack(SAVE_MAGIC, SAVE_VERSION, len(payload)) + zlib.compress(payload, compression_level)
+
+def restore(data : bytes, player : object, locations : dict):
+    """
+    Load a save into a newly created player and world, e.g. the ones a Session or the game starts with.
+
+    Parameters:
+        data (bytes): The save data from snapshot.
+        player (Player): The player to restore into.
+        locations (dict): The game locations to restore into.
+
+    Raises:
+        SaveError: If the save is damaged, from a newer version or refers to unknown items, areas or quests.
+    """
+    try:
+        magic, version, length = HEADER.unpack_from(data)
+    except struct.error as error:
+        raise SaveError("Save file is too short.") from error
+    if magic != SAVE_MAGIC:
+        raise SaveError("Not a save file.")
+    if version > SAVE_VERSION:
+        raise SaveError(f"Save version {version} is newer than the supported version {SAVE_VERSION}.")
+    try:
+        payload = zlib.decompress(data[HEADER.size:])
+    except zlib.error as error:
+        raise SaveError("Save file is damaged.") from error
+    if len(payload) != length:
+        raise SaveError("Save file is damaged.")
+
+    reader = SaveReader(payload)
+    reader.read_strings()
+    areas, quest_hall, village = world_state(locations)
+    quests = all_quests(quest_hall)
+
+    def lookup(table : dict, key : str, kind : str):
+        if key is None:
+            return None
+        if key not in table:
+            raise SaveError(f"Save refers to unknown {kind} '{key}'.")
+        return table[key]
+
+    if version == 1:
+        (name, player.gold, player.level, player.xp, player.max_health, player.health, player.base_attack, player.attack,
+         player.base_defence, player.defence, weapon, armour, active_quest, quest_progress) = reader.read(PLAYER_V1)
+        active_quests = [(active_quest, quest_progress)] if active_quest != NONE_INDEX else []
+    else:
+        (name, player.gold, player.level, player.xp, player.max_health, player.health, player.base_attack, player.attack,
+         player.base_defence, player.defence, weapon, armour) = reader.read(PLAYER)
+    player.name = reader.string(name)
+    player.weapon = lookup(all_items, reader.string(weapon), "item")
+    player.armour = lookup(all_items, reader.string(armour), "item")
+
+    player.inventory.clear()
+    for key, quantity in reader.read_list(INVENTORY_ENTRY):
+        player.inventory.add(lookup(all_items, reader.string(key), "item"), quantity)
+
+    player.active_effects = {
+        reader.string(effect_type): {"value": value, "duration": duration}
+        for effect_type, value, duration in reader.read_list(EFFECT_ENTRY)
+    }
+
+    player.completed_quests = [lookup(quests, reader.string(quest_id), "quest") for quest_id, in reader.read_list(COUNT)]
+    if version > 1:
+        active_quests = reader.read_list(ACTIVE_QUEST_ENTRY)
+
+    for key, flags in reader.read_list(AREA_ENTRY):
+        area = lookup(areas, reader.string(key), "area")
+        area.locked = bool(flags & AREA_LOCKED)
+        area.boss_active = bool(flags & AREA_BOSS_ACTIVE)
+
+    quest_hall.combat_quests.clear()
+    quest_hall.story_quests.clear()
+    for quest_id, flags, current_step in reader.read_list(QUEST_ENTRY):
+        quest_id = reader.string(quest_id)
+        quest = lookup(quests, quest_id, "quest")
+        if isinstance(quest, StoryQuest):
+            quest.locked = bool(flags & QUEST_LOCKED)
+            quest.current_step = current_step
+            if flags & QUEST_IN_HALL:
+                quest_hall.story_quests[quest_id] = quest
+        elif flags & QUEST_IN_HALL:
+            quest_hall.combat_quests[quest_id] = quest
+
+    # Accepted after the quest steps are restored, so each quest is indexed under its current step
+    player.quests.clear()
+    for quest_id, progress in active_quests:
+        player.quests.accept(lookup(quests, reader.string(quest_id), "quest"), progress)
+
+    interacted = [reader.string(key) for key, in reader.read_list(COUNT)]
+    if village:
+        village.update_npcs()
+        for key in interacted:
+            if key in village.npc_dict:
+                village.npc_dict[key].interacted = True
+        village.update_choices()
+
+def save_game(path : str, player : object, locations : dict):
+    """
+    Write a save file. The file is replaced in one step, so a crash never leaves half a save.
+    """
+    data = snapshot(player, locations)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok = True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+def load_game(path : str, player : object, locations : dict):
+    """
+    Read a save file into a newly created player and world.
+    """
+    with open(path, "rb") as file:
+        restore(file.read(), player, locations)
@@ -0,0 +1,256 @@
+import asyncio, contextlib, os, sys, uuid
+from formatter import Formatter
+from player import Player
+from items import all_items
+from game_data import create_areas, create_shops, create_combat_quests, create_story_quests
+from location import Home, Village, QuestHall, Exploration
+from game_io import QueueIO, StreamIO, set_io, reset_io
+from save import snapshot, restore
+from journal import ACTION_ABORTED, Journal, SessionJournal, read_journal, recover
+from rng import GameRNG, set_rng, reset_rng
+from event_log import EventLog, set_event_log, reset_event_log
+
+class Session:
+    """
+    A single text game session with its own player and world, driven through a GameIO.
+    Sessions don't need the graphical UI, so popup-only choices (status, inventory, shop) are left out.
+
+    Parameters:
+        session_id (str): Unique identifier of the session.
+        name (str): The player's name. Defaults to "Adventurer".
+        io (GameIO, optional): How the session reads input and shows text. Defaults to a new QueueIO.
+        rng (GameRNG, optional): The session's random number generator. Defaults to a new randomly seeded one.
+        event_log (EventLog, optional): Log of the session's combat and exploration events. Defaults to no logging.
+        event_log_path (str, optional): Where the event log is saved when the session ends, as .npy or .csv. Defaults to not saving it.
+
+    **Starting Attributes:**
+        **player** (Player):
+            The session's player, starting with 100 gold and a basic sword.
+        **locations** (dict):
+            The session's locations, keyed the same way as in the game.
+        **current_location** (str):
+            The key of the location the player is in. Starts as "home".
+        **rng** (GameRNG):
+            The random number generator used for everything random in the session.
+        **finished** (bool):
+            Whether the session has ended. Starts as False.
+    """
+    def __init__(self, session_id : str, name : str = "Adventurer", io : object = None, rng : GameRNG = None, event_log : EventLog = None,
+                 event_log_path : str = None):
+        self.session_id = session_id
+        self.io = io if io is not None else QueueIO()
+        self.rng = rng or GameRNG()
+        self.event_log = event_log
+        self.event_log_path = event_log_path
+        self.finished = False
+
+        # Show the starting messages to the session's player rather than on the host's console
+        token = set_io(self.io)
+        try:
+            self.player = Player(name)
+            self.player.adjust_gold(100)
+            self.player.add_to_inventory(all_items["basic_sword"])
+        finally:
+            reset_io(token)
+
+        # Each session gets its own copy of the world so progress isn't shared between players
+        areas = create_areas()
+        shops = create_shops()
+        self.locations = {
+            "home": Home(self.player, None),
+            "village": Village(self.player, shops["Adventurer's Shop"], None),
+            "exploration": Exploration(self.player, areas),
+        }
+        self.locations["quest_hall"] = QuestHall(self.player, create_combat_quests(), create_story_quests(areas), self.locations)
+        self.current_location = "home"
+
+    def snapshot(self):
+        """
+        Returns the session's game state as save data.
+        """
+        return snapshot(self.player, self.locations)
+
+    def restore(self, data : bytes):
+        """
+        Load save data into the session. Should be called before the session starts running.
+        """
+        restore(data, self.player, self.locations)
+
+    def attach_journal(self, journal : Journal, snapshot_dir : str, snapshot_every : int = 100, records : list = None):
+        """
+        Recover the session from its snapshot and journal records, then record its changes in the journal.
+        Should be called before the session starts running.
+
+        Parameters:
+            journal (Journal): The shared journal.
+            snapshot_dir (str): The folder snapshots are written to.
+            snapshot_every (int): The number of changes between snapshots. Defaults to 100.
+            records (list, optional): The journal's records, if they have already been read.
+
+        Raises:
+            SaveError: If the session's snapshot is damaged, since the journal alone can't rebuild it.
+        """
+        sequence, interrupted = recover(self.session_id, self.player, self.locations, journal.path, snapshot_dir, records)
+        self.io.durable = journal.sync # Changes are on disk before the player sees them acknowledged
+        self.player.journal = SessionJournal(journal, self.session_id, self.player, self.locations, snapshot_dir, snapshot_every, sequence)
+        if interrupted:
+            # Close off the dropped action's records, so later recoveries don't commit them with the next action
+            self.player.journal.mark(ACTION_ABORTED)
+
+    async def run(self):
+        """
+        Play the session until its input is closed or the player dies.
+        """
+        token = set_io(self.io)
+        rng_token = set_rng(self.rng)
+        log_token = set_event_log(self.event_log)
+        try:
+            while True:
+                choice = await self.locations[self.current_location].get_action()
+                result = await choice.execute_async(self.locations)
+                if isinstance(result, str) and result in self.locations:
+                    self.current_location = result
+                if self.player.journal:
+                    await self.player.journal.checkpoint()
+        except (EOFError, SystemExit):
+            pass # Input closed or the player was defeated
+        finally:
+            self.finished = True
+            if self.player.journal:
+                await self.player.journal.snapshot()
+            if self.event_log is not None and self.event_log_path:
+                self.event_log.save(self.event_log_path)
+            reset_event_log(log_token)
+            reset_rng(rng_token)
+            reset_io(token)
+
+
+class SessionHost:
+    """
+    Runs many game sessions on one asyncio event loop. While a session waits for its player's input,
+    the other sessions keep running.
+
+    Parameters:
+        journal_path (str, optional): The journal file shared by every session. Defaults to no persistence.
+        snapshot_dir (str): The folder session snapshots are written to. Defaults to "saves".
+        snapshot_every (int): The number of changes between a session's snapshots. Defaults to 100.
+        seed (int, optional): Seed for the sessions' random number generators. Each session gets its own substream,
+            forked by session ID, so a seeded host plays the same way every run. Defaults to a random seed.
+        event_log_dir (str, optional): The folder each session's event log is saved to when it ends, as <session ID>.<format>.
+            Defaults to not logging events.
+        event_log_format (str): "npy" or "csv". Defaults to "npy".
+
+    **Starting Attributes:**
+        **sessions** (dict):
+            The hosted sessions, keyed by session ID.
+    """
+    def __init__(self, journal_path : str = None, snapshot_dir : str = "saves", snapshot_every : int = 100, seed : int = None,
+                 event_log_dir : str = None, event_log_format : str = "npy"):
+        self.sessions = {}
+        self.journal = Journal(journal_path) if journal_path else None
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_every = snapshot_every
+        self.records = None
+        self.records_durable = None # The journal's durable count when the records were read
+        self.rng = GameRNG(seed)
+        self.event_log_dir = event_log_dir
+        self.event_log_format = event_log_format
+
+    def add_session(self, name : str = "Adventurer", io : object = None, session_id : str = None):
+        """
+        Create a session and add it to the host.
+
+        Parameters:
+            name (str): The player's name. Defaults to "Adventurer".
+            io (GameIO, optional): The session's IO. Defaults to a new QueueIO.
+            session_id (str, optional): The ID of a session to resume from its snapshot and journal. Defaults to a new random ID,
+                which never matches an earlier session.
+
+        Returns:
+            session (Session): The new session.
+
+        Raises:
+            SaveError: If the resumed session's snapshot is damaged.
+        """
+        resuming = session_id is not None
+        session_id = session_id or uuid.uuid4().hex
+        if session_id in self.sessions:
+            raise ValueError(f"Session {session_id} already exists.")
+        event_log, event_log_path = None, None
+        if self.event_log_dir:
+            event_log = EventLog()
+            event_log_path = os.path.join(self.event_log_dir, f"{session_id}.{self.event_log_format}")
+        session = Session(session_id, name, io, self.rng.fork(session_id), event_log, event_log_path)
+        if self.journal:
+            session.attach_journal(self.journal, self.snapshot_dir, self.snapshot_every, self.journal_records() if resuming else [])
+        self.sessions[session_id] = session
+        return session
+
+    def journal_records(self):
+        """
+        Returns the journal's records. They are only read again once more records have been committed, so sessions
+        resumed together recover from the same read.
+        """
+        if self.records is None or self.records_durable != self.journal.durable:
+            self.records_durable = self.journal.durable
+            self.records = read_journal(self.journal.path)
+        return self.records
+
+    def send(self, session_id : str, line : str):
+        """
+        Queue a line of input for a session that uses a QueueIO.
+        """
+        self.sessions[session_id].io.feed(line)
+
+    async def run(self):
+        """
+        Run every hosted session until they have all finished.
+        """
+        async with self.committing():
+            await asyncio.gather(*(session.run() for session in self.sessions.values() if not session.finished))
+
+    @contextlib.asynccontextmanager
+    async def committing(self):
+        """
+        Run the journal's group commits in the background while the sessions play.
+        """
+        if not self.journal:
+            yield
+            return
+        commit_task = asyncio.create_task(self.journal.run())
+        try:
+            yield
+        finally:
+            self.journal.stop()
+            await asyncio.gather(commit_task, return_exceptions = True)
+            self.journal.close()
+
+    async def serve(self, host : str = "127.0.0.1", port : int = 8765):
+        """
+        Accept players over TCP, starting a new session for each connection.
+
+        Parameters:
+            host (str): The address to listen on. Defaults to 127.0.0.1.
+            port (int): The port to listen on. Defaults to 8765.
+        """
+        async def handle_connection(reader, writer):
+            session = self.add_session(io = StreamIO(reader, writer))
+            try:
+                await session.run()
+            finally:
+                del self.sessions[session.session_id]
+                writer.close()
+
+        server = await asyncio.start_server(handle_connection, host, port)
+        async with server, self.committing():
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    # Remote players get colors even when the host itself isn't running in a terminal
+    Formatter.set_color("--no-color" not in sys.argv)
+
+    # Run with --event-log <folder> to save each session's combat and exploration events there, --event-log-csv for CSV
+    event_log_dir = sys.argv[sys.argv.index("--event-log") + 1] if "--event-log" in sys.argv else None
+    event_log_format = "csv" if "--event-log-csv" in sys.argv else "npy"
+    asyncio.run(SessionHost(journal_path = "saves/journal.log", event_log_dir = event_log_dir, event_log_format = event_log_format).serve())
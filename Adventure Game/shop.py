@@ -1,27 +1,30 @@
 from items import all_items
-from choice import pause_clear_screen, continue_clear_screen, clear_screen
-from formatter import Formatter
+from output import emit
 
 class Shop:
     """
     A class for creating shops where the player can buy and sell items.
 
     Parameters:
-        data (dict): A dictionary containing the shop's name, inventory, and prices.
+        data (dict): The shop's compiled content: its name and the price of each item key, per category.
+
+    **Starting Attributes:**
+        **inventory** (dict):
+            The items of each category, keyed by item ID.
+        **prices** (dict):
+            The price of each item of each category, keyed by item ID.
     """
     def __init__(self, data : dict):
         self.name = data["name"]
         self.inventory = {"weapons": {}, "armours": {}, "potions": {}} # Categories of items in the shop
         self.prices = {"weapons": {}, "armours": {}, "potions": {}} # Prices of items in the shop
 
-        # Load items and their prices into inventory and price dictionaries
-        for category, items_list in  data["inventory"].items():
-            for item_name, price in items_list.items():
-                item_key = item_name.lower().replace(" ", "_")
-                item = all_items.get(item_key)
-                if item:
-                    self.inventory[category][item_key] = item
-                    self.prices[category][item_key] = price
+        # Load items and their prices into inventory and price dictionaries, the content check guarantees every item exists
+        for category, items_list in data["inventory"].items():
+            for key, price in items_list.items():
+                item = all_items[key]
+                self.inventory[category][item.item_id] = item
+                self.prices[category][item.item_id] = price
     
     def get_items_by_category(self, category: str):
         """
@@ -35,36 +38,36 @@ class Shop:
         """
         return list(self.inventory.get(category.lower(), {}).items())
 
-    def get_item_price(self, category: str, item_key: str):
+    def get_item_price(self, category: str, item_id: int):
         """
         Returns the price of an item in the given category.
         
         Parameters:
             category (str): The category of the item (e.g., "weapons", "armours", "potions").
-            item_key (str): The key representing the item name.
+            item_id (int): The ID of the item.
         
         Returns:
             int: The price of the item, or 0 if the item is not found.
         """
-        return self.prices.get(category, {}).get(item_key)
+        return self.prices.get(category, {}).get(item_id)
     
-    def buy_item(self, player, category: str, item_key: str):
+    def buy_item(self, player, category: str, item_id: int):
         """
         Allows the player to buy an item from the shop.
 
         Parameters:
             player (Player): The player who is buying the item.
             category (str): The category of the item (e.g., "weapons", "armours", "potions").
-            item_key (str): The key representing the item name.
+            item_id (int): The ID of the item.
         
         Returns:
             bool: True if the item was bought successfully, False otherwise.
             str: A message indicating the result of the purchase.
         """
-        item = self.inventory[category].get(item_key)
-        print(f"Buying {item_key} from {category}") # Debug
-        print(f"Inventory keys: {list(self.inventory[category].keys())}") # Debug
-        price = self.get_item_price(category, item_key)
+        item = self.inventory[category].get(item_id)
+        emit("debug", "Buying {item_id} from {category}", item_id = item_id, category = category) # Debug
+        emit("debug", "Inventory keys: {keys}", keys = list(self.inventory[category].keys())) # Debug
+        price = self.get_item_price(category, item_id)
 
         if not item or price is None:
             return False, "Item not available."
@@ -76,12 +79,12 @@ class Shop:
         player.adjust_gold(-price)
         return True, f"Bought {item.name} for {price} gold."
 
-    def can_sell_item(self, item_key: str):
+    def can_sell_item(self, item_id: int):
         """
         Checks if the shop can accept the item for sale.
 
         Parameters:
-            item_key (str): The key representing the item name.
+            item_id (int): The ID of the item.
         
         Returns:
             bool: True if the shop can accept the item, False otherwise.
@@ -89,36 +92,36 @@ class Shop:
             int: The base price of the item if accepted, None otherwise.
         """
         for category, items in self.inventory.items():
-            if item_key in items:
-                price = self.prices[category].get(item_key)
+            if item_id in items:
+                price = self.prices[category].get(item_id)
                 if price is not None:
                     return True, category, price
         return False, None, None
     
-    def sell_item(self, player, item_key: str):
+    def sell_item(self, player, item_id: int):
         """
         Allows the player to sell an item from their inventory to the shop at half its purchase price.
 
         Parameters:
             player (Player): The player selling the item.
-            item_key (str): The key representing the item name.
+            item_id (int): The ID of the item.
 
         Returns:
             bool: True if the item was sold successfully, False otherwise.
             str: A message indicating the result of the sale.
         """
-        item_data = player.get_inventory_item(item_key)
+        item_data = player.get_inventory_item(item_id)
         if not item_data:
             return False, "Item not in inventory."
     
         item = item_data["item"]
-        can_sell, category, base_price = self.can_sell_item(item_key)
+        can_sell, category, base_price = self.can_sell_item(item_id)
 
         if not can_sell:
             return False, "This shop does not accept that item."
         
         sell_price = int(base_price * 0.5)
-        player.remove_from_inventory(item_key)
+        player.remove_from_inventory(item_id)
         player.adjust_gold(sell_price)
         return True, f"Sold {item.name} for {sell_price} gold."
 
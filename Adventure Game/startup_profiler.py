@@ -0,0 +1,122 @@
+import builtins, sys, time
+from contextlib import contextmanager
+from importlib.util import resolve_name
+
+class StartupProfiler:
+    """
+    Measures how long each module import and initialization step takes while the game starts.
+    Imports are timed by wrapping the built-in import function, so only modules that weren't already
+    loaded are recorded. Each entry has its own (self) time and the time including the modules it imported.
+
+    **Starting Attributes:**
+        **imports** (list):
+            Import records in the order they started: [module name, depth, self seconds, total seconds].
+        **sections** (list):
+            Initialization steps in the order they started: [name, depth, seconds].
+        **enabled** (bool):
+            Whether the profiler is recording. Starts as False.
+    """
+    def __init__(self):
+        self.imports = []
+        self.sections = []
+        self.enabled = False
+        self.original_import = None
+        self.child_time = [] # Stack of time spent in nested imports, used to work out self time
+        self.section_depth = 0
+        self.start_time = None
+
+    def start(self):
+        """
+        Start recording imports.
+        """
+        if self.enabled:
+            return
+        self.enabled = True
+        self.start_time = time.perf_counter()
+        self.original_import = builtins.__import__
+        builtins.__import__ = self.timed_import
+
+    def stop(self):
+        """
+        Stop recording imports and restore the built-in import function.
+        """
+        if self.enabled:
+            builtins.__import__ = self.original_import
+            self.enabled = False
+
+    def timed_import(self, name, globals = None, locals = None, fromlist = (), level = 0):
+        """
+        Replacement for the built-in import function that records modules imported for the first time.
+        """
+        try:
+            package = globals.get("__package__") if globals and level else None
+            module_name = resolve_name("." * level + name, package) if level else name
+        except (ImportError, ValueError):
+            module_name = name
+
+        if module_name in sys.modules:
+            return self.original_import(name, globals, locals, fromlist, level)
+
+        record = [module_name, len(self.child_time), 0.0, 0.0]
+        self.imports.append(record)
+        self.child_time.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            total = time.perf_counter() - start
+            nested = self.child_time.pop()
+            record[2] = total - nested
+            record[3] = total
+            if self.child_time:
+                self.child_time[-1] += total
+
+    @contextmanager
+    def section(self, name : str):
+        """
+        Time an initialization step. Does nothing when the profiler isn't recording.
+
+        Parameters:
+            name (str): The name of the step.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        record = [name, self.section_depth, 0.0]
+        self.sections.append(record)
+        self.section_depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record[2] = time.perf_counter() - start
+            self.section_depth -= 1
+
+    def report(self, slowest : int = 10):
+        """
+        Build a text report of the recorded imports and initialization steps.
+
+        Parameters:
+            slowest (int): The number of modules to list by self time. Defaults to 10.
+
+        Returns:
+            str: The report.
+        """
+        lines = ["Startup profile", "", "Imports (self ms | total ms | module):"]
+        for module_name, depth, self_time, total in self.imports:
+            lines.append(f"{self_time * 1000:9.2f} | {total * 1000:9.2f} | {'  ' * depth}{module_name}")
+
+        lines += ["", f"Slowest {slowest} modules by self time:"]
+        for module_name, _, self_time, total in sorted(self.imports, key = lambda record: record[2], reverse = True)[:slowest]:
+            lines.append(f"{self_time * 1000:9.2f} ms  {module_name}")
+
+        lines += ["", "Initialization (ms | step):"]
+        for name, depth, duration in self.sections:
+            lines.append(f"{duration * 1000:9.2f} | {'  ' * depth}{name}")
+
+        import_total = sum(record[3] for record in self.imports if record[1] == 0)
+        lines += ["", f"Total imports: {import_total * 1000:.2f} ms over {len(self.imports)} modules"]
+        if self.start_time is not None:
+            lines.append(f"Total startup: {(time.perf_counter() - self.start_time) * 1000:.2f} ms")
+        return "\n".join(lines)
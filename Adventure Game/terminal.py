@@ -0,0 +1,114 @@
+import re, shutil
+
+ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+
+def visible_length(line : str):
+    """
+    Returns the number of characters of a line that show on the screen, ignoring ANSI codes.
+    """
+    return len(ANSI_PATTERN.sub("", line))
+
+
+class TerminalRenderer:
+    """
+    Clears and redraws a terminal with escape sequences instead of running the clear/cls command.
+    It keeps a copy of the lines on the screen. Clearing starts a new frame, and when the frame is flushed
+    only the lines that differ from the screen are rewritten. Writes between clears are streamed as usual.
+
+    If the screen's contents are unknown (e.g. something else wrote to it) or a frame doesn't fit the terminal,
+    the frame is drawn in full after clearing the screen.
+
+    Parameters:
+        write (callable): Function that sends text to the terminal.
+        size (callable, optional): Function returning the terminal's (columns, rows). Defaults to the size of the real terminal.
+
+    **Starting Attributes:**
+        **lines** (list):
+            The lines of the screen, the last one being the line the cursor is on.
+        **frame_pending** (bool):
+            Whether a new frame has been started and not drawn yet. Starts as False.
+        **valid** (bool):
+            Whether the lines match what is on the screen. Starts as False.
+    """
+    def __init__(self, write, size = None):
+        self.write_out = write
+        self.size = size or shutil.get_terminal_size
+        self.lines = [""]
+        self.shown = None
+        self.frame_pending = False
+        self.valid = False
+
+    def add_text(self, text : str):
+        """
+        Add text to the copy of the screen, after the cursor.
+        """
+        parts = text.split("\n")
+        self.lines[-1] += parts[0]
+        self.lines.extend(parts[1:])
+
+    def write(self, text : str):
+        """
+        Write text at the cursor. While a frame is pending the text is only added to the frame.
+        """
+        self.add_text(text)
+        if not self.frame_pending:
+            self.write_out(text)
+
+    def echo(self, text : str):
+        """
+        Record text the terminal showed by itself, e.g. the player's typed input.
+        """
+        self.add_text(text)
+
+    def clear(self):
+        """
+        Start a new, empty frame. Nothing is written until the frame is flushed.
+        """
+        if not self.frame_pending:
+            self.shown = self.lines if self.valid else None
+            self.frame_pending = True
+        self.lines = [""]
+
+    def invalidate(self):
+        """
+        Mark the screen's contents as unknown so the next frame is drawn in full.
+        """
+        self.valid = False
+
+    def flush(self):
+        """
+        Draw the pending frame, if there is one.
+        """
+        if not self.frame_pending:
+            return
+        self.frame_pending = False
+        self.write_out(self.render_frame(self.shown, self.lines))
+        self.shown = None
+        self.valid = True
+
+    def render_frame(self, old : list, new : list):
+        """
+        Build the text that turns the old screen into the new one.
+
+        Parameters:
+            old (list): The lines on the screen, or None if they are unknown.
+            new (list): The lines of the new frame.
+
+        Returns:
+            str: The text and escape sequences to write.
+        """
+        columns, rows = self.size()
+        fits = all(len(lines) < rows and all(visible_length(line) < columns for line in lines) for lines in (old or [], new))
+        if old is None or not fits:
+            return CLEAR_SCREEN + "\n".join(new)
+
+        output = []
+        for row, line in enumerate(new):
+            if row >= len(old) or old[row] != line:
+                output.append(f"\x1b[{row + 1};1H{line}\x1b[K")
+        if len(old) > len(new):
+            output.append(f"\x1b[{len(new) + 1};1H\x1b[J")
+        # Leave the cursor at the end of the frame, where the next text goes
+        output.append(f"\x1b[{len(new)};{visible_length(new[-1]) + 1}H")
+        return "".join(output)
@@ -0,0 +1,163 @@
+import asyncio, threading
+from game_io import get_io
+
+CHARACTER_DELAY = 0.05
+# Longer pauses after punctuation, an ellipsis counts as a single pause
+PUNCTUATION_DELAYS = {"...": 1, ".": 0.4, "?": 0.4, "!": 0.4, ",": 0.2}
+# Characters typed within this many seconds of each other are written together
+FRAME_TIME = 1 / 30
+
+
+class SkipChannel:
+    """
+    Lets the player at the console skip the typing effect by pressing Space. A single keyboard hook is registered the first
+    time it is needed and shared by every typewriter, instead of a listener thread per line of text.
+
+    **Starting Attributes:**
+        **available** (bool or None):
+            Whether the keyboard hook could be registered. None until the first listen.
+    """
+    def __init__(self):
+        self.pressed = threading.Event()
+        self.available = None
+
+    def listen(self):
+        """
+        Register the Space key hook if it hasn't been registered yet. The typing effect can't be skipped
+        if the keyboard module is missing or isn't allowed to hook the keyboard.
+        """
+        if self.available is not None:
+            return
+        try:
+            import keyboard # Imported here so modules that never type text don't load the keyboard hooks
+            keyboard.on_press_key("space", lambda event: self.pressed.set())
+            self.available = True
+        except Exception:
+            self.available = False
+
+    def reset(self):
+        """
+        Forget earlier presses, so a new line of text starts unskipped.
+        """
+        self.pressed.clear()
+
+    def press(self):
+        """
+        Skip the text being typed, e.g. from another input source.
+        """
+        self.pressed.set()
+
+    def is_pressed(self):
+        """
+        Returns True if the text being typed should be skipped.
+        """
+        return self.pressed.is_set()
+
+
+class Typewriter:
+    """
+    Writes text a few characters at a time to simulate typing, with longer pauses after punctuation.
+    Text goes through the session's GameIO in chunks: every character that is due before the next frame
+    is written at once, and the output is only flushed once per chunk.
+
+    Parameters:
+        time_scale (float): Multiplier for every delay. 0 writes the text instantly. Defaults to 1.
+        skip (SkipChannel, optional): The channel used to skip the effect. Defaults to the shared channel.
+    """
+    def __init__(self, time_scale : float = 1, skip : SkipChannel = None):
+        self.time_scale = time_scale
+        self.skip = skip or skip_channel
+
+    @property
+    def animated(self):
+        """
+        Whether text is typed out rather than written instantly. Text is only typed out on IOs that type text,
+        so a remote session never waits on a Space press it can't send.
+        """
+        return self.time_scale > 0 and get_io().types_text
+
+    def chunks(self, text : str):
+        """
+        Split text into the chunks that are written together.
+
+        Parameters:
+            text (str): The text to split.
+
+        Returns:
+            list: (chunk, delay) pairs, where delay is the number of seconds to wait after writing the chunk.
+        """
+        chunks = []
+        chunk_start = 0
+        delay = 0
+        i = 0
+        while i < len(text):
+            if text[i:i+3] == "...":
+                unit = "..."
+            else:
+                unit = text[i]
+            i += len(unit)
+
+            unit_delay = PUNCTUATION_DELAYS.get(unit)
+            delay += (unit_delay or CHARACTER_DELAY) * self.time_scale
+            # Punctuation always ends a chunk so its pause shows
+            if unit_delay or delay >= FRAME_TIME:
+                chunks.append((text[chunk_start:i], delay))
+                chunk_start = i
+                delay = 0
+
+        if chunk_start < len(text):
+            chunks.append((text[chunk_start:], delay))
+        return chunks
+
+    def start(self, text : str):
+        """
+        Prepare to type a line of text.
+
+        Returns:
+            list: The chunks to write, or None if the text should be written instantly.
+        """
+        if not self.animated:
+            return None
+        self.skip.listen()
+        self.skip.reset()
+        get_io().flush() # Show any buffered text before typing starts
+        return self.chunks(text)
+
+    async def write_async(self, text : str, end : str = "\n"):
+        """
+        Type out text without blocking the event loop, so other sessions keep running.
+
+        Parameters:
+            text (str): The text to write.
+            end (str): Written after the text. Defaults to a newline.
+        """
+        io = get_io()
+        if self.animated:
+            await io.settle() # Typing starts by showing the text written before it
+        chunks = self.start(text)
+        if chunks is None:
+            io.write(text, end = end)
+            return
+
+        for index, (chunk, delay) in enumerate(chunks):
+            if self.skip.is_pressed():
+                io.write("".join(chunk for chunk, _ in chunks[index:]), end = "")
+                break
+            io.write(chunk, end = "")
+            io.flush()
+            await asyncio.sleep(delay)
+        io.write("", end = end)
+        io.flush()
+
+
+skip_channel = SkipChannel()
+typewriter = Typewriter()
+
+def set_time_scale(time_scale : float):
+    """
+    Set the speed of the shared typewriter for the whole game.
+
+    Parameters:
+        time_scale (float): Multiplier for every typing delay. 0 writes text instantly (e.g. for automated runs).
+    """
+    typewriter.time_scale = time_scale
@@ -1,4 +1,5 @@
 import pygame as pg
+from ui.fonts import get_font
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -17,25 +18,52 @@ class Button:
         width (int): Button width.
         height (int): Button height.
         action (action): Action to execute when clicked.
+
+    **Starting Attributes:**
+        **faces** (dict):
+            The rendered button, label included, for each background color it has been drawn with.
+            Made again when the text, font size, colors or size change.
     """
     def __init__(self, text, font_size, x, y, width, height, border_radius, action):
         self.text = text
+        self.font_size = int(font_size)
         self.rect = pg.Rect(x, y, width, height)
         self.border_radius = border_radius
         self.action = action
-        self.font = pg.font.Font(None, int(font_size))
+        self.font = get_font(self.font_size)
         self.base_color = WHITE
         self.hover_color = HOVER_COLOR
         self.text_color = BLACK
         self.current_color = self.base_color
+        self.faces = {}
+        self.face_key = None
+
+    def face(self, color):
+        """
+        Returns the rendered button for a background color, rendering it if the button has changed since it was last drawn.
+
+        Parameters:
+            color (tuple): The background color (e.g. base_color or hover_color).
+        """
+        key = (self.text, self.font_size, self.text_color, self.rect.size, self.border_radius)
+        if key != self.face_key:
+            self.font = get_font(self.font_size)
+            self.faces.clear()
+            self.face_key = key
+
+        face = self.faces.get(color)
+        if face is None:
+            face = self.faces[color] = pg.Surface(self.rect.size, pg.SRCALPHA)
+            face_rect = face.get_rect()
+            pg.draw.rect(face, color, face_rect, border_radius = self.border_radius)
+            pg.draw.rect(face, GREY, face_rect, 3, border_radius = self.border_radius)
+            text_surface = self.font.render(self.text, True, self.text_color)
+            face.blit(text_surface, text_surface.get_rect(center = face_rect.center))
+        return face
 
     def draw(self, screen):
         """Draws the button on the screen."""
-        pg.draw.rect(screen, self.current_color, self.rect, border_radius = self.border_radius)
-        pg.draw.rect(screen, GREY, self.rect, 3, border_radius = self.border_radius)
-        text_surface = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        screen.blit(self.face(self.current_color), self.rect)
 
     def handle_event(self, event, disable_clicks):
         """Handles button clicks and hover effects."""
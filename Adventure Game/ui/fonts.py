@@ -0,0 +1,46 @@
+import pygame as pg
+from collections import OrderedDict
+
+MAX_FONTS = 32 # The number of fonts kept before the least recently used is dropped
+COMMON_SIZES = (24, 28, 32, 36) # Sizes used by the popups and buttons, worth loading before the first frame
+
+fonts = OrderedDict() # (face, size) -> pygame.font.Font, least recently used first
+
+def get_font(size, face = None):
+    """
+    Returns a font, loading it only the first time it is asked for. Loading a font reads and parses the font file,
+    so every UI module shares the fonts loaded here instead of making new ones while drawing.
+
+    Parameters:
+        size (int): The font size.
+        face (str, optional): The path of the font file. Defaults to pygame's default font.
+
+    Returns:
+        font (pygame.font.Font): The font.
+    """
+    key = (face, max(int(size), 1))
+    font = fonts.get(key)
+    if font is None:
+        font = fonts[key] = pg.font.Font(face, key[1])
+        if len(fonts) > MAX_FONTS:
+            fonts.popitem(last = False)
+    else:
+        fonts.move_to_end(key)
+    return font
+
+def preload_fonts(sizes = COMMON_SIZES, face = None):
+    """
+    Loads fonts ahead of time, e.g. when the game window is created, so the first frames don't load them.
+
+    Parameters:
+        sizes (iterable): The font sizes to load. Defaults to COMMON_SIZES.
+        face (str, optional): The path of the font file. Defaults to pygame's default font.
+    """
+    for size in sizes:
+        get_font(size, face)
+
+def clear_fonts():
+    """
+    Drops every loaded font, e.g. when pygame is shut down.
+    """
+    fonts.clear()
@@ -1,5 +1,7 @@
 import pygame as pg
 from ui.button import Button, CloseButton
+from ui.fonts import get_font
+from ui.panel import PanelCache, render_panel
 from items import Weapon, Armour, Potion
 
 WHITE = (255, 255, 255)
@@ -23,12 +25,14 @@ class InventoryUI:
         self.ui_manager = ui_manager
         self.player = player
 
-        self.font = pg.font.Font(None, 28)
+        self.font = get_font(28)
         self.is_open = False
+        self.panel = PanelCache(self.render_panel)
         self.active_tab = "Weapons"
         self.close_button = None
         self.tab_buttons = []
         self.item_buttons = []
+        self.tab_item_buttons = {} # Tab -> (state the buttons were made for, buttons)
         self.item_detail_popup = None
 
 
@@ -92,10 +96,21 @@ class InventoryUI:
         self.generate_item_buttons()
 
     def generate_item_buttons(self):
-        """Create buttons to display items in the current tab."""
+        """
+        Create buttons to display items in the current tab. The buttons of each tab are kept and only made again
+        when the tab's items, the equipped items or the layout have changed.
+        """
+        inventory = self.player.inventory
+        state = (inventory, inventory.versions[self.active_tab], self.player.weapon, self.player.armour,
+                 self.popup_x, self.popup_y, self.popup_width)
+        cached = self.tab_item_buttons.get(self.active_tab)
+        if cached and cached[0] == state:
+            self.item_buttons = cached[1]
+            return
+
         self.item_buttons = []
-        categories = self.player.categorise_inventory()
-        items = categories.get(self.active_tab, [])
+        self.tab_item_buttons[self.active_tab] = (state, self.item_buttons)
+        items = inventory.category_items(self.active_tab)
 
         x = self.popup_x + 30
         y = self.popup_y + 100
@@ -143,22 +158,21 @@ class InventoryUI:
         for button in self.tab_buttons + self.item_buttons:
             button.handle_event(event, disable_clicks = False)
 
+    def visible_buttons(self):
+        """Returns the buttons the popup draws, including the item detail popup's."""
+        buttons = self.tab_buttons + self.item_buttons
+        if self.close_button:
+            buttons.append(self.close_button)
+        if self.item_detail_popup:
+            buttons += self.item_detail_popup.buttons + [self.item_detail_popup.close_button]
+        return buttons
     
     def draw(self):
         """"Draw the inventory UI."""
         if not self.is_open:
             return
 
-        popup_surface = pg.Surface((self.popup_width, self.popup_height), pg.SRCALPHA)
-        popup_surface.fill((0, 0, 0, 0))
-        pg.draw.rect(popup_surface, TRANSPARENT_GREY, (0, 0, self.popup_width, self.popup_height), border_radius = 10)
-        pg.draw.rect(popup_surface, WHITE, popup_surface.get_rect(), 3, border_radius = 10)
-        self.screen.blit(popup_surface, (self.popup_x, self.popup_y))
-
-        title_font = pg.font.Font(None, int(self.popup_width * 0.05))  # ← CHANGED (title feature)
-        title_text = title_font.render("Inventory", True, WHITE)
-        title_rect = title_text.get_rect(center=(self.popup_x + self.popup_width // 2, self.popup_y + 25))
-        self.screen.blit(title_text, title_rect)
+        self.screen.blit(self.panel.get((self.popup_width, self.popup_height)), (self.popup_x, self.popup_y))
 
         for button in self.tab_buttons + self.item_buttons:
             button.draw(self.screen)
@@ -167,6 +181,14 @@ class InventoryUI:
         
         if self.item_detail_popup:
             self.item_detail_popup.draw()
+
+    def render_panel(self):
+        """Renders the popup background with its title."""
+        panel = render_panel(self.popup_width, self.popup_height, TRANSPARENT_GREY, 3)
+        title_font = get_font(int(self.popup_width * 0.05))
+        title_text = title_font.render("Inventory", True, WHITE)
+        panel.blit(title_text, title_text.get_rect(center = (self.popup_width // 2, 25)))
+        return panel
         
 class ItemDetailPopup:
     """
@@ -182,7 +204,8 @@ class ItemDetailPopup:
         self.screen = screen
         self.item = item
         self.player = player
-        self.font = pg.font.Font(None, 28)
+        self.font = get_font(28)
+        self.panel = PanelCache(self.render_panel)
 
         self.parent_ui = None
         self.update_layout()
@@ -231,14 +254,12 @@ class ItemDetailPopup:
 
     def use_item(self, item):
         """Use or equip the selected item."""
-        item_key = item.name.lower().replace(" ", "_")
-        self.player.use_item(item_key)
+        self.player.use_item(item.item_id)
         self.close_popup()
     
     def unequip_item(self, item):
         """Unequip the selected item."""
-        item_key = item.name.lower().replace(" ", "_")
-        self.player.unequip_item(item_key)
+        self.player.unequip_item(item.item_id)
         self.close_popup()
 
     def close_popup(self):
@@ -259,24 +280,23 @@ class ItemDetailPopup:
 
     def draw(self):
         """Draw the item detail popup."""
-        surf = pg.Surface((self.width, self.height), pg.SRCALPHA)
-        pg.draw.rect(surf, (30, 30, 30, 220), (0, 0, self.width, self.height), border_radius=10)
-        pg.draw.rect(surf, WHITE, surf.get_rect(), 2, border_radius=10)
-        self.screen.blit(surf, (self.x, self.y))
-
-        title_font = pg.font.Font(None, 32)
-        title = title_font.render(self.item.name, True, WHITE)
-        self.screen.blit(title, (self.x + 20, self.y + 20))
-
-        desc_font = pg.font.Font(None, 24)
-        description = getattr(self.item, "description", "No description available.")
-        y_text = self.y + 60
-        for line in description.split("\n"):
-            rendered = desc_font.render(line, True, WHITE)
-            self.screen.blit(rendered, (self.x + 20, y_text))
-            y_text += 26
+        self.screen.blit(self.panel.get((self.width, self.height)), (self.x, self.y))
 
         for button in self.buttons:
             button.draw(self.screen)
 
         self.close_button.draw(self.screen)
+
+    def render_panel(self):
+        """Renders the popup background with the item's name and description."""
+        panel = render_panel(self.width, self.height, (30, 30, 30, 220), 2)
+        title_font = get_font(32)
+        panel.blit(title_font.render(self.item.name, True, WHITE), (20, 20))
+
+        desc_font = get_font(24)
+        description = getattr(self.item, "description", "No description available.")
+        y_text = 60
+        for line in description.split("\n"):
+            panel.blit(desc_font.render(line, True, WHITE), (20, y_text))
+            y_text += 26
+        return panel
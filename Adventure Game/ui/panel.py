@@ -0,0 +1,52 @@
+import pygame as pg
+
+WHITE = (255, 255, 255)
+
+def render_panel(width, height, fill, border_width, border_radius = 10):
+    """
+    Returns a new translucent popup background with a rounded white border.
+
+    Parameters:
+        width (int): Panel width.
+        height (int): Panel height.
+        fill (tuple): The RGBA background color.
+        border_width (int): The width of the border.
+        border_radius (int): The radius of the corners. Defaults to 10.
+    """
+    surface = pg.Surface((width, height), pg.SRCALPHA)
+    surface.fill((0, 0, 0, 0))
+    pg.draw.rect(surface, fill, (0, 0, width, height), border_radius = border_radius)
+    pg.draw.rect(surface, WHITE, surface.get_rect(), border_width, border_radius = border_radius)
+    return surface
+
+
+class PanelCache:
+    """
+    Keeps a popup's rendered panel (its background and the text that doesn't change while it is open), so drawing
+    the popup is a single blit. The panel is rendered again only when its key, e.g. the popup size and its text, changes.
+
+    Parameters:
+        render (callable): Called with no arguments to render the panel surface.
+
+    **Starting Attributes:**
+        **key** (tuple or None):
+            The key the panel was rendered for. Starts as None.
+        **surface** (pygame.Surface or None):
+            The rendered panel. Starts as None.
+    """
+    def __init__(self, render):
+        self.render = render
+        self.key = None
+        self.surface = None
+
+    def get(self, key):
+        """
+        Returns the panel for a key, rendering it if the key has changed.
+
+        Parameters:
+            key (tuple): Everything the panel's look depends on.
+        """
+        if self.surface is None or key != self.key:
+            self.surface = self.render()
+            self.key = key
+        return self.surface
@@ -1,5 +1,6 @@
-import pygame as pg
 from ui.button import Button, CloseButton
+from ui.fonts import get_font
+from ui.panel import PanelCache, render_panel
 
 WHITE = (255, 255, 255)
 TRANSPARENT_GREY = (30, 30, 30, 200)
@@ -21,7 +22,8 @@ class ShopUI:
         self.item_buttons = []
         self.tab_buttons = []
         self.close_button = None
-        self.font = pg.font.Font(None, 28)
+        self.font = get_font(28)
+        self.panel = PanelCache(self.render_panel)
         self.item_popup = None
 
 
@@ -112,9 +114,9 @@ class ShopUI:
         x = self.popup_x + 30
         y = self.popup_y + 110
 
-        for item_key, item in items:
-            label = f"{item.name} - {item.description} ({self.shop.get_item_price(self.active_tab, item_key)} gold)"
-            buy_action = lambda key=item_key, item=item: self.open_item_popup(item, key)
+        for item_id, item in items:
+            label = f"{item.name} - {item.description} ({self.shop.get_item_price(self.active_tab, item_id)} gold)"
+            buy_action = lambda item_id=item_id, item=item: self.open_item_popup(item, item_id)
 
             self.item_buttons.append(
                 Button(
@@ -130,12 +132,12 @@ class ShopUI:
             )
             y += self.button_height + self.spacing
     
-    def open_item_popup(self, item, item_key):
+    def open_item_popup(self, item, item_id):
         """Opens a confirmation popup before buying."""
-        price = self.shop.get_item_price(self.active_tab, item_key)
+        price = self.shop.get_item_price(self.active_tab, item_id)
 
         def confirm():
-            success, message = self.shop.buy_item(self.player, self.active_tab, item_key)
+            success, message = self.shop.buy_item(self.player, self.active_tab, item_id)
             self.item_popup.feedback_text = message
             self.item_popup.update_gold()
             self.generate_item_buttons()
@@ -146,15 +148,15 @@ class ShopUI:
         self.item_popup = ShopItemPopup(self.screen, item, price, self.player, confirm, cancel)
 
     
-    def buy_item(self, category, item_key):
+    def buy_item(self, category, item_id):
         """
         Handles the purchase of an item.
 
         Parameters:
             category (str): The category of the item.
-            item_key (str): The key of the item to buy.
+            item_id (int): The ID of the item to buy.
         """
-        success, message = self.shop.buy_item(self.player, category, item_key)
+        success, message = self.shop.buy_item(self.player, category, item_id)
         print(message)
         self.generate_item_buttons()
     
@@ -179,6 +181,15 @@ class ShopUI:
 
         for button in self.tab_buttons + self.item_buttons:
             button.handle_event(event, False)
+
+    def visible_buttons(self):
+        """Returns the buttons the popup draws, including the item popup's."""
+        buttons = self.tab_buttons + self.item_buttons
+        if self.close_button:
+            buttons.append(self.close_button)
+        if self.item_popup:
+            buttons += [self.item_popup.confirm_button, self.item_popup.cancel_button]
+        return buttons
     
     def draw(self):
         """
@@ -187,22 +198,9 @@ class ShopUI:
         if not self.is_open or not self.shop:
             return
 
-        # Draw popup background
-        popup_surface = pg.Surface((self.popup_width, self.popup_height), pg.SRCALPHA)
-        popup_surface.fill((0, 0, 0, 0))
-        pg.draw.rect(popup_surface, TRANSPARENT_GREY, (0, 0, self.popup_width, self.popup_height), border_radius=10)
-        pg.draw.rect(popup_surface, WHITE, popup_surface.get_rect(), 3, border_radius=10)
-        self.screen.blit(popup_surface, (self.popup_x, self.popup_y))
-
-        # Draw title
-        title_font = pg.font.Font(None, int(self.popup_width * 0.05))
-        title_text = title_font.render(self.shop.name, True, WHITE)
-        title_rect = title_text.get_rect(center=(self.popup_x + self.popup_width // 2, self.popup_y + 30))
-        self.screen.blit(title_text, title_rect)
-
-        # Draw player gold
-        gold_text = self.font.render(f"Gold: {self.player.gold}", True, YELLOW)
-        self.screen.blit(gold_text, (self.popup_x + self.popup_width - 150, self.popup_y + 70))
+        # Draw popup background, title and player gold
+        panel = self.panel.get((self.popup_width, self.popup_height, self.shop.name, self.player.gold))
+        self.screen.blit(panel, (self.popup_x, self.popup_y))
 
         for button in self.tab_buttons + self.item_buttons:
             button.draw(self.screen)
@@ -212,6 +210,17 @@ class ShopUI:
         if self.item_popup:
             self.item_popup.draw()
 
+    def render_panel(self):
+        """Renders the popup background with the shop's name and the player's gold."""
+        panel = render_panel(self.popup_width, self.popup_height, TRANSPARENT_GREY, 3)
+        title_font = get_font(int(self.popup_width * 0.05))
+        title_text = title_font.render(self.shop.name, True, WHITE)
+        panel.blit(title_text, title_text.get_rect(center = (self.popup_width // 2, 30)))
+
+        gold_text = self.font.render(f"Gold: {self.player.gold}", True, YELLOW)
+        panel.blit(gold_text, (self.popup_width - 150, 70))
+        return panel
+
 
 class ShopItemPopup:
     """
@@ -224,9 +233,10 @@ class ShopItemPopup:
         self.player = player
         self.confirm_callback = confirm_callback
         self.cancel_callback = cancel_callback
-        self.font = pg.font.Font(None, 28)
+        self.font = get_font(28)
         self.gold = self.player.gold
         self.feedback_text = ""
+        self.panel = PanelCache(self.render_panel)
 
         self.update_layout()
 
@@ -281,31 +291,31 @@ class ShopItemPopup:
     
     def draw(self):
         """Draw the shop popup UI."""
-        surface = pg.Surface((self.width, self.height), pg.SRCALPHA)
-        pg.draw.rect(surface, (30, 30, 30, 230), (0, 0, self.width, self.height), border_radius = 10)
-        pg.draw.rect(surface, WHITE, surface.get_rect(), 2, border_radius = 10)
-        self.screen.blit(surface, (self.x, self.y))
+        panel = self.panel.get((self.width, self.height, self.price, self.player.gold, self.feedback_text))
+        self.screen.blit(panel, (self.x, self.y))
 
-        title_font = pg.font.Font(None, 32)
-        title = title_font.render(self.item.name, True, WHITE)
-        self.screen.blit(title, (self.x + 20, self.y + 20))
+        self.confirm_button.draw(self.screen)
+        self.cancel_button.draw(self.screen)
 
-        desc_font = pg.font.Font(None, 28)
+    def render_panel(self):
+        """Renders the popup background with the item, its price, the player's gold and any feedback."""
+        panel = render_panel(self.width, self.height, (30, 30, 30, 230), 2)
+        title_font = get_font(32)
+        panel.blit(title_font.render(self.item.name, True, WHITE), (20, 20))
+
+        desc_font = get_font(28)
         lines = getattr(self.item, "description", "No description").split("\n")
-        y_text = self.y + 60
+        y_text = 60
         for line in lines:
-            self.screen.blit(desc_font.render(line, True, WHITE), (self.x + 20, y_text))
+            panel.blit(desc_font.render(line, True, WHITE), (20, y_text))
             y_text += 24
 
         gold_text = self.font.render(f"Price: {self.price} gold", True, WHITE)
         player_gold = self.font.render(f"Your Gold: {self.player.gold}", True, YELLOW)
-        self.screen.blit(gold_text, (self.x + 20, y_text + 10))
-        self.screen.blit(player_gold, (self.x + 20, y_text + 35))
+        panel.blit(gold_text, (20, y_text + 10))
+        panel.blit(player_gold, (20, y_text + 35))
 
         if self.feedback_text:
             feedback_color = YELLOW if "not enough" not in self.feedback_text.lower() else (255, 100, 100)
-            feedback_render = self.font.render(self.feedback_text, True, feedback_color)
-            self.screen.blit(feedback_render, (self.x + 20, y_text + 65))
-
-        self.confirm_button.draw(self.screen)
-        self.cancel_button.draw(self.screen)
\ No newline at end of file
+            panel.blit(self.font.render(self.feedback_text, True, feedback_color), (20, y_text + 65))
+        return panel
@@ -1,4 +1,5 @@
-import pygame as pg
+from ui.fonts import get_font
+from ui.panel import PanelCache, render_panel
 from ui.button import CloseButton
 
 WHITE = (255, 255, 255)
@@ -16,10 +17,11 @@ class StatusUI:
     def __init__(self, screen, ui_manager):
         self.screen = screen
         self.ui_manager = ui_manager
-        self.font = pg.font.Font(None, 36)
+        self.font = get_font(36)
         self.status_text = ""
         self.close_button = None
         self.is_open = False
+        self.panel = PanelCache(self.render_panel)
         self.last_screen_size = screen.get_size()
     
     def update_popup_size(self):
@@ -68,6 +70,10 @@ class StatusUI:
             if self.close_button.handle_event(event, disable_clicks=False):
                 ui_manager.close_ui()
 
+    def visible_buttons(self):
+        """Returns the buttons the popup draws."""
+        return [self.close_button] if self.close_button else []
+
     def draw(self):
         """Draws the UI if it's active."""
         if not self.is_open:
@@ -75,27 +81,22 @@ class StatusUI:
 
         self.update_on_resize()
 
-        screen_width, screen_height = self.screen.get_size()
-        popup_width = int(screen_width * 0.25)
-        popup_height = int(screen_height * 0.3)
-        popup_x = (self.screen.get_width() - popup_width) // 2
-        popup_y = (self.screen.get_height() - popup_height) // 2
+        panel = self.panel.get((self.screen.get_size(), self.status_text))
+        self.screen.blit(panel, (self.popup_x, self.popup_y))
 
+        if self.close_button:
+            self.close_button.draw(self.screen)
 
-        popup_surface = pg.Surface((popup_width, popup_height), pg.SRCALPHA)
-        popup_surface.fill((0, 0, 0, 0))
-        pg.draw.rect(popup_surface, TRANSPARENT_GREY, (0, 0, popup_width, popup_height), border_radius=10)
-        pg.draw.rect(popup_surface, WHITE, popup_surface.get_rect(), 3, border_radius=10)
-        self.screen.blit(popup_surface, (popup_x, popup_y))
+    def render_panel(self):
+        """Renders the popup background with the status text."""
+        screen_width = self.screen.get_width()
+        panel = render_panel(self.popup_width, self.popup_height, TRANSPARENT_GREY, 3)
 
         font_size = int(screen_width * 0.025)
-        self.font = pg.font.Font(None, font_size)
+        self.font = get_font(font_size)
 
         y_offset = font_size * 0.45
         for line in self.status_text.split("\n"):
-            text_surface = self.font.render(line, True, WHITE)
-            self.screen.blit(text_surface, (popup_x + int(screen_width * 0.02), popup_y + y_offset))
+            panel.blit(self.font.render(line, True, WHITE), (int(screen_width * 0.02), y_offset))
             y_offset += font_size * 0.9
-
-        if self.close_button:
-            self.close_button.draw(self.screen)
+        return panel